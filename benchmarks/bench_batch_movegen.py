@@ -0,0 +1,55 @@
+"""
+Compares per-state move generation with the generic and a vectorized `batch_legal_action_masks`
+for a batch of 19x19 positions stored in `ArrayBoard`s.
+
+Usage:
+    python benchmarks/bench_batch_movegen.py
+"""
+import timeit
+
+import numpy as np
+from placement_game import PlacementGameState, build_state
+
+from seahorse.game.action_codec import GridActionCodec
+from seahorse.game.game_layout.array_board import ArrayBoard
+
+SIZE = 19
+BATCH = 1000
+
+
+class CodedPlacementGameState(PlacementGameState):
+
+    codec = GridActionCodec([SIZE, SIZE])
+
+    def get_action_codec(self) -> GridActionCodec:
+        return self.codec
+
+
+class VectorizedPlacementGameState(CodedPlacementGameState):
+
+    @classmethod
+    def batch_legal_action_masks(cls, states: list[PlacementGameState]) -> np.ndarray:
+        types, _ = ArrayBoard.stack([state.get_rep() for state in states])
+        return (types == 0).reshape(len(states), -1)
+
+
+def fresh(states: list[PlacementGameState]) -> list[PlacementGameState]:
+    for state in states:
+        state._possible_stateless_actions = None
+        state._possible_action_codes = None
+    return states
+
+
+def main() -> None:
+    results = {}
+    for gs in (CodedPlacementGameState, VectorizedPlacementGameState):
+        states = [build_state(SIZE, 0.5, gs=gs, board=ArrayBoard, seed=k) for k in range(BATCH)]
+        elapsed = timeit.timeit(lambda s=states, g=gs: g.batch_legal_action_masks(fresh(s)), number=3) / 3
+        results[gs.__name__] = elapsed
+        print(f"{gs.__name__:<32}{BATCH / elapsed:>12.0f} states/s")
+    speedup = results["CodedPlacementGameState"] / results["VectorizedPlacementGameState"]
+    print(f"speed-up: x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
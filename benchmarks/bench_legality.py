@@ -0,0 +1,62 @@
+"""
+Compares the generic legality check (full move generation) with a designer-provided `is_legal`,
+as performed by `GameMaster.step` on every move, on a 19x19 board.
+
+Usage:
+    python benchmarks/bench_legality.py
+"""
+import timeit
+
+from placement_game import PlacementGameState, build_state
+
+from seahorse.game.action import Action
+from seahorse.game.stateful_action import LazyStatefulAction
+from seahorse.game.stateless_action import StatelessAction
+
+
+class FastPlacementGameState(PlacementGameState):
+
+    def is_legal(self, action: Action) -> bool:
+        if isinstance(action, LazyStatefulAction):
+            action = action.get_stateless_action()
+        if not isinstance(action, StatelessAction):
+            return super().is_legal(action)
+        i, j = action.data["position"]
+        rows, cols = self.get_rep().get_dimensions()
+        return 0 <= i < rows and 0 <= j < cols and (i, j) not in self.get_rep().get_env()
+
+
+class LazyPlacementGameState(PlacementGameState):
+
+    lazy_stateful_actions = True
+
+
+class FastLazyPlacementGameState(FastPlacementGameState):
+
+    lazy_stateful_actions = True
+
+
+def validate(state: PlacementGameState, action: StatelessAction) -> bool:
+    # A fresh state is validated on every turn, discard the cached move generation
+    state._possible_stateless_actions = None
+    state._possible_stateful_actions = None
+    return state.is_legal(action.get_stateful_action(state))
+
+
+def main() -> None:
+    results = {}
+    for label, gs in [("generic (eager stateful actions)", PlacementGameState),
+                      ("generic (lazy stateful actions)", LazyPlacementGameState),
+                      ("designer is_legal (lazy)", FastLazyPlacementGameState)]:
+        state = build_state(19, 0.5, gs=gs)
+        action = next(iter(state.generate_possible_stateless_actions()))
+        number = 3 if gs is PlacementGameState else 200
+        results[label] = timeit.timeit(lambda s=state, a=action: validate(s, a), number=number) / number
+        print(f"{label:<40}{results[label] * 1e6:>12.2f} us/move")
+    baseline = results["generic (eager stateful actions)"]
+    for label, elapsed in results.items():
+        print(f"{label:<40}x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures the memory held by boards whose pieces are allocated per cell or interned,
+and by the possible stateless actions of a 19x19 position.
+
+Usage:
+    python benchmarks/bench_memory.py
+"""
+import timeit
+import tracemalloc
+
+from placement_game import build_state
+
+from seahorse.game.game_layout.board import Board, Piece
+
+SIZE = 19
+BOARDS = 200
+
+
+def traced(build) -> tuple[object, int]:
+    tracemalloc.start()
+    built = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, current
+
+
+def fresh_boards() -> list[Board]:
+    return [Board({(i, j): Piece("S", owner_id=(i + j) % 2) for i in range(SIZE) for j in range(SIZE)}, [SIZE, SIZE])
+            for _ in range(BOARDS)]
+
+
+def interned_boards() -> list[Board]:
+    return [Board({(i, j): Piece.intern("S", owner_id=(i + j) % 2) for i in range(SIZE) for j in range(SIZE)},
+                  [SIZE, SIZE])
+            for _ in range(BOARDS)]
+
+
+def main() -> None:
+    _, fresh = traced(fresh_boards)
+    _, interned = traced(interned_boards)
+    print(f"per board, one Piece per cell: {fresh / BOARDS / 1024:8.1f} KiB")
+    print(f"per board, interned pieces:    {interned / BOARDS / 1024:8.1f} KiB")
+
+    state = build_state(SIZE, 0.0)
+    actions, size = traced(lambda: list(state.generate_possible_stateless_actions()))
+    print(f"per stateless action:          {size / len(actions):8.1f} B")
+    action = actions[0]
+    elapsed = timeit.timeit(lambda: hash(action), number=100000) / 100000
+    print(f"stateless action hash:         {elapsed * 1e9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
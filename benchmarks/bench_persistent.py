@@ -0,0 +1,48 @@
+"""
+Compares deriving successor boards from a dictionary-backed `Board` and a `PersistentBoard`
+on a 19x19 board, in time and in memory for all the siblings of a state.
+
+Usage:
+    python benchmarks/bench_persistent.py
+"""
+import timeit
+import tracemalloc
+
+from seahorse.game.game_layout.board import Board, Piece
+from seahorse.game.game_layout.persistent_board import PersistentBoard
+
+SIZE = 19
+
+
+def build(board_type: type[Board]) -> Board:
+    env = {(i, j): Piece("S", owner_id=(i + j) % 2) for i in range(SIZE) for j in range(SIZE) if (i * j) % 3}
+    return board_type(env, [SIZE, SIZE])
+
+
+def siblings(board: Board) -> list[Board]:
+    stone = Piece("S", owner_id=0)
+    derived = []
+    for i in range(SIZE):
+        for j in range(SIZE):
+            if (i, j) not in board.get_env():
+                new_board = board.copy()
+                new_board.place_piece((i, j), stone)
+                derived.append(new_board)
+    return derived
+
+
+def main() -> None:
+    for board_type in (Board, PersistentBoard):
+        board = build(board_type)
+        number = 20
+        elapsed = timeit.timeit(lambda b=board: siblings(b), number=number) / number
+        tracemalloc.start()
+        kept = siblings(board)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{board_type.__name__:<16}{len(kept)} siblings: {elapsed * 1e3:8.2f} ms, {peak / 1024:8.1f} KiB, "
+              f"{elapsed / len(kept) * 1e6:6.2f} us/successor")
+
+
+if __name__ == "__main__":
+    main()
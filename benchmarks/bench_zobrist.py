@@ -0,0 +1,45 @@
+"""
+Compares the plain and Zobrist hashing of boards and game states on a 19x19 board.
+
+Usage:
+    python benchmarks/bench_zobrist.py
+"""
+import timeit
+
+from placement_game import build_state
+
+from seahorse.game.game_layout.zobrist import ZobristTable
+
+
+def bench(label: str, stmt, number: int) -> float:
+    elapsed = timeit.timeit(stmt, number=number)
+    print(f"{label:<45}{elapsed / number * 1e6:>12.2f} us")
+    return elapsed
+
+
+def main() -> None:
+    plain = build_state(19, 0.5)
+    zobrist = build_state(19, 0.5, zobrist=ZobristTable())
+
+    print("== hash of a single state ==")
+    t_plain = bench("plain Board", lambda: hash(plain), 2000)
+    t_zob = bench("Zobrist Board", lambda: hash(zobrist), 2000)
+    print(f"speed-up: x{t_plain / t_zob:.1f}\n")
+
+    print("== successor generation + frozenset of stateful actions ==")
+    t_plain = bench("plain Board", lambda: frozenset(plain.generate_possible_stateful_actions()), 5)
+    t_zob = bench("Zobrist Board", lambda: frozenset(zobrist.generate_possible_stateful_actions()), 5)
+    print(f"speed-up: x{t_plain / t_zob:.1f}\n")
+
+    print("== membership test of a stateful action ==")
+    plain_actions = frozenset(plain.generate_possible_stateful_actions())
+    zob_actions = frozenset(zobrist.generate_possible_stateful_actions())
+    plain_probe = next(iter(plain.generate_possible_stateless_actions())).get_stateful_action(plain)
+    zob_probe = next(iter(zobrist.generate_possible_stateless_actions())).get_stateful_action(zobrist)
+    t_plain = bench("plain Board", lambda: plain_probe in plain_actions, 2000)
+    t_zob = bench("Zobrist Board", lambda: zob_probe in zob_actions, 2000)
+    print(f"speed-up: x{t_plain / t_zob:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+A minimal stone-placement game on a square board, used by the benchmark scripts.
+
+Players alternately drop a stone on any empty cell, the game is over once the board is full.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Generator
+from typing import Any
+
+from seahorse.game.game_layout.board import Board, Piece
+from seahorse.game.game_layout.zobrist import ZobristTable
+from seahorse.game.game_state import GameState
+from seahorse.game.representation import Representation
+from seahorse.game.stateful_action import StatefulAction
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.player.player import Player
+from seahorse.utils.custom_exceptions import MethodNotImplementedError
+
+
+class PlacementGameState(GameState):
+
+    def apply_action(self, action: StatelessAction) -> PlacementGameState:
+        rep = self.get_rep().copy()
+        rep.place_piece(action.data["position"], Piece.intern(str(self.active_player.get_id()), self.active_player))
+        return PlacementGameState(self.compute_scores(rep), self.compute_next_player(), self.players, rep)
+
+    def generate_possible_stateless_actions(self) -> Generator[StatelessAction, None, None]:
+        rep = self.get_rep()
+        env = rep.get_env()
+        rows, cols = rep.get_dimensions()
+        for i in range(rows):
+            for j in range(cols):
+                if (i, j) not in env:
+                    yield StatelessAction({"position": (i, j)})
+
+    def generate_possible_stateful_actions(self) -> Generator[StatefulAction, None, None]:
+        for action in self.generate_possible_stateless_actions():
+            yield action.get_stateful_action(self)
+
+    def convert_stateful_action_to_stateless_action(self, stateful_action: StatefulAction) -> StatelessAction:
+        before = stateful_action.get_current_game_state().get_rep().get_env()
+        after = stateful_action.get_next_game_state().get_rep().get_env()
+        return StatelessAction({"position": next(pos for pos in after if pos not in before)})
+
+    def compute_scores(self, play_info: Any) -> dict[int, Any]:
+        return {player.get_id(): play_info.get_pieces_player(player)[0] for player in self.players}
+
+    def is_done(self) -> bool:
+        rows, cols = self.get_rep().get_dimensions()
+        return len(self.get_rep().get_env()) == rows * cols
+
+    def to_json(self) -> dict:
+        return {"scores": self.scores}
+
+    @classmethod
+    def from_json(cls, data: str, *, next_player: Player | None = None) -> PlacementGameState:  # noqa: ARG003
+        msg = "The benchmark state only serializes its scores, it cannot be deserialized"
+        raise MethodNotImplementedError(msg)
+
+
+def build_state(size: int = 19, filled: float = 0.5, *, zobrist: ZobristTable | None = None,
+                gs: type[PlacementGameState] = PlacementGameState, board: type[Representation] = Board,
+                seed: int | None = None) -> PlacementGameState:
+    """
+    Builds a placement game state where a fraction of the board is already covered.
+
+    Args:
+        size (int, optional): The side of the board. Defaults to 19.
+        filled (float, optional): The fraction of covered cells. Defaults to 0.5.
+        zobrist (ZobristTable, optional): Enables incremental hashing of the board. Defaults to None.
+        gs (type[PlacementGameState], optional): The game state class to instantiate.
+        board (type[Representation], optional): The board class to instantiate.
+        seed (int, optional): Shuffles the covered cells with this seed, the first cells are covered if None.
+
+    Returns:
+        PlacementGameState: The game state.
+    """
+    players = [Player("black", id=1), Player("white", id=2)]
+    board = board({}, [size, size], zobrist=zobrist)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    if seed is not None:
+        random.Random(seed).shuffle(cells)
+    for k, pos in enumerate(cells[: int(filled * len(cells))]):
+        board.place_piece(pos, Piece.intern(str(players[k % 2].get_id()), players[k % 2]))
+    state = gs({}, players[0], players, board)
+    state.scores = state.compute_scores(board)
+    return state
@@ -11,6 +11,8 @@ class Action(Serializable):
 
     """
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """
         Initializes a new instance of the Action class.
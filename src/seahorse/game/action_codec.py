@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+from abc import abstractmethod
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import dill
+import numpy as np
+
+from seahorse.game.action import Action
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.utils.custom_exceptions import MethodNotImplementedError, NoGameStateProvidedError
+
+if TYPE_CHECKING:
+    from seahorse.game.game_state import GameState
+    from seahorse.game.stateful_action import StatefulAction
+
+
+class ActionCodec:
+    """
+    A bijection between the stateless actions of a game and the dense integer codes `0, ..., size() - 1`.
+
+    Codes allow move lists to be stored as int arrays, legal moves as boolean masks or bitsets,
+    and moves to be sent over the wire as a single integer.
+    """
+
+    @abstractmethod
+    def size(self) -> int:
+        """
+        Gets the number of codes, i.e. the number of distinct actions of the game.
+
+        Returns:
+            int: The number of codes.
+        """
+        raise MethodNotImplementedError()
+
+    @abstractmethod
+    def encode(self, action: StatelessAction) -> int:
+        """
+        Encodes a stateless action.
+
+        Args:
+            action (StatelessAction): The action to encode.
+
+        Returns:
+            int: The code of the action.
+        """
+        raise MethodNotImplementedError()
+
+    @abstractmethod
+    def decode(self, code: int) -> StatelessAction:
+        """
+        Decodes a stateless action.
+
+        Args:
+            code (int): The code of the action.
+
+        Returns:
+            StatelessAction: The action.
+        """
+        raise MethodNotImplementedError()
+
+    def encode_many(self, actions: Iterable[StatelessAction]) -> np.ndarray:
+        """
+        Encodes several stateless actions at once.
+
+        Args:
+            actions (Iterable[StatelessAction]): The actions to encode.
+
+        Returns:
+            np.ndarray: The sorted codes of the actions.
+        """
+        return np.sort(np.fromiter((self.encode(action) for action in actions), dtype=np.int64))
+
+    def to_mask(self, codes: Iterable[int] | np.ndarray) -> np.ndarray:
+        """
+        Converts codes to a boolean mask over all the codes.
+
+        Args:
+            codes (Iterable[int] | np.ndarray): The codes.
+
+        Returns:
+            np.ndarray: A boolean array of length `size()`.
+        """
+        mask = np.zeros(self.size(), dtype=bool)
+        mask[np.asarray(codes, dtype=np.int64)] = True
+        return mask
+
+
+class TableActionCodec(ActionCodec):
+    """
+    A codec built from the exhaustive list of the actions of a game, codes being their indices in the list.
+    """
+
+    def __init__(self, actions: Iterable[StatelessAction]) -> None:
+        """
+        Initializes a new instance of the TableActionCodec class.
+
+        Args:
+            actions (Iterable[StatelessAction]): All the actions of the game, without duplicates.
+        """
+        self.actions = list(actions)
+        self.codes = {action: code for code, action in enumerate(self.actions)}
+
+    def size(self) -> int:
+        return len(self.actions)
+
+    def encode(self, action: StatelessAction) -> int:
+        return self.codes[action]
+
+    def decode(self, code: int) -> StatelessAction:
+        return self.actions[code]
+
+
+class GridActionCodec(ActionCodec):
+    """
+    A codec for actions designating a single cell of a grid, e.g. `StatelessAction({"position": (i, j)})`,
+    codes being the row-major indices of the cells.
+    """
+
+    def __init__(self, dim: list[int], key: str = "position") -> None:
+        """
+        Initializes a new instance of the GridActionCodec class.
+
+        Args:
+            dim (list[int]): The dimensions of the grid.
+            key (str, optional): The key of the position in the action data. Defaults to "position".
+        """
+        self.dim = tuple(dim)
+        self.key = key
+        self._actions = [StatelessAction({key: tuple(int(x) for x in pos)}) for pos in np.ndindex(self.dim)]
+
+    def size(self) -> int:
+        return len(self._actions)
+
+    def encode(self, action: StatelessAction) -> int:
+        return int(np.ravel_multi_index(tuple(action.data[self.key]), self.dim))
+
+    def decode(self, code: int) -> StatelessAction:
+        return self._actions[code]
+
+
+class CodedAction(Action):
+    """
+    A stateless action represented by its code, to be decoded with the codec of the game state it is played on.
+
+    Attributes:
+        code (int): The code of the action.
+    """
+
+    __slots__ = ("code",)
+
+    def __init__(self, code: int) -> None:
+        """
+        Initializes a new instance of the CodedAction class.
+
+        Args:
+            code (int): The code of the action.
+        """
+        self.code = int(code)
+
+    def get_stateless_action(self, game_state: GameState) -> StatelessAction:
+        """
+        Decodes the action.
+
+        Args:
+            game_state (GameState): The game state providing the codec.
+
+        Returns:
+            StatelessAction: The decoded action.
+        """
+        if game_state is None:
+            raise NoGameStateProvidedError()
+        return game_state.get_action_codec().decode(self.code)
+
+    def get_stateful_action(self, game_state: GameState) -> StatefulAction:
+        """
+        Returns the stateful action.
+
+        Returns:
+            StatefulAction: The stateful action.
+        """
+        return self.get_stateless_action(game_state).get_stateful_action(game_state)
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __eq__(self, value: object) -> bool:
+        return isinstance(value, CodedAction) and value.code == self.code
+
+    def __str__(self) -> str:
+        return f"CodedAction: {self.code}"
+
+    def to_json(self) -> dict:
+        return {"code": self.code, "__action_type__": dill.dumps(type(self))}
+
+    @classmethod
+    def from_json(cls, data: str | dict) -> CodedAction:
+        if isinstance(data, str):
+            data = json.loads(data)
+        return cls(data["code"])
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import ast
+import json
+from collections.abc import Iterator, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from seahorse.game.game_layout.board import Piece
+from seahorse.game.game_layout.symmetry import NO_SYMMETRY, Symmetry
+from seahorse.game.game_layout.zobrist import DEFAULT_ZOBRIST_TABLE, ZobristTable
+from seahorse.game.representation import Representation
+from seahorse.utils.serializer import Serializable
+
+if TYPE_CHECKING:
+    from seahorse.player.player import Player
+
+EMPTY = 0
+NO_OWNER = -1
+
+
+def _as_position(pos: Any) -> Any:
+    # Positions decoded from JSON come as lists, which numpy would read as fancy indices
+    return tuple(pos) if isinstance(pos, list | np.ndarray) else pos
+
+
+class ArrayEnv(MutableMapping):
+    """
+    A dictionary-like view over the arrays of an `ArrayBoard`.
+
+    It maps positions to pieces exactly like the environment of a `Board` does,
+    so that code written against `Board.get_env()` keeps working unchanged.
+    Pieces are materialized on access.
+    """
+
+    def __init__(self, board: ArrayBoard) -> None:
+        self.board = board
+
+    def __getitem__(self, pos: tuple[int]) -> Piece:
+        board = self.board
+        pos = _as_position(pos)
+        if not board.is_inside(pos) or board.types[pos] == EMPTY:
+            raise KeyError(pos)
+        return board._get_piece(int(board.types[pos]), int(board.owners[pos]))
+
+    def __setitem__(self, pos: tuple[int], piece: Piece) -> None:
+        self.board.place_piece(pos, piece)
+
+    def __delitem__(self, pos: tuple[int]) -> None:
+        if self.board.remove_piece(pos) is None:
+            raise KeyError(pos)
+
+    def __contains__(self, pos: object) -> bool:
+        pos = _as_position(pos)
+        return self.board.is_inside(pos) and self.board.types[pos] != EMPTY
+
+    def __iter__(self) -> Iterator[tuple[int]]:
+        return (tuple(pos) for pos in np.argwhere(self.board.types != EMPTY).tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.board.types))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class ArrayBoard(Representation):
+    """
+    A dense board storing piece types and owners in integer ndarrays.
+
+    It exposes the same interface as `Board`: `get_env()` returns a mapping from positions to pieces
+    that can be read and written as a regular dictionary. On top of that, it offers vectorized queries
+    (owner counts, masks, regions) and copies that boil down to a couple of memcpy.
+
+    Piece types are stored as small integer codes, `0` standing for an empty cell.
+    Owners are stored as player IDs, `-1` standing for no owner.
+
+    Like `Board`, subclasses can declare their symmetries in `symmetries`, the images of the board
+    being computed with array transforms.
+
+    Attributes:
+        dimensions (list[int]): The dimensions of the board.
+        types (np.ndarray): The piece type codes of each cell.
+        owners (np.ndarray): The owner IDs of each cell.
+        zobrist (ZobristTable | None): The table used for incremental hashing, if any.
+        symmetries (tuple[Symmetry, ...]): The symmetries of the board, only the identity by default.
+    """
+
+    symmetries: tuple[Symmetry, ...] = NO_SYMMETRY
+
+    def __init__(self, env: dict[tuple[int], Piece] | None, dim: list[int],
+                 zobrist: ZobristTable | None = None) -> None:
+        """
+        Initializes a new instance of the ArrayBoard class.
+
+        Args:
+            env (dict[Tuple[int], Piece] | None): The pieces initially standing on the board.
+            dim (list[int]): The dimensions of the board.
+            zobrist (ZobristTable, optional): Enables incremental hashing with the given table. Defaults to None.
+        """
+        self.dimensions = list(dim)
+        self.types = np.zeros(self.dimensions, dtype=np.int16)
+        self.owners = np.full(self.dimensions, NO_OWNER, dtype=np.int64)
+        self.zobrist = zobrist
+        self._zobrist_hash = 0 if zobrist is not None else None
+        self._type_names: list[str | None] = [None]
+        self._type_codes: dict[str, int] = {}
+        super().__init__(ArrayEnv(self))
+        for pos, piece in (env or {}).items():
+            self.place_piece(pos, piece)
+
+    def get_dimensions(self) -> list[int]:
+        """
+        Gets the dimensions of the board.
+
+        Returns:
+            list[int]: The list of dimensions.
+        """
+        return self.dimensions
+
+    def get_type_code(self, piece_type: str) -> int:
+        """
+        Gets the integer code of a piece type, registering it if needed.
+
+        Args:
+            piece_type (str): The type of the piece.
+
+        Returns:
+            int: The code of the piece type.
+        """
+        code = self._type_codes.get(piece_type)
+        if code is None:
+            code = len(self._type_names)
+            self._type_names.append(piece_type)
+            self._type_codes[piece_type] = code
+        return code
+
+    def get_type_name(self, code: int) -> str | None:
+        """
+        Gets the piece type associated to an integer code.
+
+        Args:
+            code (int): The code of the piece type.
+
+        Returns:
+            str | None: The piece type, None for empty cells.
+        """
+        return self._type_names[code]
+
+    def is_inside(self, pos: Any) -> bool:
+        """
+        Checks if a position lies on the board.
+
+        Args:
+            pos (Any): The position to check, as a tuple or a list.
+
+        Returns:
+            bool: True if the position is a valid cell of the board, False otherwise.
+        """
+        pos = _as_position(pos)
+        return (isinstance(pos, tuple) and len(pos) == len(self.dimensions)
+                and all(isinstance(x, int | np.integer) and 0 <= x < d
+                        for x, d in zip(pos, self.dimensions, strict=True)))
+
+    def place_piece(self, pos: tuple[int], piece: Piece) -> Piece | None:
+        """
+        Places a piece on the board, replacing the one already standing there if any.
+
+        Args:
+            pos (Tuple[int]): The position of the piece.
+            piece (Piece): The piece to place.
+
+        Returns:
+            Piece | None: The piece previously standing on the position, if any.
+
+        Raises:
+            KeyError: If the position lies outside the board.
+        """
+        pos = _as_position(pos)
+        if not self.is_inside(pos):
+            raise KeyError(pos)
+        previous = self.remove_piece(pos)
+        self.types[pos] = self.get_type_code(piece.get_type())
+        self.owners[pos] = piece.get_owner_id()
+        if self.zobrist is not None:
+            self._zobrist_hash ^= self.zobrist.get_key(tuple(map(int, pos)), piece.get_type(), piece.get_owner_id())
+        return previous
+
+    def remove_piece(self, pos: tuple[int]) -> Piece | None:
+        """
+        Removes the piece standing on a position.
+
+        Args:
+            pos (Tuple[int]): The position to clear.
+
+        Returns:
+            Piece | None: The removed piece, if any.
+        """
+        pos = _as_position(pos)
+        if not self.is_inside(pos) or self.types[pos] == EMPTY:
+            return None
+        previous = self._get_piece(int(self.types[pos]), int(self.owners[pos]))
+        self.types[pos] = EMPTY
+        self.owners[pos] = NO_OWNER
+        if self.zobrist is not None:
+            self._zobrist_hash ^= self.zobrist.get_key(tuple(map(int, pos)), previous.get_type(),
+                                                       previous.get_owner_id())
+        return previous
+
+    def get_pieces_player(self, owner: Player) -> tuple[int, list[tuple[int]]]:
+        """
+        Gets the pieces owned by a specific player.
+
+        Args:
+            owner (Player): The player specified.
+
+        Returns:
+            Tuple[int, list[Tuple[int]]]: The number of pieces owned by the player and the list of their positions.
+        """
+        positions = [tuple(pos) for pos in np.argwhere(self.get_mask(owner_id=owner.get_id())).tolist()]
+        return len(positions), positions
+
+    def get_mask(self, owner_id: int | None = None, piece_type: str | None = None) -> np.ndarray:
+        """
+        Gets the boolean mask of the occupied cells, optionally filtered by owner and piece type.
+
+        Args:
+            owner_id (int, optional): Only keeps the pieces of this owner. Defaults to None.
+            piece_type (str, optional): Only keeps the pieces of this type. Defaults to None.
+
+        Returns:
+            np.ndarray: A boolean array shaped as the board.
+        """
+        mask = self.types != EMPTY
+        if owner_id is not None:
+            mask &= self.owners == owner_id
+        if piece_type is not None:
+            mask &= self.types == self._type_codes.get(piece_type, -1)
+        return mask
+
+    def count_pieces(self, owner_id: int | None = None, piece_type: str | None = None,
+                     region: tuple[slice, ...] | None = None) -> int:
+        """
+        Counts the pieces on the board, optionally filtered by owner, piece type and region.
+
+        Args:
+            owner_id (int, optional): Only counts the pieces of this owner. Defaults to None.
+            piece_type (str, optional): Only counts the pieces of this type. Defaults to None.
+            region (Tuple[slice, ...], optional): Only counts the pieces in this region,
+                e.g. `(slice(0, 3), slice(0, 3))`. Defaults to None.
+
+        Returns:
+            int: The number of pieces.
+        """
+        mask = self.get_mask(owner_id, piece_type)
+        if region is not None:
+            mask = mask[region]
+        return int(np.count_nonzero(mask))
+
+    def get_owner_counts(self) -> dict[int, int]:
+        """
+        Counts the pieces of every owner at once.
+
+        Returns:
+            dict[int, int]: The owner ID to number of pieces mapping.
+        """
+        owners, counts = np.unique(self.owners[self.types != EMPTY], return_counts=True)
+        return dict(zip(owners.tolist(), counts.tolist(), strict=True))
+
+    def get_region(self, region: tuple[slice, ...]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gets views on the type codes and owner IDs of a region of the board.
+
+        Args:
+            region (Tuple[slice, ...]): The region, e.g. `(slice(0, 3), slice(0, 3))`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The type codes and the owner IDs of the region.
+        """
+        return self.types[region], self.owners[region]
+
+    def apply_changes(self, changes: dict[tuple[int], Piece | None]) -> dict[tuple[int], Piece | None]:
+        """
+        Applies several changes to the board in place, keeping the incremental hash up to date.
+
+        Args:
+            changes (dict[Tuple[int], Piece | None]): The pieces to place, None meaning the position is cleared.
+
+        Returns:
+            dict[Tuple[int], Piece | None]: The inverse changes, reverting the board when applied.
+        """
+        inverse = {}
+        for pos, piece in changes.items():
+            previous = self.remove_piece(pos) if piece is None else self.place_piece(pos, piece)
+            inverse[pos] = previous
+        return inverse
+
+    @staticmethod
+    def stack(boards: Sequence[ArrayBoard]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Stacks the arrays of several boards sharing the same dimensions and piece type registry,
+        e.g. boards derived from the same initial board.
+
+        Args:
+            boards (Sequence[ArrayBoard]): The boards.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The type codes and the owner IDs, shaped `(len(boards), *dimensions)`.
+        """
+        return np.stack([board.types for board in boards]), np.stack([board.owners for board in boards])
+
+    def copy(self) -> ArrayBoard:
+        """
+        Creates a copy of the board. The piece type registry is shared with the copy.
+
+        Returns:
+            ArrayBoard: A copy of the board.
+        """
+        new_board = object.__new__(type(self))
+        new_board.__dict__.update(self.__dict__)
+        new_board.types = self.types.copy()
+        new_board.owners = self.owners.copy()
+        new_board.env = ArrayEnv(new_board)
+        return new_board
+
+    def transform(self, symmetry: Symmetry) -> ArrayBoard:
+        """
+        Creates the image of the board by a symmetry.
+
+        Args:
+            symmetry (Symmetry): The symmetry, which must apply to the dimensions of the board.
+
+        Returns:
+            ArrayBoard: The transformed board.
+        """
+        new_board = self.copy()
+        new_board.types = np.ascontiguousarray(symmetry.apply(self.types))
+        new_board.owners = np.ascontiguousarray(symmetry.apply(self.owners))
+        if self.zobrist is not None:
+            new_board._zobrist_hash = self.get_symmetric_hashes((symmetry,))[0]
+        return new_board
+
+    def get_symmetric_hashes(self, symmetries: tuple[Symmetry, ...]) -> list[int]:
+        """
+        Computes the Zobrist hashes of the images of the board by several symmetries at once, without building them.
+
+        Args:
+            symmetries (tuple[Symmetry, ...]): The symmetries.
+
+        Returns:
+            list[int]: The 64-bit hash of each image, equal to the one a `Board` holding the same pieces would get.
+        """
+        zobrist = self.zobrist or DEFAULT_ZOBRIST_TABLE
+        cells = np.flatnonzero(self.types)
+        hashes = np.zeros(len(symmetries), dtype=np.uint64)
+        if cells.size == 0:
+            return hashes.tolist()
+        # Destination cell of every piece under every symmetry
+        targets = np.stack([symmetry.get_cell_map(self.dimensions) for symmetry in symmetries])[:, cells]
+        types = self.types.ravel()[cells]
+        owners = self.owners.ravel()[cells]
+        for code, owner_id in set(zip(types.tolist(), owners.tolist(), strict=True)):
+            keys = zobrist.get_key_grid(self.dimensions, self._type_names[code], owner_id)
+            selected = targets[:, (types == code) & (owners == owner_id)]
+            hashes ^= np.bitwise_xor.reduce(keys[selected], axis=1)
+        return hashes.tolist()
+
+    def is_hash_incremental(self) -> bool:
+        return self.zobrist is not None
+
+    def get_zobrist_hash(self) -> int:
+        """
+        Gets the full 64-bit Zobrist hash of the board.
+
+        Returns:
+            int: The 64-bit hash, computed from scratch if incremental hashing is disabled.
+        """
+        if self._zobrist_hash is not None:
+            return self._zobrist_hash
+        return DEFAULT_ZOBRIST_TABLE.hash_env(self.env)
+
+    def _get_piece(self, code: int, owner_id: int) -> Piece:
+        return Piece.intern(self._type_names[code], owner_id=owner_id)
+
+    def __deepcopy__(self, _memo: dict) -> ArrayBoard:
+        return self.copy()
+
+    def __hash__(self) -> int:
+        if self._zobrist_hash is not None:
+            return self._zobrist_hash
+        # Type codes depend on the registration order, rank them by type name to get a canonical array
+        names = sorted(self._type_codes)
+        ranks = np.zeros(len(self._type_names), dtype=np.int16)
+        for rank, name in enumerate(names, 1):
+            ranks[self._type_codes[name]] = rank
+        used = tuple(names[rank - 1] for rank in np.unique(ranks[self.types]).tolist() if rank)
+        return hash((used, ranks[self.types].tobytes(), self.owners.tobytes()))
+
+    def __eq__(self, __value: object) -> bool:
+        return hash(self) == hash(__value)
+
+    def __str__(self) -> str:
+        dim = self.get_dimensions()
+        to_print = ""
+        for i in range(dim[0]):
+            for j in range(dim[1]):
+                if self.types[i, j] != EMPTY:
+                    to_print += str(self._type_names[self.types[i, j]]) + " "
+                else:
+                    to_print += "_ "
+            to_print += "\n"
+        return to_print
+
+    def to_json(self) -> dict:
+        data = {"env": {str(pos): piece.to_json() for pos, piece in self.env.items()}, "dim": self.dimensions}
+        if self.zobrist is not None:
+            data["zobrist_seed"] = self.zobrist.seed
+        return data
+
+    @classmethod
+    def from_json(cls, data: str | dict, **_kwargs) -> Serializable:
+        if isinstance(data, str):
+            data = json.loads(data)
+        env = {tuple(ast.literal_eval(pos)): Piece.from_json(piece) for pos, piece in data["env"].items()}
+        seed = data.get("zobrist_seed")
+        zobrist = ZobristTable.from_seed(seed) if seed is not None else None
+        return cls(env=env, dim=data["dim"], zobrist=zobrist)
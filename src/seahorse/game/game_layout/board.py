@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import ast
+import copy
 import json
-from typing import TYPE_CHECKING
+import weakref
+from typing import TYPE_CHECKING, ClassVar
 
+from seahorse.game.game_layout.symmetry import NO_SYMMETRY, Symmetry
+from seahorse.game.game_layout.zobrist import DEFAULT_ZOBRIST_TABLE, ZobristTable
 from seahorse.game.representation import Representation
 from seahorse.utils.serializer import Serializable
 
@@ -14,11 +19,20 @@ class Piece(Serializable):
     """
     A class representing a piece in the game.
 
+    Pieces are immutable values: most boards only hold a handful of distinct `(piece_type, owner_id)` pairs,
+    so a single instance per pair can be shared by all the cells and all the boards through `Piece.intern`.
+    The pool only holds weak references: pieces no board uses anymore, e.g. those of the players of past games,
+    are dropped from it.
+
     Attributes:
         piece_type (str): The type of the piece.
         owner_id (int): The ID of the player who possesses the piece.
     """
 
+    __slots__ = ("__weakref__", "owner_id", "piece_type")
+
+    _pool: ClassVar[weakref.WeakValueDictionary[tuple[type, str, int], Piece]] = weakref.WeakValueDictionary()
+
     def __init__(self, piece_type: str, owner: Player | None = None, owner_id: int=-1) -> None:
         """
         Initializes a new instance of the Piece class.
@@ -33,6 +47,28 @@ class Piece(Serializable):
         else:
             self.owner_id = owner.get_id()
 
+    @classmethod
+    def intern(cls, piece_type: str, owner: Player | None = None, owner_id: int = -1) -> Piece:
+        """
+        Gets the shared instance of a piece, creating it on first request.
+
+        Args:
+            piece_type (str): The type of the piece.
+            owner (Player): The player who possesses the piece.
+            owner_id (int): The ID of the owner, used if no owner is provided.
+
+        Returns:
+            Piece: The shared piece.
+        """
+        if owner is not None:
+            owner_id = owner.get_id()
+        key = (cls, piece_type, owner_id)
+        piece = Piece._pool.get(key)
+        if piece is None:
+            piece = cls(piece_type, owner_id=owner_id)
+            Piece._pool[key] = piece
+        return piece
+
     def get_type(self) -> str:
         """
         Gets the type of the piece.
@@ -67,34 +103,48 @@ class Piece(Serializable):
         return hash(self) == hash(__value)
 
     def to_json(self) -> dict:
-        return self.__dict__
+        return {"piece_type": self.piece_type, "owner_id": self.owner_id}
 
     @classmethod
     def from_json(cls,data: str | dict,**_kwargs) -> Serializable:
         if isinstance(data, str):
             data = json.loads(data)
-        return cls(**data)
+        return cls.intern(**data)
 
 
 class Board(Representation):
     """
     A class representing the game board.
 
+    When a `ZobristTable` is provided, the hash of the board is maintained incrementally by
+    `place_piece` and `remove_piece`, making `__hash__` O(1). The environment should then only
+    be modified through these methods, otherwise the cached hash becomes stale.
+
+    Subclasses can declare the symmetries under which positions are equivalent in `symmetries`
+    (e.g. `symmetry.D4` for a square board), see `symmetry.get_canonical_hash`.
+
     Attributes:
         env (dict[Tuple[int], Piece]): The environment dictionary composed of pieces.
         dimensions (list[int]): The dimensions of the board.
+        zobrist (ZobristTable | None): The table used for incremental hashing, if any.
+        symmetries (tuple[Symmetry, ...]): The symmetries of the board, only the identity by default.
     """
 
-    def __init__(self, env: dict[tuple[int], Piece], dim: list[int]) -> None:
+    symmetries: tuple[Symmetry, ...] = NO_SYMMETRY
+
+    def __init__(self, env: dict[tuple[int], Piece], dim: list[int], zobrist: ZobristTable | None = None) -> None:
         """
         Initializes a new instance of the Board class.
 
         Args:
             env (dict[Tuple[int], Piece]): The environment dictionary composed of pieces.
             dim (list[int]): The dimensions of the board.
+            zobrist (ZobristTable, optional): Enables incremental hashing with the given table. Defaults to None.
         """
         super().__init__(env)
         self.dimensions = dim
+        self.zobrist = zobrist
+        self._zobrist_hash = zobrist.hash_env(env) if zobrist is not None else None
 
     def get_dimensions(self) -> list[int]:
         """
@@ -123,7 +173,135 @@ class Board(Representation):
                 pieces_list.append(key)
         return number, pieces_list
 
+    def place_piece(self, pos: tuple[int], piece: Piece) -> Piece | None:
+        """
+        Places a piece on the board, replacing the one already standing there if any.
+
+        Args:
+            pos (Tuple[int]): The position of the piece.
+            piece (Piece): The piece to place.
+
+        Returns:
+            Piece | None: The piece previously standing on the position, if any.
+        """
+        previous = self.env.get(pos)
+        if self.zobrist is not None:
+            if previous is not None:
+                self._zobrist_hash ^= self.zobrist.get_key(pos, previous.get_type(), previous.get_owner_id())
+            self._zobrist_hash ^= self.zobrist.get_key(pos, piece.get_type(), piece.get_owner_id())
+        self.env[pos] = piece
+        return previous
+
+    def remove_piece(self, pos: tuple[int]) -> Piece | None:
+        """
+        Removes the piece standing on a position.
+
+        Args:
+            pos (Tuple[int]): The position to clear.
+
+        Returns:
+            Piece | None: The removed piece, if any.
+        """
+        previous = self.env.pop(pos, None)
+        if previous is not None and self.zobrist is not None:
+            self._zobrist_hash ^= self.zobrist.get_key(pos, previous.get_type(), previous.get_owner_id())
+        return previous
+
+    def apply_changes(self, changes: dict[tuple[int], Piece | None]) -> dict[tuple[int], Piece | None]:
+        """
+        Applies several changes to the board in place, keeping the incremental hash up to date.
+
+        Args:
+            changes (dict[Tuple[int], Piece | None]): The pieces to place, None meaning the position is cleared.
+
+        Returns:
+            dict[Tuple[int], Piece | None]: The inverse changes, reverting the board when applied.
+        """
+        inverse = {}
+        for pos, piece in changes.items():
+            previous = self.remove_piece(pos) if piece is None else self.place_piece(pos, piece)
+            inverse[pos] = previous
+        return inverse
+
+    def transform(self, symmetry: Symmetry) -> Board:
+        """
+        Creates the image of the board by a symmetry.
+
+        Args:
+            symmetry (Symmetry): The symmetry, which must apply to the dimensions of the board.
+
+        Returns:
+            Board: The transformed board.
+        """
+        new_board = self.copy()
+        dim = self.get_dimensions()
+        new_board.apply_changes(dict.fromkeys(self.env))
+        new_board.apply_changes({symmetry.map_position(pos, dim): piece for pos, piece in self.env.items()})
+        return new_board
+
+    def get_symmetric_hashes(self, symmetries: tuple[Symmetry, ...]) -> list[int]:
+        """
+        Computes the Zobrist hashes of the images of the board by several symmetries, without building them.
+
+        Args:
+            symmetries (tuple[Symmetry, ...]): The symmetries.
+
+        Returns:
+            list[int]: The 64-bit hash of each image.
+        """
+        zobrist = self.zobrist or DEFAULT_ZOBRIST_TABLE
+        dim = self.get_dimensions()
+        hashes = []
+        for symmetry in symmetries:
+            h = 0
+            for pos, piece in self.env.items():
+                h ^= zobrist.get_key(symmetry.map_position(pos, dim), piece.get_type(), piece.get_owner_id())
+            hashes.append(h)
+        return hashes
+
+    def copy(self) -> Board:
+        """
+        Creates a copy of the board sharing its (immutable) pieces.
+        The incremental hash, if enabled, is carried over without being recomputed.
+
+        Returns:
+            Board: A copy of the board.
+        """
+        new_board = copy.copy(self)
+        new_board.env = dict(self.env)
+        return new_board
+
+    def is_hash_incremental(self) -> bool:
+        return self.zobrist is not None
+
+    def get_zobrist_hash(self) -> int:
+        """
+        Gets the full 64-bit Zobrist hash of the board.
+
+        Returns:
+            int: The 64-bit hash, computed from scratch if incremental hashing is disabled.
+        """
+        if self._zobrist_hash is not None:
+            return self._zobrist_hash
+        return DEFAULT_ZOBRIST_TABLE.hash_env(self.env)
+
+    def to_json(self) -> dict:
+        data = {"env": {str(pos): piece.to_json() for pos, piece in self.env.items()}, "dim": self.dimensions}
+        if self.zobrist is not None:
+            data["zobrist_seed"] = self.zobrist.seed
+        return data
+
+    @classmethod
+    def from_json(cls, data: str | dict, **_kwargs) -> Serializable:
+        if isinstance(data, str):
+            data = json.loads(data)
+        env = {tuple(ast.literal_eval(pos)): Piece.from_json(piece) for pos, piece in data["env"].items()}
+        seed = data.get("zobrist_seed")
+        return cls(env=env, dim=data["dim"], zobrist=ZobristTable.from_seed(seed) if seed is not None else None)
+
     def __hash__(self):
+        if self._zobrist_hash is not None:
+            return self._zobrist_hash
         return hash(frozenset([(hash(pos), hash(piece)) for pos, piece in self.env.items()]))
 
     def __eq__(self, __value: object) -> bool:
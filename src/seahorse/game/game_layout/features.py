@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from seahorse.game.game_layout.array_board import ArrayBoard
+
+if TYPE_CHECKING:
+    from seahorse.game.game_state import GameState
+
+
+class BoardFeatureExtractor:
+    """
+    Turns the boards of a batch of states into a single float tensor shaped `(N, C, H, W)`,
+    with one binary plane per piece type and owner.
+
+    In relative mode (the default), the planes of each type are the pieces of the active player then the pieces
+    of its opponents, so that a single evaluator serves both sides. Otherwise, there is one plane per type and
+    player ID. `ArrayBoard` states sharing their piece type registry are stacked without any Python loop,
+    other boards (e.g. `Board`) are read through their environment.
+
+    Attributes:
+        piece_types (tuple[str, ...]): The piece types, in the order of the planes.
+        player_ids (tuple[int, ...] | None): The player IDs in absolute mode, None in relative mode.
+    """
+
+    def __init__(self, piece_types: Sequence[str], player_ids: Sequence[int] | None = None) -> None:
+        """
+        Initializes a new instance of the BoardFeatureExtractor class.
+
+        Args:
+            piece_types (Sequence[str]): The piece types, in the order of the planes.
+            player_ids (Sequence[int], optional): The player IDs, enabling absolute mode. Defaults to None.
+        """
+        self.piece_types = tuple(piece_types)
+        self.player_ids = tuple(player_ids) if player_ids is not None else None
+        self._type_indices = {piece_type: i for i, piece_type in enumerate(self.piece_types)}
+
+    def get_n_channels(self) -> int:
+        """
+        Returns:
+            int: The number of planes per state.
+        """
+        return len(self.piece_types) * (2 if self.player_ids is None else len(self.player_ids))
+
+    def __call__(self, states: Sequence[GameState]) -> np.ndarray:
+        """
+        Extracts the features of states sharing the same board dimensions.
+
+        Args:
+            states (Sequence[GameState]): The states.
+
+        Returns:
+            np.ndarray: The features, shaped `(len(states), C, H, W)`.
+        """
+        reps = [state.get_rep() for state in states]
+        height, width = reps[0].get_dimensions() if reps else (0, 0)
+        features = np.zeros((len(states), self.get_n_channels(), height, width), dtype=np.float32)
+        if not reps:
+            return features
+        active_ids = np.array([state.get_active_player().get_id() for state in states])
+
+        if all(isinstance(rep, ArrayBoard) and rep._type_names == reps[0]._type_names for rep in reps):
+            types, owners = ArrayBoard.stack(reps)
+            type_indices = self._get_type_lut(reps[0]._type_names)[types]
+            n_idx, i_idx, j_idx = np.nonzero(type_indices >= 0)
+            type_idx, owner = type_indices[n_idx, i_idx, j_idx], owners[n_idx, i_idx, j_idx]
+        else:
+            cells = np.array([(n, i, j, self._type_indices.get(piece.get_type(), -1), piece.get_owner_id())
+                              for n, rep in enumerate(reps) for (i, j), piece in rep.get_env().items()],
+                             dtype=np.int64).reshape(-1, 5)
+            n_idx, i_idx, j_idx, type_idx, owner = cells[cells[:, 3] >= 0].T
+
+        if self.player_ids is None:
+            channels = 2 * type_idx + (owner != active_ids[n_idx])
+            kept = slice(None)
+        else:
+            matches = owner[:, None] == np.array(self.player_ids)
+            channels = type_idx * len(self.player_ids) + matches.argmax(axis=1)
+            kept = matches.any(axis=1)
+        features[n_idx[kept], channels[kept], i_idx[kept], j_idx[kept]] = 1.0
+        return features
+
+    def _get_type_lut(self, type_names: list[str | None]) -> np.ndarray:
+        """
+        Maps the type codes of an `ArrayBoard` registry to the plane indices, -1 for ignored types.
+        """
+        return np.array([self._type_indices.get(name, -1) if name is not None else -1 for name in type_names])
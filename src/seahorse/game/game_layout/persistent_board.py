@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from seahorse.game.game_layout.board import Board, Piece
+from seahorse.game.game_layout.zobrist import ZobristTable
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+
+
+class _Node:
+    """
+    An inner node of the trie, storing only its populated children along with their bitmap.
+    """
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    """
+    A bucket of key/value pairs whose keys share the same full hash.
+    """
+
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs: tuple) -> None:
+        self.pairs = pairs
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+class PersistentMap(Mapping):
+    """
+    An immutable mapping implemented as a hash array mapped trie (HAMT).
+
+    Updating the mapping returns a new mapping sharing all the untouched branches with the former one,
+    so that deriving a mapping costs O(log n) time and memory instead of the O(n) of a dictionary copy.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items: Mapping | None = None) -> None:
+        """
+        Initializes a new instance of the PersistentMap class.
+
+        Args:
+            items (Mapping, optional): The initial content of the mapping. Defaults to None.
+        """
+        self._root = _EMPTY_NODE
+        self._size = 0
+        for key, value in (items or {}).items():
+            self._root, added = _assoc(self._root, 0, hash(key), key, value)
+            self._size += added
+
+    def set(self, key: Any, value: Any) -> PersistentMap:
+        """
+        Returns a mapping where a key is bound to a value.
+
+        Args:
+            key (Any): The key.
+            value (Any): The value.
+
+        Returns:
+            PersistentMap: The updated mapping, sharing its structure with this one.
+        """
+        root, added = _assoc(self._root, 0, hash(key), key, value)
+        return self._derive(root, self._size + added)
+
+    def delete(self, key: Any) -> PersistentMap:
+        """
+        Returns a mapping where a key is removed, if present.
+
+        Args:
+            key (Any): The key.
+
+        Returns:
+            PersistentMap: The updated mapping, sharing its structure with this one.
+        """
+        root = _dissoc(self._root, 0, hash(key), key)
+        if root is self._root:
+            return self
+        return self._derive(root if root is not None else _EMPTY_NODE, self._size - 1)
+
+    def _derive(self, root: _Node, size: int) -> PersistentMap:
+        new_map = object.__new__(PersistentMap)
+        new_map._root = root
+        new_map._size = size
+        return new_map
+
+    def __getitem__(self, key: Any) -> Any:
+        h = hash(key)
+        node = self._root
+        shift = 0
+        while True:
+            bit = 1 << ((h >> shift) & _MASK)
+            if not node.bitmap & bit:
+                raise KeyError(key)
+            entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+            if isinstance(entry, _Node):
+                node = entry
+                shift += _BITS
+            elif isinstance(entry, _Collision):
+                for k, v in entry.pairs:
+                    if k == key:
+                        return v
+                raise KeyError(key)
+            elif entry[0] == key:
+                return entry[1]
+            else:
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Any]:
+        stack = [self._root]
+        while stack:
+            for entry in stack.pop().entries:
+                if isinstance(entry, _Node):
+                    stack.append(entry)
+                elif isinstance(entry, _Collision):
+                    yield from (k for k, _ in entry.pairs)
+                else:
+                    yield entry[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+
+def _assoc(node: _Node, shift: int, h: int, key: Any, value: Any) -> tuple[_Node, int]:
+    """
+    Binds a key in the subtree rooted in `node`, path-copying the nodes on the way.
+
+    Returns:
+        tuple[_Node, int]: The new subtree and the number of keys added (0 or 1).
+    """
+    bit = 1 << ((h >> shift) & _MASK)
+    idx = (node.bitmap & (bit - 1)).bit_count()
+    if not node.bitmap & bit:
+        entries = (*node.entries[:idx], (key, value), *node.entries[idx:])
+        return _Node(node.bitmap | bit, entries), 1
+
+    entry = node.entries[idx]
+    if isinstance(entry, _Node):
+        new_entry, added = _assoc(entry, shift + _BITS, h, key, value)
+    elif isinstance(entry, _Collision):
+        pairs = tuple(pair for pair in entry.pairs if pair[0] != key)
+        added = int(len(pairs) == len(entry.pairs))
+        new_entry = _Collision((*pairs, (key, value)))
+    elif entry[0] == key:
+        new_entry, added = (key, value), 0
+    else:
+        new_entry, added = _split(entry, shift + _BITS, h, key, value), 1
+    return _Node(node.bitmap, (*node.entries[:idx], new_entry, *node.entries[idx + 1:])), added
+
+
+def _split(leaf: tuple, shift: int, h: int, key: Any, value: Any) -> _Node | _Collision:
+    """
+    Builds the subtree holding an existing leaf along with a new key.
+    """
+    leaf_hash = hash(leaf[0])
+    if shift >= _HASH_BITS or leaf_hash == h:
+        return _Collision((leaf, (key, value)))
+    node, _ = _assoc(_Node(1 << ((leaf_hash >> shift) & _MASK), (leaf,)), shift, h, key, value)
+    return node
+
+
+def _dissoc(node: _Node, shift: int, h: int, key: Any) -> _Node | None:
+    """
+    Removes a key from the subtree rooted in `node`.
+
+    Returns:
+        _Node | None: The new subtree, `node` itself if the key is absent, None if the subtree became empty.
+    """
+    bit = 1 << ((h >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+    idx = (node.bitmap & (bit - 1)).bit_count()
+    entry = node.entries[idx]
+    if isinstance(entry, _Node):
+        new_entry = _dissoc(entry, shift + _BITS, h, key)
+        if new_entry is entry:
+            return node
+        # Pulling single leaves up keeps the trie as shallow as possible
+        if new_entry is not None and len(new_entry.entries) == 1 and isinstance(new_entry.entries[0], tuple):
+            new_entry = new_entry.entries[0]
+    elif isinstance(entry, _Collision):
+        pairs = tuple(pair for pair in entry.pairs if pair[0] != key)
+        if len(pairs) == len(entry.pairs):
+            return node
+        new_entry = _Collision(pairs) if len(pairs) > 1 else pairs[0]
+    elif entry[0] == key:
+        new_entry = None
+    else:
+        return node
+
+    if new_entry is None:
+        if node.bitmap == bit:
+            return None
+        return _Node(node.bitmap ^ bit, (*node.entries[:idx], *node.entries[idx + 1:]))
+    return _Node(node.bitmap, (*node.entries[:idx], new_entry, *node.entries[idx + 1:]))
+
+
+class PersistentBoard(Board):
+    """
+    A board whose environment is a `PersistentMap`.
+
+    Copies are O(1) and placing or removing a piece costs O(log n), the untouched parts of the environment
+    being shared with the boards it was derived from. Thousands of sibling boards can thus be kept alive
+    at the cost of a few nodes each. As the environment is immutable, it can only be modified through
+    `place_piece`, `remove_piece` and `apply_changes`, or derived with `with_changes`.
+
+    Attributes:
+        env (PersistentMap): The environment mapping composed of pieces.
+        dimensions (list[int]): The dimensions of the board.
+        zobrist (ZobristTable | None): The table used for incremental hashing, if any.
+    """
+
+    def __init__(self, env: Mapping[tuple[int], Piece], dim: list[int], zobrist: ZobristTable | None = None) -> None:
+        """
+        Initializes a new instance of the PersistentBoard class.
+
+        Args:
+            env (Mapping[Tuple[int], Piece]): The environment mapping composed of pieces.
+            dim (list[int]): The dimensions of the board.
+            zobrist (ZobristTable, optional): Enables incremental hashing with the given table. Defaults to None.
+        """
+        super().__init__(env if isinstance(env, PersistentMap) else PersistentMap(env), dim, zobrist)
+
+    def place_piece(self, pos: tuple[int], piece: Piece) -> Piece | None:
+        previous = self.env.get(pos)
+        if self.zobrist is not None:
+            if previous is not None:
+                self._zobrist_hash ^= self.zobrist.get_key(pos, previous.get_type(), previous.get_owner_id())
+            self._zobrist_hash ^= self.zobrist.get_key(pos, piece.get_type(), piece.get_owner_id())
+        self.env = self.env.set(pos, piece)
+        return previous
+
+    def remove_piece(self, pos: tuple[int]) -> Piece | None:
+        previous = self.env.get(pos)
+        if previous is not None:
+            if self.zobrist is not None:
+                self._zobrist_hash ^= self.zobrist.get_key(pos, previous.get_type(), previous.get_owner_id())
+            self.env = self.env.delete(pos)
+        return previous
+
+    def with_changes(self, changes: dict[tuple[int], Piece | None]) -> PersistentBoard:
+        """
+        Derives a new board from this one, which is left untouched.
+
+        Args:
+            changes (dict[Tuple[int], Piece | None]): The pieces to place, None meaning the position is cleared.
+
+        Returns:
+            PersistentBoard: The new board, sharing its structure with this one.
+        """
+        new_board = self.copy()
+        new_board.apply_changes(changes)
+        return new_board
+
+    def copy(self) -> PersistentBoard:
+        """
+        Creates a copy of the board in O(1), the environment being shared.
+
+        Returns:
+            PersistentBoard: A copy of the board.
+        """
+        return copy.copy(self)
+
+    def __deepcopy__(self, _memo: dict) -> PersistentBoard:
+        return self.copy()
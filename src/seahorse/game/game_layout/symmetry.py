@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from seahorse.game.stateless_action import StatelessAction
+
+if TYPE_CHECKING:
+    from seahorse.game.game_state import GameState
+    from seahorse.game.representation import Representation
+
+_GRID_RANK = 2
+
+
+class Symmetry:
+    """
+    A symmetry of a 2D grid: a rotation or a reflection of the dihedral group D4.
+
+    A symmetry is defined by the transform it applies to an array, from which the mapping of the cells is derived.
+    Symmetries swapping the axes (quarter rotations and diagonal reflections) only apply to square grids.
+
+    Attributes:
+        name (str): The name of the symmetry.
+        swaps_axes (bool): Whether the symmetry swaps the axes of the grid.
+    """
+
+    __slots__ = ("_maps", "_transform", "inverse_name", "name", "swaps_axes")
+
+    def __init__(self, name: str, transform: Callable[[np.ndarray], np.ndarray], inverse_name: str,
+                 *, swaps_axes: bool = False) -> None:
+        """
+        Initializes a new instance of the Symmetry class.
+
+        Args:
+            name (str): The name of the symmetry.
+            transform (Callable[[np.ndarray], np.ndarray]): Transforms the two first axes of an array.
+            inverse_name (str): The name of the inverse symmetry.
+            swaps_axes (bool, optional): Whether the symmetry swaps the axes of the grid. Defaults to False.
+        """
+        self.name = name
+        self._transform = transform
+        self.inverse_name = inverse_name
+        self.swaps_axes = swaps_axes
+        self._maps: dict[tuple[int, int], np.ndarray] = {}
+
+    def applies_to(self, dim: Sequence[int]) -> bool:
+        """
+        Args:
+            dim (Sequence[int]): The dimensions of a grid.
+
+        Returns:
+            bool: Whether the symmetry maps the grid onto itself.
+        """
+        return len(dim) == _GRID_RANK and (not self.swaps_axes or dim[0] == dim[1])
+
+    def apply(self, array: np.ndarray) -> np.ndarray:
+        """
+        Transforms an array whose two first axes are the grid.
+
+        Args:
+            array (np.ndarray): The array.
+
+        Returns:
+            np.ndarray: The transformed array, possibly a view of the given one.
+        """
+        return self._transform(array)
+
+    def get_cell_map(self, dim: Sequence[int]) -> np.ndarray:
+        """
+        Gets the mapping of the cells of a grid, as row-major indices.
+
+        Args:
+            dim (Sequence[int]): The dimensions of the grid.
+
+        Returns:
+            np.ndarray: The array whose item `i` is the index of the cell that cell `i` is mapped to.
+        """
+        dim = (int(dim[0]), int(dim[1]))
+        cell_map = self._maps.get(dim)
+        if cell_map is None:
+            # The transformed grid of indices tells where each cell comes from, the map is its inverse
+            origins = self.apply(np.arange(dim[0] * dim[1]).reshape(dim)).ravel()
+            cell_map = np.empty_like(origins)
+            cell_map[origins] = np.arange(origins.size)
+            self._maps[dim] = cell_map
+        return cell_map
+
+    def map_position(self, pos: Sequence[int], dim: Sequence[int]) -> tuple[int, int]:
+        """
+        Maps a position of a grid.
+
+        Args:
+            pos (Sequence[int]): The position.
+            dim (Sequence[int]): The dimensions of the grid.
+
+        Returns:
+            tuple[int, int]: The image of the position.
+        """
+        code = self.get_cell_map(dim)[int(pos[0]) * int(dim[1]) + int(pos[1])]
+        return divmod(int(code), int(dim[1]))
+
+    def map_codes(self, codes: np.ndarray | Sequence[int], dim: Sequence[int]) -> np.ndarray:
+        """
+        Maps row-major cell indices, e.g. the codes of a `GridActionCodec`.
+
+        Args:
+            codes (np.ndarray | Sequence[int]): The indices.
+            dim (Sequence[int]): The dimensions of the grid.
+
+        Returns:
+            np.ndarray: The images of the indices.
+        """
+        return self.get_cell_map(dim)[np.asarray(codes, dtype=np.int64)]
+
+    def map_action(self, action: StatelessAction, dim: Sequence[int], key: str = "position") -> StatelessAction:
+        """
+        Maps an action designating a cell, e.g. `StatelessAction({"position": (i, j)})`.
+
+        Args:
+            action (StatelessAction): The action.
+            dim (Sequence[int]): The dimensions of the grid.
+            key (str, optional): The key of the position in the action data. Defaults to "position".
+
+        Returns:
+            StatelessAction: The image of the action, the other data being left untouched.
+        """
+        return StatelessAction({**action.data, key: self.map_position(action.data[key], dim)})
+
+    def get_inverse(self) -> Symmetry:
+        """
+        Returns:
+            Symmetry: The symmetry undoing this one.
+        """
+        return SYMMETRIES[self.inverse_name]
+
+    def __reduce__(self) -> tuple[Callable, tuple[str]]:
+        # Symmetries are singletons, shipped by name
+        return get_symmetry, (self.name,)
+
+    def __repr__(self) -> str:
+        return f"Symmetry({self.name})"
+
+
+IDENTITY = Symmetry("identity", lambda a: a, "identity")
+ROT90 = Symmetry("rot90", lambda a: np.rot90(a, 1), "rot270", swaps_axes=True)
+ROT180 = Symmetry("rot180", lambda a: np.rot90(a, 2), "rot180")
+ROT270 = Symmetry("rot270", lambda a: np.rot90(a, 3), "rot90", swaps_axes=True)
+FLIP_ROWS = Symmetry("flip_rows", np.flipud, "flip_rows")
+FLIP_COLUMNS = Symmetry("flip_columns", np.fliplr, "flip_columns")
+TRANSPOSE = Symmetry("transpose", lambda a: np.swapaxes(a, 0, 1), "transpose", swaps_axes=True)
+ANTI_TRANSPOSE = Symmetry("anti_transpose", lambda a: np.swapaxes(np.rot90(a, 2), 0, 1), "anti_transpose",
+                          swaps_axes=True)
+
+SYMMETRIES = {symmetry.name: symmetry for symmetry in (IDENTITY, ROT90, ROT180, ROT270, FLIP_ROWS, FLIP_COLUMNS,
+                                                       TRANSPOSE, ANTI_TRANSPOSE)}
+
+NO_SYMMETRY = (IDENTITY,)
+# The full symmetry group of a square
+D4 = tuple(SYMMETRIES.values())
+# The symmetries of a rectangle, also valid on square grids
+D2 = (IDENTITY, ROT180, FLIP_ROWS, FLIP_COLUMNS)
+# Half-turn symmetry, e.g. for games where reflections change the rules
+C2 = (IDENTITY, ROT180)
+
+
+def get_symmetry(name: str) -> Symmetry:
+    """
+    Args:
+        name (str): The name of a symmetry.
+
+    Returns:
+        Symmetry: The symmetry.
+    """
+    return SYMMETRIES[name]
+
+
+def get_board_symmetries(board: Representation) -> tuple[Symmetry, ...]:
+    """
+    Gets the symmetries declared by a board (`symmetries` attribute) that apply to its dimensions.
+
+    Args:
+        board (Representation): The board.
+
+    Returns:
+        tuple[Symmetry, ...]: The applicable symmetries, starting with the identity.
+    """
+    dim = board.get_dimensions()
+    return tuple(symmetry for symmetry in getattr(board, "symmetries", NO_SYMMETRY) if symmetry.applies_to(dim))
+
+
+def get_canonical_hash(board: Representation) -> tuple[int, Symmetry]:
+    """
+    Computes a hash shared by all the boards equivalent under the symmetries of the board,
+    namely the smallest Zobrist hash of the transformed boards.
+
+    Args:
+        board (Representation): A board providing `get_symmetric_hashes`, such as `Board` and `ArrayBoard`.
+
+    Returns:
+        tuple[int, Symmetry]: The 64-bit canonical hash, and the symmetry mapping the board to its canonical form.
+            Actions of the canonical form are mapped back with the inverse of this symmetry.
+    """
+    symmetries = get_board_symmetries(board)
+    hashes = board.get_symmetric_hashes(symmetries)
+    best = min(range(len(symmetries)), key=hashes.__getitem__)
+    return int(hashes[best]), symmetries[best]
+
+
+def get_canonical_state_key(state: GameState) -> tuple[int, Symmetry]:
+    """
+    Computes the counterpart of `GameState.get_state_key` shared by all the states equivalent
+    under the symmetries of their board.
+
+    Args:
+        state (GameState): The state, whose representation provides `get_symmetric_hashes`.
+
+    Returns:
+        tuple[int, Symmetry]: The 64-bit canonical key, and the symmetry mapping the board to its canonical form.
+    """
+    rep = state.get_rep()
+    canonical_hash, symmetry = get_canonical_hash(rep)
+    # The board part of the state key is swapped for its canonical counterpart
+    return state.get_state_key() ^ rep.get_zobrist_hash() ^ canonical_hash, symmetry
+
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+ZOBRIST_MASK = (1 << 64) - 1
+
+
+def mix64(value: int) -> int:
+    """
+    Scrambles an integer into a well-distributed 64-bit value (SplitMix64 finalizer).
+
+    Args:
+        value (int): The integer to scramble.
+
+    Returns:
+        int: The 64-bit scrambled value.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & ZOBRIST_MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & ZOBRIST_MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & ZOBRIST_MASK
+    return value ^ (value >> 31)
+
+
+def _normalize_position(pos: Any) -> Any:
+    # NumPy integers and lists must derive the same key as the plain int tuples they equal
+    if isinstance(pos, tuple | list | np.ndarray):
+        return tuple(int(x) if isinstance(x, np.integer) else x for x in pos)
+    return int(pos) if isinstance(pos, np.integer) else pos
+
+
+class ZobristTable:
+    """
+    A table of 64-bit random keys used to hash a board incrementally.
+
+    A key is associated to every `(position, piece_type, owner_id)` triplet. Keys are derived
+    from a seeded digest rather than from the process-wide random generator, so that the same
+    triplet yields the same key in every process (e.g. in player containers or worker pools).
+    Keys are generated on first use and memoized.
+
+    Attributes:
+        seed (int): The seed of the table.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        """
+        Initializes a new instance of the ZobristTable class.
+
+        Args:
+            seed (int, optional): The seed of the table. Defaults to 0.
+        """
+        self.seed = seed
+        self._keys: dict[tuple[Any, str, int], int] = {}
+        self._grids: dict[tuple[tuple[int, ...], str, int], np.ndarray] = {}
+
+    @classmethod
+    def from_seed(cls, seed: int) -> ZobristTable:
+        """
+        Gets a table from its seed, e.g. when loading a board, reusing the default table if the seeds match.
+
+        Args:
+            seed (int): The seed of the table.
+
+        Returns:
+            ZobristTable: The table.
+        """
+        return DEFAULT_ZOBRIST_TABLE if seed == DEFAULT_ZOBRIST_TABLE.seed else cls(seed)
+
+    def get_key(self, pos: Any, piece_type: str, owner_id: int) -> int:
+        """
+        Gets the key of a piece standing on a given position.
+
+        Args:
+            pos (Any): The position of the piece, lists and NumPy integers being read as tuples and ints.
+            piece_type (str): The type of the piece.
+            owner_id (int): The ID of the owner of the piece.
+
+        Returns:
+            int: The 64-bit key.
+        """
+        if isinstance(pos, list | np.ndarray):
+            pos = _normalize_position(pos)
+        triplet = (pos, piece_type, owner_id)
+        key = self._keys.get(triplet)
+        if key is None:
+            normalized = (_normalize_position(pos), piece_type, int(owner_id))
+            digest = hashlib.blake2b(repr((self.seed, *normalized)).encode(), digest_size=8).digest()
+            key = int.from_bytes(digest, "little")
+            self._keys[triplet] = key
+        return key
+
+    def get_key_grid(self, dim: Sequence[int], piece_type: str, owner_id: int) -> np.ndarray:
+        """
+        Gets the keys of a piece over all the cells of a grid, for vectorized hashing.
+
+        Args:
+            dim (Sequence[int]): The dimensions of the grid.
+            piece_type (str): The type of the piece.
+            owner_id (int): The ID of the owner of the piece.
+
+        Returns:
+            np.ndarray: The uint64 keys of the cells, in row-major order.
+        """
+        triplet = (tuple(int(x) for x in dim), piece_type, owner_id)
+        grid = self._grids.get(triplet)
+        if grid is None:
+            grid = np.fromiter((self.get_key(pos, piece_type, owner_id) for pos in np.ndindex(*triplet[0])),
+                               dtype=np.uint64)
+            self._grids[triplet] = grid
+        return grid
+
+    def hash_env(self, env: dict) -> int:
+        """
+        Computes from scratch the hash of a whole environment.
+
+        Args:
+            env (dict): The environment mapping positions to pieces.
+
+        Returns:
+            int: The 64-bit hash of the environment.
+        """
+        h = 0
+        for pos, piece in env.items():
+            h ^= self.get_key(pos, piece.get_type(), piece.get_owner_id())
+        return h
+
+    def __deepcopy__(self, _memo: dict) -> ZobristTable:
+        # The table only depends on its seed, copies of a board can safely share it
+        return self
+
+    def __getstate__(self) -> dict:
+        # Keys are cheap to regenerate, no need to ship them along with the table
+        return {"seed": self.seed}
+
+    def __setstate__(self, state: dict) -> None:
+        self.seed = state["seed"]
+        self._keys = {}
+        self._grids = {}
+
+
+DEFAULT_ZOBRIST_TABLE = ZobristTable()
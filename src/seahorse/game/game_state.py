@@ -1,28 +1,67 @@
 from abc import abstractmethod
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
+from dataclasses import dataclass, field
 from itertools import cycle
 from typing import Any
 
+import numpy as np
+
 from seahorse.game.action import Action
+from seahorse.game.action_codec import ActionCodec, CodedAction
+from seahorse.game.game_layout.zobrist import ZOBRIST_MASK, mix64
 from seahorse.game.representation import Representation
-from seahorse.game.stateful_action import StatefulAction
+from seahorse.game.stateful_action import LazyStatefulAction, StatefulAction
 from seahorse.game.stateless_action import StatelessAction
 from seahorse.player.player import Player
 from seahorse.utils.custom_exceptions import MethodNotImplementedError
+from seahorse.utils.memo import MemoStats
 from seahorse.utils.serializer import Serializable
 
 
+@dataclass
+class UndoRecord:
+    """
+    A record allowing to revert an action applied in place with `GameState.make_action`.
+
+    Attributes:
+        action (StatelessAction): The action that was applied.
+        scores (Dict[int, Any]): The scores before the action.
+        active_player (Player): The active player before the action.
+        caches (Dict[str, Any]): The cached values of the state before the action.
+        payload (Any): The data returned by `GameState.apply_action_inplace`, or the whole previous
+            attributes of the state, held by reference, if the generic fallback was used.
+        inplace (bool): Whether the action was applied by `GameState.apply_action_inplace`.
+    """
+
+    action: StatelessAction
+    scores: dict[int, Any]
+    active_player: Player
+    caches: dict[str, Any] = field(default_factory=dict)
+    payload: Any = None
+    inplace: bool = True
+
+
 class GameState(Serializable):
     """
     A class representing the game state.
 
+    When `lazy_stateful_actions` is set to True on a subclass, the possible stateful actions are derived
+    from the possible stateless actions and keyed on them, their next game state being only built
+    when it is requested (typically for the action actually played).
+
+    Search algorithms can also mutate a state in place with `make_action` and revert it with
+    `unmake_action` instead of allocating a new state per node with `apply_action`.
+
     Attributes:
         scores (Dict[int, Any]): The scores of the state for each player.
         active_player (Player): The player who can perform an action on the game state.
         players (List[Player]): The list of players.
         rep (Representation): The representation of the game.
+        lazy_stateful_actions (bool): Whether stateful actions are built lazily, False by default.
     """
 
+    lazy_stateful_actions = False
+
     def __init__(self, scores: dict[int, Any], active_player: Player,
                  players: list[Player], rep: Representation) -> None:
         """
@@ -49,6 +88,9 @@ class GameState(Serializable):
         self.rep = rep
         self._possible_stateless_actions = None
         self._possible_stateful_actions = None
+        self._possible_action_codes = None
+        self._hash = None
+        self._memo = {}
 
     def get_player_score(self, player: Player) -> float:
         """
@@ -130,7 +172,8 @@ class GameState(Serializable):
     def get_possible_stateful_actions(self) -> frozenset[StatefulAction]:
         """
         Returns a copy of the possible stateful actions from this state.
-        The first call triggers the `generate_possible_stateful_actions` method.
+        The first call triggers the `generate_possible_stateful_actions` method,
+        or wraps the possible stateless actions if stateful actions are lazy.
 
         Returns:
             FrozenSet[StatefulAction]: The possible actions.
@@ -139,25 +182,248 @@ class GameState(Serializable):
         if self.is_done():
             return frozenset()
         if self._possible_stateful_actions is None:
-            self._possible_stateful_actions = frozenset(self.generate_possible_stateful_actions())
+            if self.lazy_stateful_actions:
+                self._possible_stateful_actions = frozenset(LazyStatefulAction(self, action)
+                                                            for action in self.get_possible_stateless_actions())
+            else:
+                self._possible_stateful_actions = frozenset(self.generate_possible_stateful_actions())
         return self._possible_stateful_actions
 
-    def check_action(self, action: Action) -> bool:
+    def get_action_codec(self) -> ActionCodec | None:
+        """
+        Returns the codec mapping the stateless actions of the game to dense integer codes, if any.
+        This method can be overridden by the user to enable action codes.
+
+        Returns:
+            ActionCodec | None: The codec of the game, None by default.
+        """
+        return None
+
+    def generate_possible_action_codes(self) -> np.ndarray:
+        """
+        Generates the codes of all possible stateless actions from this game state.
+        By default, the generated stateless actions are encoded one by one, this method
+        can be overridden by the user to produce the codes directly.
+
+        Returns:
+            np.ndarray: An int array of the codes of the possible actions.
+        """
+        return self.get_action_codec().encode_many(self.generate_possible_stateless_actions())
+
+    def get_possible_action_codes(self) -> np.ndarray:
+        """
+        Returns the sorted codes of the possible stateless actions from this state.
+        The first call triggers the `generate_possible_action_codes` method.
+
+        Returns:
+            np.ndarray: A sorted int array of the codes of the possible actions.
+        """
+        if self.is_done():
+            return np.empty(0, dtype=np.int64)
+        if self._possible_action_codes is None:
+            self._possible_action_codes = np.sort(np.asarray(self.generate_possible_action_codes(), dtype=np.int64))
+        return self._possible_action_codes
+
+    def get_legal_action_mask(self) -> np.ndarray:
+        """
+        Returns the mask of the possible stateless actions from this state over all the action codes.
+
+        Returns:
+            np.ndarray: A boolean array indexed by action code.
+        """
+        return self.get_action_codec().to_mask(self.get_possible_action_codes())
+
+    @classmethod
+    def batch_legal_action_masks(cls, states: Sequence["GameState"]) -> np.ndarray:
+        """
+        Computes the legal action masks of several game states at once, e.g. to expand a batch of leaves.
+        The generic implementation loops over the states, this method can be overridden by the user
+        to vectorize move generation, typically over the stacked arrays of `ArrayBoard`s.
+
+        Args:
+            states (Sequence[GameState]): The game states, sharing the same action codec.
+
+        Returns:
+            np.ndarray: A boolean matrix whose row `i` is the legal action mask of `states[i]`.
+        """
+        if not states:
+            return np.zeros((0, 0), dtype=bool)
+        masks = np.zeros((len(states), states[0].get_action_codec().size()), dtype=bool)
+        for i, state in enumerate(states):
+            masks[i, state.get_possible_action_codes()] = True
+        return masks
+
+    def compact_action(self, action: Action) -> Action:
+        """
+        Returns the most compact equivalent of an action, to be sent to the master.
+        If the game has a codec, stateless and lazy stateful actions are replaced by their code.
+
+        Args:
+            action (Action): The action.
+
+        Returns:
+            Action: A `CodedAction` if possible, the action itself otherwise.
+        """
+        codec = self.get_action_codec()
+        if codec is None:
+            return action
+        if isinstance(action, LazyStatefulAction):
+            action = action.get_stateless_action()
+        if isinstance(action, StatelessAction):
+            return CodedAction(codec.encode(action))
+        return action
+
+    def check_action(self, action: Action | int) -> bool:
         """
         Checks if an action is feasible.
 
         Args:
-            action (Action): The action to check.
+            action (Action | int): The action to check, or its code.
 
         Returns:
             bool: True if the action is feasible, False otherwise.
         """
+        return self.is_legal(action)
+
+    def is_legal(self, action: Action | int) -> bool:
+        """
+        Indicates if an action can be played from this state.
+        This is the check performed by the game master on every move.
+
+        The default implementation looks the action up in the possible actions, which triggers a full
+        move generation. Designers can override it with a direct check of the rules to make the validation
+        cheaper. Stateful actions can be brought back to stateless ones with `get_stateless_action()` when
+        lazy, or with `convert_stateful_action_to_stateless_action` otherwise.
+        Action codes are checked against the possible action codes.
+
+        Args:
+            action (Action | int): The action to check, or its code.
+
+        Returns:
+            bool: True if the action is legal, False otherwise.
+        """
+        if isinstance(action, CodedAction):
+            action = action.code
+        if isinstance(action, int | np.integer):
+            codes = self.get_possible_action_codes()
+            idx = np.searchsorted(codes, action)
+            return bool(idx < len(codes) and codes[idx] == action)
         if isinstance(action, StatelessAction):
             return action in self.get_possible_stateless_actions()
+        if isinstance(action, LazyStatefulAction):
+            return action.get_stateless_action() in self.get_possible_stateless_actions()
         if isinstance(action, StatefulAction):
+            if self.lazy_stateful_actions:
+                action = LazyStatefulAction(self, self.convert_stateful_action_to_stateless_action(action))
             return action in self.get_possible_stateful_actions()
         return False
 
+    def make_action(self, action: StatelessAction) -> UndoRecord:
+        """
+        Applies an action to the game state in place.
+
+        It relies on `apply_action_inplace` when the game implements it. Otherwise, the successor is built
+        with `apply_action` and the state takes over its attributes, which is correct but does not save
+        any allocation. The cached values of the state (hash, possible actions) are invalidated.
+
+        The fallback keeps the previous attributes by reference (a shallow copy of `__dict__`), to be restored
+        by `unmake_action`: subclasses relying on it must not mutate these attributes in place, neither in
+        `apply_action`, which must build new ones for the successor, nor between `make_action` and `unmake_action`.
+
+        Args:
+            action (StatelessAction): The action to apply.
+
+        Returns:
+            UndoRecord: The record to provide to `unmake_action` to revert the action.
+        """
+        record = UndoRecord(action, dict(self.scores), self.active_player, self._get_caches())
+        try:
+            record.payload = self.apply_action_inplace(action)
+        except MethodNotImplementedError:
+            next_state = self.apply_action(action)
+            record.payload = self.__dict__.copy()
+            record.inplace = False
+            self.__dict__.update(next_state.__dict__)
+        self.invalidate_caches()
+        return record
+
+    def unmake_action(self, record: UndoRecord) -> None:
+        """
+        Reverts an action applied in place with `make_action`.
+        Actions must be reverted in the reverse order they were applied.
+
+        Args:
+            record (UndoRecord): The record returned by `make_action`.
+        """
+        if record.inplace:
+            self.revert_action_inplace(record.payload)
+        else:
+            self.__dict__.clear()
+            self.__dict__.update(record.payload)
+        self.scores = record.scores
+        self.active_player = record.active_player
+        self._set_caches(record.caches)
+
+    def apply_action_inplace(self, action: StatelessAction) -> Any:  # noqa: ARG002
+        """
+        Applies an action to the game state in place, updating its representation, its scores and its
+        active player. This method can be overridden by the user to support allocation-free search,
+        the representation being typically updated with `Board.apply_changes`.
+
+        Args:
+            action (StatelessAction): The action to apply.
+
+        Returns:
+            Any: The data required by `revert_action_inplace` to revert the representation,
+                by default the inverse changes returned by `Board.apply_changes`.
+
+        Raises:
+            MethodNotImplementedError: If the method is not implemented.
+        """
+        raise MethodNotImplementedError()
+
+    def revert_action_inplace(self, payload: Any) -> None:
+        """
+        Reverts the representation to its state before `apply_action_inplace`.
+        Scores and active player are restored by `unmake_action`.
+
+        Args:
+            payload (Any): The data returned by `apply_action_inplace`.
+        """
+        self.rep.apply_changes(payload)
+
+    def invalidate_caches(self) -> None:
+        """
+        Clears all the values cached on the state: hash, possible actions and memoized methods.
+        It must be called by code modifying a state in place outside of `make_action`/`unmake_action`.
+        """
+        self._set_caches({})
+
+    @classmethod
+    def get_memo_stats(cls) -> dict[str, MemoStats]:
+        """
+        Returns the hit/miss counters of the methods decorated with `seahorse.utils.memo.memoized`.
+
+        Returns:
+            Dict[str, MemoStats]: The method name to counters mapping.
+        """
+        return {name: method.memo_stats for name in dir(cls)
+                if (method := getattr(cls, name, None)) is not None and hasattr(method, "memo_stats")}
+
+    def _get_caches(self) -> dict[str, Any]:
+        return {"_possible_stateless_actions": self._possible_stateless_actions,
+                "_possible_stateful_actions": self._possible_stateful_actions,
+                "_possible_action_codes": self._possible_action_codes,
+                "_hash": self._hash,
+                "_memo": self._memo}
+
+    def _set_caches(self, caches: dict[str, Any]) -> None:
+        self._possible_stateless_actions = caches.get("_possible_stateless_actions")
+        self._possible_stateful_actions = caches.get("_possible_stateful_actions")
+        self._possible_action_codes = caches.get("_possible_action_codes")
+        self._hash = caches.get("_hash")
+        self._memo = caches.get("_memo", {})
+
     def convert_gui_data_to_action_data(self, data: dict[str, Any]) -> dict[str, Any]:
         """
         Converts GUI data to stateless action data.
@@ -255,8 +521,30 @@ class GameState(Serializable):
         """
         raise MethodNotImplementedError()
 
+    def get_state_key(self) -> int:
+        """
+        Computes a 64-bit key of the state, e.g. to index a `TranspositionTable`.
+
+        The key combines the Zobrist hash of the representation, when it provides one, with the scores
+        and the active player. Unlike `hash(self)`, it is thus the same in every process for boards.
+
+        Returns:
+            int: The unsigned 64-bit key.
+        """
+        rep = self.rep
+        base = rep.get_zobrist_hash() if hasattr(rep, "get_zobrist_hash") else hash(rep)
+        extra = hash((self.active_player.get_id(), frozenset(self.scores.items())))
+        return (base ^ mix64(extra)) & ZOBRIST_MASK
+
     def __hash__(self) -> int:
-        return hash((hash(frozenset(self.scores.items())), hash(self.rep)))
+        # The hash is only cached when the representation maintains its own hash incrementally,
+        # as game states built on top of it are then expected to be left untouched once created.
+        if self._hash is not None:
+            return self._hash
+        h = hash((hash(frozenset(self.scores.items())), hash(self.rep)))
+        if self.rep.is_hash_incremental():
+            self._hash = h
+        return h
 
     def __eq__(self, value: object) -> bool:
         return hash(self) == hash(value)
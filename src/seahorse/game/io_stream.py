@@ -5,7 +5,7 @@ import json
 import re
 import time
 from collections import deque
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 import dill
@@ -15,8 +15,15 @@ from aiohttp import web
 from loguru import logger
 
 from seahorse.game.action import Action
+from seahorse.utils.custom_exceptions import RoomInUseError
 from seahorse.utils.serializer import Serializable
 
+# The room of clients connecting without a room name
+DEFAULT_ROOM = "default"
+# Seconds a client waits for the master to accept its connection, the master loop possibly being busy with
+# the moves of the other games it hosts
+CONNECT_TIMEOUT = 60
+
 
 class EventSlave:
 
@@ -68,29 +75,236 @@ class EventSlave:
             self.connected = False
 
 
-    async def listen(self,master_address:str,*,keep_alive:bool) -> None:
+    async def listen(self,master_address:str,*,keep_alive:bool,room:str=DEFAULT_ROOM) -> None:
         """Fires up the listening process
 
         Args:
             master_address (str): the address to listen to
             keep_alive (bool): in standalone mode, this should be `True` to keep the asyncio process alive.
+            room (str, optional): the room of the game to join on the master. Defaults to the default room.
         """
         if not self.connected:
-            await self.sio.connect(master_address)
+            await self.sio.connect(master_address, auth={"room": room}, wait_timeout=CONNECT_TIMEOUT)
         if keep_alive:
             while self.connected:
                 await asyncio.sleep(.1)
 
     async def close_connection(self) -> None:
-        await asyncio.sleep(0.5)
         if hasattr(self, "connected") and self.connected:
+            await asyncio.sleep(0.5)
             await self.sio.disconnect()
             self.connected = False
 
+
+class EventRoom:
+    """
+    The clients of one game hosted by an `EventMaster`.
+
+    Each room has its own client registry and event queues. Clients join a room by passing its name
+    in the `auth` payload of their connection (see `EventSlave.listen`), clients without one joining
+    the default room. Events emitted through the room only reach its clients.
+
+    Attributes:
+        name (str): The name of the room.
+        expected_clients (int): The number of listeners the game waits for.
+        busy (bool): Whether the room hosts a game, a room hosting one game at a time.
+    """
+
+    def __init__(self, master: EventMaster, name: str) -> None:
+        self.master = master
+        self.name = name
+        self.expected_clients = 0
+        self.busy = False
+        self.__n_clients_connected = 0
+        self.__identified_clients = {}
+        self.__open_sessions = set()
+        self.__ident2sid = {}
+        self.__sid2ident = {}
+        self.__events = {}
+
+    def add_session(self, sid: str) -> None:
+        self.__open_sessions.add(sid)
+        self.__n_clients_connected += 1
+        logger.info(f"[{self.name}] Waiting for listeners {self.__n_clients_connected} "
+                    f"out of {self.expected_clients} are connected.")
+
+    def remove_session(self, sid: str) -> None:
+        logger.warning(f"[{self.name}] Lost connection: {sid}")
+        self.__n_clients_connected -= 1
+        self.__open_sessions.discard(sid)
+        if sid in self.__sid2ident.keys() and self.__sid2ident[sid] in self.__identified_clients:
+            logger.warning(f"Client identified as {self.__sid2ident[sid]} was lost.")
+            del self.__identified_clients[self.__sid2ident[sid]]
+
+    def record_event(self, sid: str, event: str, data: Any) -> None:
+        self.__events[sid] = self.__events.get(sid,{})
+        self.__events[sid][event] = self.__events[sid].get(event,deque())
+        self.__events[sid][event].appendleft((time.time(),data))
+
+    def record_action(self, sid: str, data: Any) -> None:
+        # TODO : cope with race condition "action" before "identify"
+        try:
+            self.__identified_clients[self.__sid2ident[sid]]["incoming"].appendleft(data)
+        # Plainly throw away packets that belong to disconnected clients
+        except KeyError:
+            pass
+
+    def identify(self, sid: str, data: str) -> None:
+        logger.info("Identifying a listener")
+        logger.info(json.loads(data).get("identifier",0))
+        logger.debug(f"Deserialized data {json.loads(data)}")
+        data = json.loads(data)
+
+        # TODO check presence of "id" in data
+        idf = data.get("identifier",0)
+        reg = r"^"+idf+r"(_duplicate_[0-9]+$|$)"
+        if list(filter(lambda x:re.search(reg,x),self.__ident2sid.keys())):
+            logger.warning("Two clients are using the same identifier, one of those will be ignored.")
+            idf = idf+"_duplicate_"+str(time.time())
+
+        self.__ident2sid[idf]=sid
+        self.__sid2ident[sid]=idf
+        self.__identified_clients[idf]={"sid":sid,"id":data.get("instance_id",None),"incoming":deque(),"attached":False}
+
+    async def emit(self, event: str, data: Any = None, *, to: str | None = None) -> None:
+        """Emits an event to the clients of the room
+
+        Args:
+            event (str): the event label
+            data (Any, optional): the payload. Defaults to None.
+            to (str, optional): the sid of a single recipient. Defaults to None, meaning all the clients of the room.
+        """
+        await self.master.sio.emit(event, data, to=to if to is not None else self.name)
+
+    async def wait_for_next_play(self, sid: int) -> tuple[Action, float]:
+        """Waiting for the next play action, this function is blocking
+
+        Args:
+            sid (int): sid corresponding to the player to wait for
+
+        Returns:
+            Action: returns the received action
+        """
+        # TODO revise sanity checks to avoid critical errors
+        # TODO this force to emit a statefull action, it should be rework to accept all action types
+        logger.info(f"Waiting for next play from {self.__sid2ident[sid]}")
+        while not len(self.__identified_clients[self.__sid2ident[sid]]["incoming"]):
+            await asyncio.sleep(.1)
+        logger.info("Action received")
+        action_json, time_diff = self.__identified_clients[self.__sid2ident[sid]]["incoming"].pop()
+        if isinstance(action_json, str):
+            action_json = json.loads(action_json)
+
+        action_type = dill.loads(action_json["__action_type__"])
+        action = action_type.from_json(action_json)
+
+        return action, time_diff
+
+    async def wait_for_event(self,sid:int,label:str,*,flush_until:float | None=None) -> str | None:
+        """Waits for an aribtrary event emitted by the connection identified by `sid`
+           and labeled with `label`.
+           One might want to ignore all events before a particular timestamp given in `flush_until`
+
+        Args:
+            sid (int): a socketio connexion identifier
+            label (str): the event to wait for
+            flush_until (float, optional): The timestamp treshold. Defaults to None.
+
+        Returns:
+            Coroutine: a promise yielding the data associated to the event
+        """
+        while not len(self.__events.get(sid,{}).get(label,[])):
+            await asyncio.sleep(.1)
+        ts,data = self.__events[sid][label].pop()
+
+        if (not flush_until) or ts>=flush_until:
+            return data
+        else :
+            await self.wait_for_event(sid,label,flush_until=flush_until)
+
+    async def wait_for_identified_client(self,name:str,local_id:int) -> dict[str, Any]:
+        """ Waits for an identified client (a player typically)
+
+        Args:
+            name (str): the name of the remote client
+        Returns:
+            str: the client sid
+        """
+        reg = r"^"+name+r"([0-9]+$|$)"
+        def unattached_match(x):
+            return re.search(reg, x) and not self.__identified_clients[x]["attached"]
+        matching_names = list(filter(unattached_match,self.__ident2sid.keys()))
+        while not matching_names:
+            await asyncio.sleep(.1)
+            matching_names = list(filter(unattached_match,self.__ident2sid.keys()))
+
+        cl = self.__identified_clients[matching_names[0]]
+        self.__identified_clients[matching_names[0]]["attached"] = True
+
+        await self.emit("update_id",json.dumps({"new_id":local_id}),to=cl["sid"])
+        return cl
+
+    async def run(self, task: Callable[[None], None], listeners: list[EventSlave],
+                  close_cb: Callable[[], Awaitable] | None = None) -> None:
+        """
+            Connects the listeners to the room, then runs a task emitting the events of a game,
+            the server being started beforehand (see `EventMaster.start_server`).
+
+            Args:
+                task (Callable[[None],None]): task emitting the events through the room
+                listeners (list[EventSlave]): the listeners of the game
+                close_cb (Callable[[], Awaitable], optional): called once the listeners are disconnected
+
+            Raises:
+                RoomInUseError: if the room already hosts a game
+        """
+        if self.busy:
+            msg = f"Room {self.name} already hosts a game, concurrent games need distinct rooms"
+            raise RoomInUseError(msg)
+        self.busy = True
+        try:
+            await self.__run(task, listeners, close_cb)
+        finally:
+            self.busy = False
+
+    async def __run(self, task: Callable[[None], None], listeners: list[EventSlave],
+                    close_cb: Callable[[], Awaitable] | None) -> None:
+        slaves = list(filter(lambda x:isinstance(x,EventSlave),listeners))
+        self.expected_clients = len(slaves)
+
+        # Waiting for all listeners to connect
+        logger.info(f"Waiting for listeners {self.__n_clients_connected} "
+                    f"out of {self.expected_clients} are connected.")
+        for x in slaves:
+            await x.listen(master_address=f"http://{self.master.hostname}:{self.master.port!s}", keep_alive=False,
+                           room=self.name)
+
+        # Launching the task
+        logger.info(f"Starting match in room {self.name}")
+        task_future = self.master.sio.start_background_task(task)
+
+        # Await the game task completion
+        try:
+            await task_future
+        except asyncio.CancelledError:
+            logger.warning("Game task was cancelled.")
+
+        # Close listeners connection
+        for x in slaves:
+            await x.close_connection()
+
+        if close_cb is not None:
+            await close_cb()
+
+
 class EventMaster:
     """
     Singleton for emitting events
 
+    A single socket.io server, aiohttp app and event loop host any number of games, each one in its own
+    `EventRoom`. Clients and events are dispatched to the room of their session; the methods waiting for
+    a given session are delegated to its room, and the methods of a single game to the default room.
+
     Attributes:
 
 
@@ -125,14 +339,10 @@ class EventMaster:
             raise NotImplementedError(msg)
         else:
             # Initializing attributes
-            self.expected_clients = 0
-            self.__n_clients_connected = 0
-            self.__identified_clients = {}
-            self.__open_sessions = set()
-            self.__ident2sid = {}
-            self.__sid2ident = {}
-            self.__events = {}
+            self.__rooms: dict[str, EventRoom] = {}
+            self.__sid2room: dict[str, EventRoom] = {}
             self.__game_state = game_state
+            self.__serving = False
             self.port = port
             self.hostname = hostname
 
@@ -152,70 +362,69 @@ class EventMaster:
 
             # Shutdown callback
             async def on_shutdown(_):
-                for x in list(self.__open_sessions):
-                    if x in self.__open_sessions:
+                for x in list(self.__sid2room):
+                    if x in self.__sid2room:
                         await self.sio.disconnect(x)
 
             self.app.on_shutdown.append(on_shutdown)
 
             @self.sio.event()
-            def connect(sid, *_):
+            async def connect(sid, _environ, auth=None):
                 """
-                    Handling incoming connections
+                    Handling incoming connections, clients joining the room given in their auth payload
                 """
-                self.__open_sessions.add(sid)
-                self.__n_clients_connected += 1
-                logger.info(f"Waiting for listeners {self.__n_clients_connected} \
-                            out of {self.expected_clients} are connected.")
+                room = self.get_room((auth or {}).get("room", DEFAULT_ROOM))
+                self.__sid2room[sid] = room
+                await self.sio.enter_room(sid, room.name)
+                room.add_session(sid)
 
             @self.sio.event
             def disconnect(sid):
-                logger.warning(f"Lost connection: {sid}")
-                self.__n_clients_connected -= 1
-                self.__open_sessions.remove(sid)
-                if sid in self.__sid2ident.keys() and self.__sid2ident[sid] in self.__identified_clients:
-                    logger.warning(f"Client identified as {self.__sid2ident[sid]} was lost.")
-                    del self.__identified_clients[self.__sid2ident[sid]]
+                room = self.__sid2room.pop(sid, None)
+                if room is not None:
+                    room.remove_session(sid)
 
             @self.sio.on("*")
             async def catch_all(event,sid,data):
-                self.__events[sid] = self.__events.get(sid,{})
-                self.__events[sid][event] = self.__events[sid].get(event,deque())
-                self.__events[sid][event].appendleft((time.time(),data))
+                self.__get_room_of(sid).record_event(sid, event, data)
 
             @self.sio.on("action")
             async def handle_play(sid,*data):
-                # TODO : cope with race condition "action" before "identify"
-                try:
-                    self.__identified_clients[self.__sid2ident[sid]]["incoming"].appendleft(data)
-                # Plainly throw away packets that belong to disconnected clients
-                except KeyError:
-                    pass
+                self.__get_room_of(sid).record_action(sid, data)
 
             @self.sio.on("identify")
             async def handle_identify(sid,data):
-                logger.info("Identifying a listener")
-                logger.info(json.loads(data).get("identifier",0))
-                logger.debug(f"Deserialized data {json.loads(data)}")
-                data = json.loads(data)
+                self.__get_room_of(sid).identify(sid, data)
+
+            # Setting the singleton instance
+            EventMaster.__instance = self
 
-                # TODO check presence of "id" in data
-                idf = data.get("identifier",0)
-                reg = r"^"+idf+r"(_duplicate_[0-9]+$|$)"
-                if list(filter(lambda x:re.search(reg,x),self.__ident2sid.keys())):
-                    logger.warning("Two clients are using the same identifier, one of those will be ignored.")
-                    idf = idf+"_duplicate_"+str(time.time())
+    def get_room(self, name: str = DEFAULT_ROOM) -> EventRoom:
+        """Gets a room, creating it if needed
 
-                self.__ident2sid[idf]=sid
-                self.__sid2ident[sid]=idf
-                self.__identified_clients[idf]={"sid":sid,"id":data.get("instance_id",None),"incoming":deque(),"attached":False}
+        Args:
+            name (str, optional): the name of the room. Defaults to the default room.
 
+        Returns:
+            EventRoom: the room
+        """
+        if name not in self.__rooms:
+            self.__rooms[name] = EventRoom(self, name)
+        return self.__rooms[name]
 
-            # Setting the singleton instance
-            EventMaster.__instance = self
+    def close_room(self, name: str) -> None:
+        """Forgets a room whose game is over
+
+        Args:
+            name (str): the name of the room
+        """
+        self.__rooms.pop(name, None)
+
+    def __get_room_of(self, sid: str) -> EventRoom:
+        return self.__sid2room.get(sid) or self.get_room()
 
     async def wait_for_next_play(self, sid: int) -> tuple[Action, float]:
-        """Waiting for the next play action, this function is blocking
+        """Waiting for the next play action of a session, in its room
 
         Args:
             sid (int): sid corresponding to the player to wait for
@@ -223,25 +432,10 @@ class EventMaster:
         Returns:
             Action: returns the received action
         """
-        # TODO revise sanity checks to avoid critical errors
-        # TODO this force to emit a statefull action, it should be rework to accept all action types
-        logger.info(f"Waiting for next play from {self.__sid2ident[sid]}")
-        while not len(self.__identified_clients[self.__sid2ident[sid]]["incoming"]):
-            await asyncio.sleep(.1)
-        logger.info("Action received")
-        action_json, time_diff = self.__identified_clients[self.__sid2ident[sid]]["incoming"].pop()
-        if isinstance(action_json, str):
-            action_json = json.loads(action_json)
-
-        action_type = dill.loads(action_json["__action_type__"])
-        action = action_type.from_json(action_json)
-
-        return action, time_diff
+        return await self.__get_room_of(sid).wait_for_next_play(sid)
 
     async def wait_for_event(self,sid:int,label:str,*,flush_until:float | None=None) -> str | None:
-        """Waits for an aribtrary event emitted by the connection identified by `sid`
-           and labeled with `label`.
-           One might want to ignore all events before a particular timestamp given in `flush_until`
+        """Waits for an aribtrary event emitted by a session, in its room (see `EventRoom.wait_for_event`)
 
         Args:
             sid (int): a socketio connexion identifier
@@ -251,39 +445,41 @@ class EventMaster:
         Returns:
             Coroutine: a promise yielding the data associated to the event
         """
-        while not len(self.__events.get(sid,{}).get(label,[])):
-            await asyncio.sleep(.1)
-        ts,data = self.__events[sid][label].pop()
+        return await self.__get_room_of(sid).wait_for_event(sid, label, flush_until=flush_until)
 
-        if (not flush_until) or ts>=flush_until:
-            return data
-        else :
-            await self.wait_for_event(sid,label,flush_until=flush_until)
-
-    async def wait_for_identified_client(self,name:str,local_id:int) -> dict[str, Any]:
-        """ Waits for an identified client (a player typically)
+    async def wait_for_identified_client(self,name:str,local_id:int,*,room:str=DEFAULT_ROOM) -> dict[str, Any]:
+        """ Waits for an identified client (a player typically) in a room
 
         Args:
             name (str): the name of the remote client
+            local_id (int): the id given to the client
+            room (str, optional): the room of the client. Defaults to the default room.
         Returns:
             str: the client sid
         """
-        reg = r"^"+name+r"([0-9]+$|$)"
-        def unattached_match(x):
-            return re.search(reg, x) and not self.__identified_clients[x]["attached"]
-        matching_names = list(filter(unattached_match,self.__ident2sid.keys()))
-        while not matching_names:
-            await asyncio.sleep(.1)
-            matching_names = list(filter(unattached_match,self.__ident2sid.keys()))
+        return await self.get_room(room).wait_for_identified_client(name, local_id)
 
-        cl = self.__identified_clients[matching_names[0]]
-        self.__identified_clients[matching_names[0]]["attached"] = True
+    async def start_server(self) -> None:
+        """
+            Starts the tcp server shared by all the rooms, if not started yet.
+        """
+        if not self.__serving:
+            await self.runner.setup()
+            site = web.TCPSite(self.runner, self.hostname, self.port)
+            await site.start()
+            self.__serving = True
 
-        await self.sio.emit("update_id",json.dumps({"new_id":local_id}),to=cl["sid"])
-        return cl
+    async def stop_server(self) -> None:
+        """
+            Stops the tcp server and releases the socket.
+        """
+        if self.__serving:
+            await self.runner.cleanup()
+            self.__serving = False
+            self.runner = web.AppRunner(self.app)
 
     def start(self, task: Callable[[None], None], listeners: list[EventSlave],
-              close_cb: Callable[[], Awaitable] | None = None) -> None:
+              close_cb: Callable[[], Awaitable] | None = None, *, room: str = DEFAULT_ROOM) -> None:
         """
             This method is blocking.
 
@@ -296,35 +492,11 @@ class EventMaster:
 
             Args:
                 task (Callable[[None],None]): task calling `EventMaster.sio.emit()`
+                room (str, optional): the room of the game. Defaults to the default room.
         """
-        slaves = list(filter(lambda x:isinstance(x,EventSlave),listeners))
-        self.expected_clients = len(slaves)
-
-        # Sets the runner up and starts the tcp server
-        self.event_loop.run_until_complete(self.runner.setup())
-        site = web.TCPSite(self.runner, self.hostname, self.port)
-        self.event_loop.run_until_complete(site.start())
-
         async def stop(task):
-            # Waiting for all listeners to connect
-            logger.info(f"Waiting for listeners {self.__n_clients_connected} "
-                        f"out of {self.expected_clients} are connected.")
-            for x in slaves:
-                await x.listen(master_address=f"http://{self.hostname}:{self.port!s}", keep_alive=False)
-
-            # Launching the task
-            logger.info("Starting match")
-            task_future = self.sio.start_background_task(task)
-
-            # Await the game task completion
-            try:
-                await task_future
-            except asyncio.CancelledError:
-                logger.warning("Game task was cancelled.")
-
-            # Close listeners connection
-            for x in slaves:
-                await x.close_connection()
+            await self.start_server()
+            await self.get_room(room).run(task, listeners)
 
             # Explicitly cancel any remaining tasks related to disconnected clients
             # logger.info("Canceling pending tasks related to disconnected clients.")
@@ -336,10 +508,41 @@ class EventMaster:
                     pass
 
             # Cleanup runner to release socket
-            await self.runner.cleanup()
+            await self.stop_server()
 
             if close_cb is not None:
                 await close_cb()
 
         # Blocking call to the procedure
         self.event_loop.run_until_complete(stop(task))
+
+    def run_games(self, games: Iterable[Awaitable]) -> list[Any]:
+        """
+            This method is blocking.
+
+            Runs several games concurrently on the shared server and event loop, e.g. `GameMaster.run_game()`
+            coroutines of masters bound to distinct rooms. If a game fails, the others are cancelled.
+
+            Args:
+                games (Iterable[Awaitable]): the games
+
+            Raises:
+                RoomInUseError: if two games are bound to the same room
+
+            Returns:
+                list[Any]: the results of the games
+        """
+        async def serve():
+            await self.start_server()
+            tasks = [asyncio.ensure_future(game) for game in games]
+            try:
+                return await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            finally:
+                await self.stop_server()
+
+        return self.event_loop.run_until_complete(serve())
@@ -10,13 +10,15 @@ from loguru import logger
 
 from seahorse.game.custom_stat import CustomStat
 from seahorse.game.game_state import GameState
-from seahorse.game.io_stream import EventMaster, EventSlave
+from seahorse.game.io_stream import DEFAULT_ROOM, EventMaster, EventSlave
+from seahorse.game.stateful_action import LazyStatefulAction, StatefulAction
 from seahorse.player.player import Player
-from seahorse.player.proxies import PlayerProxy
+from seahorse.player.proxies import InteractivePlayerProxy, LocalPlayerProxy, PlayerProxy
 from seahorse.utils.custom_exceptions import (
     ActionNotPermittedError,
     MethodNotImplementedError,
     PlayerDuplicateError,
+    RoomInUseError,
     SeahorseTimeoutError,
 )
 
@@ -43,6 +45,8 @@ class GameMaster:
         port: int =8080,
         hostname: str ="localhost",
         time_limit: float = 1e9,
+        *,
+        room: str | None = None,
     ) -> None:
         """
         Initializes a new instance of the GameMaster class.
@@ -53,6 +57,9 @@ class GameMaster:
             players_iterator (Iterable[Player]): An iterable for the players, ordered according
                 to the playing order.
             log_level (str): The name of the log file.
+            room (str, optional): The socket.io room isolating the clients of the game, several games being able
+                to share the server of the `EventMaster`. Defaults to the default room, joined by the clients
+                connecting without a room name; concurrent games must each be given their own room.
         """
         self.timetol = 1e-1
         self.name = name
@@ -79,6 +86,8 @@ class GameMaster:
         self.log_level = log_level
 
         self.emitter = EventMaster.get_instance(initial_game_state.__class__,port=port,hostname=hostname)
+        self.room = self.emitter.get_room(room or DEFAULT_ROOM)
+        self.broadcast = True
         logger.remove()
 
         if "VERDICT" not in logger._core.levels:
@@ -96,7 +105,7 @@ class GameMaster:
         """
         next_player = self.id2player[self.current_game_state.get_active_player().get_id()]
 
-        logger.info(f"time : {self.remaining_time[next_player.get_id()]}s")
+        logger.info("time : {}s", self.remaining_time[next_player.get_id()])
 
         try:
             action, time_diff = await next_player.play(current_state=self.current_game_state,
@@ -110,22 +119,28 @@ class GameMaster:
             msg=SeahorseTimeoutError().message + str(self.remaining_time[next_player.get_id()])
             raise SeahorseTimeoutError(msg)
 
-        possible_actions = self.current_game_state.get_possible_stateful_actions()
-
-        action = action.get_stateful_action(self.current_game_state)
-        if action not in possible_actions:
+        if isinstance(action, StatefulAction):
+            action = action.get_stateful_action(self.current_game_state)
+        if not self.current_game_state.is_legal(action):
             raise ActionNotPermittedError()
 
-        return action.get_next_game_state()
+        # Only the move is checked: the successor is rebuilt rather than taken from the player
+        if isinstance(action, LazyStatefulAction):
+            action = action.get_stateless_action()
+        elif isinstance(action, StatefulAction) and self.current_game_state.lazy_stateful_actions:
+            action = self.current_game_state.convert_stateful_action_to_stateless_action(action)
+        return action.get_stateful_action(self.current_game_state).get_next_game_state()
 
     async def __emit_play_payload__(self) -> None:
         """
         Prepare the game state JSON and add remaining time.
         Emit these infos in a payload through the master's emmiter socket.
         """
+        if not self.broadcast:
+            return
         play_payload = self.current_game_state.to_json()
         play_payload["remaining_time"] = self.remaining_time.copy()
-        await self.emitter.sio.emit(
+        await self.room.emit(
             "play",
             json.dumps(play_payload, default=lambda x: x.to_json()),
         )
@@ -144,8 +159,8 @@ class GameMaster:
 
         while not self.current_game_state.is_done():
             curent_player_id = self.get_game_state().get_active_player().get_id()
-            logger.info(f"Player now playing : {self.get_game_state().get_active_player().get_name()} "
-                        f"- {curent_player_id}")
+            logger.info("Player now playing : {} - {}", self.get_game_state().get_active_player().get_name(),
+                        curent_player_id)
             try:
                 self.current_game_state = await self.step()
             except Exception as e:
@@ -172,20 +187,22 @@ class GameMaster:
 
                 #TODO: This is counter productive as Seahorse is meant to be independant from the Abyss framework.
                 # We should define an abstract method for designers which will fill the infos according to their needs.
-                await self.emitter.sio.emit("done",json.dumps({
-                    "players": [{"id":player.get_id(), "name":player.get_name()}
-                                for player in self.current_game_state.get_players()],
-                    "scores": self.get_scores(),
-                    "custom_stats": self.get_custom_stats(),
-                    "winners_id": [player.get_id() for player in self.get_winner()],
-                    "status": "cancelled",
-                }))
+                if self.broadcast:
+                    await self.room.emit("done",json.dumps({
+                        "players": [{"id":player.get_id(), "name":player.get_name()}
+                                    for player in self.current_game_state.get_players()],
+                        "scores": self.get_scores(),
+                        "custom_stats": self.get_custom_stats(),
+                        "winners_id": [player.get_id() for player in self.get_winner()],
+                        "status": "cancelled",
+                    }))
 
                 logger.verdict(f"{self.current_game_state.get_active_player().get_name()} has been disqualified")
 
                 return self.winner
 
-            logger.info(f"Current game state: \n{self.current_game_state.get_rep()}")
+            # Rendered only when logged, the representation being costly to print
+            logger.info("Current game state: \n{}", self.current_game_state.get_rep())
 
             # Prepare the game state JSON and add remaining time info
             await self.__emit_play_payload__()
@@ -198,14 +215,15 @@ class GameMaster:
             logger.info(f"Winner - {player.get_name()}")
 
         #TODO: Same as todo at line 170.
-        await self.emitter.sio.emit("done",json.dumps({
-            "players": [{"id":player.get_id(), "name":player.get_name()}
-                        for player in self.current_game_state.get_players()],
-            "scores": self.get_scores(),
-            "custom_stats": self.get_custom_stats(),
-            "winners_id": [player.get_id() for player in self.get_winner()],
-            "status": "done",
-        }))
+        if self.broadcast:
+            await self.room.emit("done",json.dumps({
+                "players": [{"id":player.get_id(), "name":player.get_name()}
+                            for player in self.current_game_state.get_players()],
+                "scores": self.get_scores(),
+                "custom_stats": self.get_custom_stats(),
+                "winners_id": [player.get_id() for player in self.get_winner()],
+                "status": "done",
+            }))
         logger.verdict(f"{','.join(w.get_name() for w in self.get_winner())} has won the game")
         return self.get_winner()
 
@@ -239,7 +257,7 @@ class GameMaster:
                     logger.exception(f"Player {self.current_game_state.get_active_player()} threw the following exception.")
 
                 #TODO: make this able to identify multiple invalid agents
-                await self.emitter.sio.emit("done",json.dumps({
+                await self.room.emit("done",json.dumps({
                     "players": [{"id":player.get_id(), "name":player.get_name()}
                                 for player in self.current_game_state.get_players()],
                     "invalid_id": curent_player_id,
@@ -255,7 +273,7 @@ class GameMaster:
             i += 1
 
 
-        await self.emitter.sio.emit("done",json.dumps({
+        await self.room.emit("done",json.dumps({
             "players": [{"id":player.get_id(), "name":player.get_name()}
                         for player in self.current_game_state.get_players()],
             "status": "valid",
@@ -266,13 +284,76 @@ class GameMaster:
         """
         Starts a game and broadcasts its successive states.
         """
-        self.emitter.start(self.play_game, self.players_proxy+(listeners if listeners else []), self.close)
+        self.emitter.start(self.play_game, self.players_proxy+(listeners if listeners else []), self.close,
+                           room=self.room.name)
 
     def record_dummy_game(self, listeners:Optional[list[EventSlave]]=None) -> None:
         """
         Starts a dummy game and broadcasts its successive states.
         """
-        self.emitter.start(self.play_dummy_game, self.players_proxy+(listeners if listeners else []), self.close)
+        self.emitter.start(self.play_dummy_game, self.players_proxy+(listeners if listeners else []), self.close,
+                           room=self.room.name)
+
+    def play_local_game(self, listeners:list[EventSlave] | None=None) -> list[Player]:
+        """
+        Plays the game in-process: local players are called directly in the event loop, their states and actions
+        never going through socket.io. The successive states are only broadcast to the listeners, if any
+        (e.g. a `StateRecorder` or a GUI), the server being started for them only.
+        The player proxies are closed once the game is over, like in the other modes.
+
+        Raises:
+            ValueError: If a player is not a `LocalPlayerProxy`, or is an interactive one.
+
+        Returns:
+            list[Player]: The winners.
+        """
+        for proxy in self.players_proxy:
+            if not isinstance(proxy, LocalPlayerProxy) or isinstance(proxy, InteractivePlayerProxy):
+                msg = f"{proxy} cannot play in-process, only non-interactive local players can"
+                raise ValueError(msg)
+
+        winners = []
+
+        async def task():
+            try:
+                winners.extend(await self.play_game())
+            finally:
+                await self.close()
+
+        # Only this game skips the broadcast when nobody listens
+        self.broadcast = bool(listeners)
+        try:
+            if self.broadcast:
+                self.emitter.start(task, listeners, room=self.room.name)
+            else:
+                self.emitter.event_loop.run_until_complete(task())
+        finally:
+            self.broadcast = True
+        return winners
+
+    async def run_game(self, listeners:list[EventSlave] | None=None) -> list[Player]:
+        """
+        Plays the game in its room, on the running server of the `EventMaster`,
+        for several games to be played concurrently (see `EventMaster.run_games`).
+
+        Returns:
+            list[Player]: The winners.
+        """
+        winners = []
+
+        async def task():
+            winners.extend(await self.play_game())
+
+        try:
+            await self.room.run(task, self.players_proxy+(listeners if listeners else []), self.close)
+        except RoomInUseError:
+            # The room belongs to the game running there, which keeps its sessions
+            raise
+        except BaseException:
+            self.emitter.close_room(self.room.name)
+            raise
+        self.emitter.close_room(self.room.name)
+        return winners
 
     async def close(self):
         for player_proxy in self.players_proxy:
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from collections.abc import Generator, Sequence
+from dataclasses import dataclass
+from itertools import pairwise
+
+import numpy as np
+
+from seahorse.game.game_state import GameState
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.utils.custom_exceptions import MissingActionCodecError, RecordingError
+from seahorse.utils.recordings import (
+    get_recorded_moves,
+    get_recorded_states,
+    get_recorded_winner_ids,
+    infer_action,
+    load_recording,
+)
+
+
+class Replay:
+    """
+    Replays a game by re-applying its actions to its initial state with `apply_action`: no game master, no
+    emit, no timer and no logging.
+
+    Every `checkpoint_every` moves, the reached state is kept, so that jumping to a move only replays the moves
+    since the closest checkpoint. States being immutable, checkpoints are plain references.
+
+    Attributes:
+        initial_state (GameState): The initial state.
+        actions (Sequence[StatelessAction | int]): The actions, or their codes for games with an action codec.
+        checkpoint_every (int): The number of moves between two checkpoints.
+        validate (bool): Whether each action is checked against the rules before being applied.
+    """
+
+    def __init__(self, initial_state: GameState, actions: Sequence[StatelessAction | int], *,
+                 checkpoint_every: int = 16, validate: bool = False) -> None:
+        """
+        Initializes a new instance of the Replay class.
+
+        Args:
+            initial_state (GameState): The initial state.
+            actions (Sequence[StatelessAction | int]): The actions, or their codes.
+            checkpoint_every (int, optional): The number of moves between two checkpoints. Defaults to 16.
+            validate (bool, optional): Whether each action is checked before being applied. Defaults to False.
+        """
+        if checkpoint_every < 1:
+            msg = "Checkpoints must be at least one move apart"
+            raise ValueError(msg)
+        self.initial_state = initial_state
+        self.actions = actions
+        self.checkpoint_every = checkpoint_every
+        self.validate = validate
+        self._checkpoints: dict[int, GameState] = {0: initial_state}
+        self._last_checkpoint = 0
+
+    @classmethod
+    def from_recording(cls, source: str | dict, state_type: type[GameState], *, checkpoint_every: int = 16,
+                       validate: bool = False) -> Replay:
+        """
+        Builds the replay of a recording written by `StateRecorder`, the actions being inferred from the
+        recorded states.
+
+        Args:
+            source (str | dict): The path of the recording, or the recording itself.
+            state_type (type[GameState]): The class of the game states, providing `from_json`.
+            checkpoint_every (int, optional): The number of moves between two checkpoints. Defaults to 16.
+            validate (bool, optional): Whether each action is checked before being applied. Defaults to False.
+
+        Raises:
+            RecordingError: If the recording is empty, or two consecutive states are not linked by a possible action.
+
+        Returns:
+            Replay: The replay.
+        """
+        recording = load_recording(source)
+        if not recording["steps"]:
+            msg = "The recording has no state"
+            raise RecordingError(msg)
+        moves = get_recorded_moves(recording, state_type)
+        initial_state = moves[0][0] if moves else state_type.from_json(recording["steps"][0])
+        return cls(initial_state, [action for _, action in moves], checkpoint_every=checkpoint_every,
+                   validate=validate)
+
+    def get_state(self, k: int) -> GameState:
+        """
+        Gets the state after the first `k` moves, replaying from the closest checkpoint.
+
+        Args:
+            k (int): The number of moves, negative values counting from the end.
+
+        Raises:
+            IndexError: If the game has less than `k` moves.
+            RecordingError: If an action is illegal, when validating.
+
+        Returns:
+            GameState: The state.
+        """
+        if k < 0:
+            k += len(self.actions) + 1
+        if not 0 <= k <= len(self.actions):
+            msg = f"Move {k} is out of the {len(self.actions)} moves of the game"
+            raise IndexError(msg)
+        start = min(k - k % self.checkpoint_every, self._last_checkpoint)
+        state = self._checkpoints[start]
+        for i in range(start, k):
+            state = self._apply(i, state)
+            self._checkpoint(i + 1, state)
+        return state
+
+    def get_final_state(self) -> GameState:
+        """
+        Returns:
+            GameState: The state after all the moves.
+        """
+        return self.get_state(len(self.actions))
+
+    def __iter__(self) -> Generator[GameState, None, None]:
+        """
+        Yields the states of the game, starting with the initial one, checkpointing along the way.
+        """
+        state = self.initial_state
+        yield state
+        for i in range(len(self.actions)):
+            state = self._apply(i, state)
+            self._checkpoint(i + 1, state)
+            yield state
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def _checkpoint(self, k: int, state: GameState) -> None:
+        if k % self.checkpoint_every == 0 and k > self._last_checkpoint:
+            self._checkpoints[k] = state
+            self._last_checkpoint = k
+
+    def _apply(self, i: int, state: GameState) -> GameState:
+        action = self.actions[i]
+        if isinstance(action, int | np.integer):
+            codec = state.get_action_codec()
+            if codec is None:
+                msg = f"{type(state).__name__} has no action codec to decode the replayed moves"
+                raise MissingActionCodecError(msg)
+            action = codec.decode(int(action))
+        if self.validate:
+            if state.is_done():
+                msg = f"Move {i} is played after the end of the game"
+                raise RecordingError(msg)
+            if not state.is_legal(action):
+                msg = f"Move {i} ({action}) is not legal"
+                raise RecordingError(msg)
+        return state.apply_action(action)
+
+
+@dataclass
+class RecordingCheck:
+    """
+    The outcome of the verification of a recording against the current rules.
+
+    Attributes:
+        n_moves (int): The number of recorded moves.
+        move (int | None): The first inconsistent move, None if the recording is consistent.
+        reason (str | None): Why the move is inconsistent.
+    """
+
+    n_moves: int
+    move: int | None = None
+    reason: str | None = None
+
+    def is_consistent(self) -> bool:
+        """
+        Returns:
+            bool: Whether the recording is consistent with the rules.
+        """
+        return self.move is None
+
+
+def verify_recording(source: str | dict, state_type: type[GameState]) -> RecordingCheck:
+    """
+    Checks that a recording is consistent with the current rules of the game: each recorded state must follow
+    from the previous one by a legal action, no move may be played after the end of the game, and finished
+    games must end in a final state whose winners are the recorded ones.
+
+    Args:
+        source (str | dict): The path of the recording, or the recording itself.
+        state_type (type[GameState]): The class of the game states, providing `from_json`.
+
+    Returns:
+        RecordingCheck: The first inconsistency found, if any.
+    """
+    recording = load_recording(source)
+    states = get_recorded_states(recording, state_type)
+    n_moves = max(len(states) - 1, 0)
+    for k, (state, next_state) in enumerate(pairwise(states)):
+        if state.is_done():
+            return RecordingCheck(n_moves, k, "the game goes on after its end")
+        try:
+            infer_action(state, next_state)
+        except RecordingError:
+            return RecordingCheck(n_moves, k, "no legal action leads to the next recorded state")
+
+    summary = recording.get("final_summary")
+    if states and summary is not None and summary.get("status", "done") == "done":
+        if not states[-1].is_done():
+            return RecordingCheck(n_moves, n_moves, "the game is recorded as done but its last state is not final")
+        if sorted(get_recorded_winner_ids({}, states[-1])) != sorted(summary["winners_id"]):
+            return RecordingCheck(n_moves, n_moves, "the final scores do not designate the recorded winners")
+    return RecordingCheck(n_moves)
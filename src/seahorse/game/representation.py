@@ -46,6 +46,16 @@ class Representation(Serializable):
         else:
             return self.env[to_find]
 
+    def is_hash_incremental(self) -> bool:
+        """
+        Indicates if the hash of the representation is maintained incrementally,
+        in which case it is cheap to compute and can be cached by the game state.
+
+        Returns:
+            bool: True if the hash is maintained incrementally, False otherwise.
+        """
+        return False
+
     @abstractmethod
     def __hash__(self) -> int:
         raise MethodNotImplementedError()
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import multiprocessing
+import random
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import dill
+import numpy as np
+from loguru import logger
+
+from seahorse.game.game_state import GameState
+from seahorse.game.stateful_action import StatefulAction
+from seahorse.player.player import Player
+from seahorse.utils.custom_exceptions import ActionNotPermittedError
+
+
+@dataclass
+class GameResult:
+    """
+    The outcome of a simulated game.
+
+    Attributes:
+        scores (Dict[int, Any]): The final scores, indexed by player ID.
+        n_moves (int): The number of moves played.
+        finished (bool): Whether the game reached a final state, rather than the move limit.
+        final_state (GameState | None): The final state, only kept for games played in the calling process.
+    """
+
+    scores: dict[int, Any]
+    n_moves: int
+    finished: bool = True
+    final_state: GameState | None = None
+
+    def get_winner_ids(self) -> list[int]:
+        """
+        Returns:
+            list[int]: The IDs of the players having the best score.
+        """
+        best = max(self.scores.values())
+        return [player_id for player_id, score in self.scores.items() if score == best]
+
+
+@dataclass
+class SimulationReport:
+    """
+    The results of a batch of simulated games.
+
+    Attributes:
+        results (list[GameResult]): The results of the games.
+        elapsed (float): The wall-clock duration of the simulation, in seconds.
+        n_workers (int): The number of processes the games were played in.
+    """
+
+    results: list[GameResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    n_workers: int = 1
+
+    def get_n_games(self) -> int:
+        """
+        Returns:
+            int: The number of games played.
+        """
+        return len(self.results)
+
+    def get_n_moves(self) -> int:
+        """
+        Returns:
+            int: The number of moves played over all the games.
+        """
+        return sum(result.n_moves for result in self.results)
+
+    def get_games_per_second(self) -> float:
+        """
+        Returns:
+            float: The number of games played per second.
+        """
+        return self.get_n_games() / self.elapsed if self.elapsed > 0 else 0.0
+
+    def get_moves_per_second(self) -> float:
+        """
+        Returns:
+            float: The number of moves played per second.
+        """
+        return self.get_n_moves() / self.elapsed if self.elapsed > 0 else 0.0
+
+    def get_win_counts(self) -> dict[int, float]:
+        """
+        Counts the wins of every player, a draw between k players counting as 1/k win for each of them.
+
+        Returns:
+            dict[int, float]: The number of wins, indexed by player ID.
+        """
+        wins: dict[int, float] = {}
+        for result in self.results:
+            winners = result.get_winner_ids()
+            for player_id in result.scores:
+                wins[player_id] = wins.get(player_id, 0.0) + (1 / len(winners) if player_id in winners else 0.0)
+        return wins
+
+    def __str__(self) -> str:
+        return (f"{self.get_n_games()} games, {self.get_n_moves()} moves in {self.elapsed:.3f}s "
+                f"({self.get_games_per_second():.1f} games/s, {self.get_moves_per_second():.0f} moves/s, "
+                f"{self.n_workers} worker(s))")
+
+
+class Simulator:
+    """
+    Plays games directly on `GameState` objects with plain `Player` instances.
+
+    Unlike `GameMaster`, no server is started, players are not proxied, states are not serialized and nothing
+    is logged per move, which makes it suitable for self-play and agent tuning. Games can be spread over a pool
+    of processes, the simulator being shipped to the workers with dill.
+
+    Attributes:
+        initial_state (GameState | Callable[[], GameState]): The initial state of every game, or a factory of it.
+        players (dict[int, Player]): The players computing the actions, indexed by the ID they have in the states.
+        max_moves (int | None): The number of moves after which a game is stopped.
+        time_limit (float | None): The time given to each player for a game, passed to `compute_action`
+            as `remaining_time`. It is decreased by the time spent by the player but not enforced.
+        check_actions (bool): Whether the legality of the actions is checked.
+        quiet (bool): Whether the logs of seahorse are disabled while playing.
+    """
+
+    def __init__(self, initial_state: GameState | Callable[[], GameState], players: list[Player] | None = None,
+                 *, max_moves: int | None = None, time_limit: float | None = None, check_actions: bool = False,
+                 quiet: bool = True) -> None:
+        """
+        Initializes a new instance of the Simulator class.
+
+        Args:
+            initial_state (GameState | Callable[[], GameState]): The initial state of every game, or a factory of it.
+            players (list[Player], optional): The players computing the actions, matched by ID with the players
+                of the states. Defaults to None, meaning the players of the states are used.
+            max_moves (int, optional): The number of moves after which a game is stopped. Defaults to None.
+            time_limit (float, optional): The time given to each player for a game. Defaults to None.
+            check_actions (bool, optional): Whether the legality of the actions is checked. Defaults to False.
+            quiet (bool, optional): Whether the logs of seahorse are disabled while playing. Defaults to True.
+        """
+        self.initial_state = initial_state
+        if players is None:
+            players = self._new_initial_state().get_players()
+        self.players = {player.get_id(): player for player in players}
+        self.max_moves = max_moves
+        self.time_limit = time_limit
+        self.check_actions = check_actions
+        self.quiet = quiet
+
+    def _new_initial_state(self) -> GameState:
+        if isinstance(self.initial_state, GameState):
+            return self.initial_state
+        return self.initial_state()
+
+    def play_game(self, *, keep_state: bool = True) -> GameResult:
+        """
+        Plays a single game.
+
+        Args:
+            keep_state (bool, optional): Whether the final state is kept in the result. Defaults to True.
+
+        Raises:
+            ActionNotPermittedError: If `check_actions` is set and a player returns an illegal action.
+
+        Returns:
+            GameResult: The result of the game.
+        """
+        state = self._new_initial_state()
+        remaining_time = dict.fromkeys(self.players, self.time_limit)
+        n_moves = 0
+        while not state.is_done() and (self.max_moves is None or n_moves < self.max_moves):
+            player_id = state.get_active_player().get_id()
+            start = time.time()
+            action = self.players[player_id].compute_action(current_state=state,
+                                                            remaining_time=remaining_time[player_id])
+            if self.time_limit is not None:
+                remaining_time[player_id] -= time.time() - start
+            if isinstance(action, StatefulAction):
+                action = action.get_stateful_action(state)
+            if self.check_actions and not state.is_legal(action):
+                raise ActionNotPermittedError()
+            state = action.get_stateful_action(state).get_next_game_state()
+            n_moves += 1
+        return GameResult(dict(state.get_scores()), n_moves, state.is_done(), state if keep_state else None)
+
+    def run(self, n_games: int, *, n_workers: int = 1, seed: int | None = None) -> SimulationReport:
+        """
+        Plays a batch of games.
+
+        Args:
+            n_games (int): The number of games.
+            n_workers (int, optional): The number of processes playing the games. Defaults to 1.
+            seed (int, optional): Seeds the random generators of `random` and numpy, each worker getting
+                its own seed. Defaults to None.
+
+        Returns:
+            SimulationReport: The results of the games along with the throughput of the simulation.
+        """
+        if n_workers > 1 and multiprocessing.current_process().daemon:
+            logger.warning("Cannot start worker processes from a daemonic process, simulating in a single process")
+            n_workers = 1
+
+        start = time.time()
+        if n_workers > 1:
+            simulator_dump = dill.dumps(self)
+            seeds = np.random.SeedSequence(seed).generate_state(n_workers).tolist()
+            chunks = [n_games // n_workers + (i < n_games % n_workers) for i in range(n_workers)]
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = [executor.submit(_simulation_worker, simulator_dump, chunk, worker_seed)
+                           for chunk, worker_seed in zip(chunks, seeds, strict=True) if chunk]
+                results = [result for future in futures for result in future.result()]
+        else:
+            if seed is not None:
+                _seed_generators(seed)
+            results = self._play_games(n_games, keep_state=True)
+        report = SimulationReport(results, time.time() - start, n_workers)
+        logger.info(f"Simulation: {report}")
+        return report
+
+    def _play_games(self, n_games: int, *, keep_state: bool) -> list[GameResult]:
+        if self.quiet:
+            logger.disable("seahorse")
+        try:
+            return [self.play_game(keep_state=keep_state) for _ in range(n_games)]
+        finally:
+            if self.quiet:
+                logger.enable("seahorse")
+
+
+def _seed_generators(seed: int) -> None:
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+
+
+def _simulation_worker(simulator_dump: bytes, n_games: int, seed: int) -> list[GameResult]:
+    """
+    Plays games in a worker process, final states being dropped to keep the results cheap to send back.
+    """
+    simulator: Simulator = dill.loads(simulator_dump)
+    _seed_generators(seed)
+    return simulator._play_games(n_games, keep_state=False)
@@ -8,6 +8,7 @@ from seahorse.game.action import Action
 
 if TYPE_CHECKING:
     from seahorse.game.game_state import GameState
+    from seahorse.game.stateless_action import StatelessAction
 
 
 class StatefulAction(Action):
@@ -19,6 +20,8 @@ class StatefulAction(Action):
         new_gs (GameState): The new game state.
     """
 
+    __slots__ = ("current_game_state", "next_game_state")
+
     def __init__(self, current_game_state: GameState, next_game_state: GameState) -> None:
         """
         Initializes a new instance of the Action class.
@@ -78,3 +81,93 @@ class StatefulAction(Action):
         current_st = game_state_type.from_json(data["current_game_state"])
         next_st = game_state_type.from_json(data["next_game_state"])
         return StatefulAction(current_st, next_st)
+
+
+class LazyStatefulAction(StatefulAction):
+    """
+    A stateful action whose next game state is only built when it is requested.
+
+    It is keyed on the current game state and the stateless action leading to the next one,
+    so that testing its membership in a set of legal actions never builds any successor.
+    Only the stateless action is hashed, the current game state being compared on equality.
+
+    Attributes:
+        current_game_state (GameState): The current game state.
+        stateless_action (StatelessAction): The stateless action leading to the next game state.
+    """
+
+    __slots__ = ("_next_game_state", "stateless_action")
+
+    def __init__(self, current_game_state: GameState, stateless_action: StatelessAction) -> None:
+        """
+        Initializes a new instance of the LazyStatefulAction class.
+
+        Args:
+            current_game_state (GameState): The current game state.
+            stateless_action (StatelessAction): The stateless action leading to the next game state.
+        """
+        self.current_game_state = current_game_state
+        self.stateless_action = stateless_action
+        self._next_game_state = None
+
+    @property
+    def next_game_state(self) -> GameState:
+        if self._next_game_state is None:
+            self._next_game_state = self.current_game_state.apply_action(self.stateless_action)
+        return self._next_game_state
+
+    @next_game_state.setter
+    def next_game_state(self, next_game_state: GameState) -> None:
+        self._next_game_state = next_game_state
+
+    def get_stateless_action(self) -> StatelessAction:
+        """
+        Returns the stateless action leading to the next game state.
+
+        Returns:
+            StatelessAction: The stateless action.
+        """
+        return self.stateless_action
+
+    def get_stateful_action(self, game_state: GameState | None = None, *_, **_kwargs) -> LazyStatefulAction:
+        """
+        Returns the stateful action, bound to the given game state if provided.
+
+        Args:
+            game_state (GameState, optional): The game state the action should be played from.
+
+        Returns:
+            LazyStatefulAction: The stateful action.
+        """
+        if game_state is None or game_state is self.current_game_state:
+            return self
+        return LazyStatefulAction(game_state, self.stateless_action)
+
+    def __hash__(self) -> int:
+        # Hashing the state would cost a pass over the board: actions from different states may collide,
+        # equality tells them apart, starting with an identity check which settles the usual lookups
+        return hash(self.stateless_action)
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, LazyStatefulAction) or self.stateless_action != value.stateless_action:
+            return False
+        state, other_state = self.current_game_state, value.current_game_state
+        return state is other_state or state == other_state
+
+    def __str__(self) -> str:
+        return "From:\n" + self.get_current_game_state().get_rep().__str__() + "\nplaying:\n" + \
+            str(self.stateless_action)
+
+    def to_json(self) -> dict:
+        return {"current_game_state": self.current_game_state.to_json(),
+                "stateless_action": self.stateless_action.to_json(),
+                "__action_type__": dill.dumps(type(self)),
+                "__game_state_type__": dill.dumps(type(self.current_game_state))}
+
+    @classmethod
+    def from_json(cls, data: dict) -> LazyStatefulAction:
+        game_state_type = dill.loads(data["__game_state_type__"])
+        stateless_action_type = dill.loads(data["stateless_action"]["__action_type__"])
+        return cls(game_state_type.from_json(data["current_game_state"]),
+                   stateless_action_type.from_json(data["stateless_action"]))
+
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING
 import dill
 
 from seahorse.game.action import Action
-from seahorse.game.stateful_action import StatefulAction
+from seahorse.game.stateful_action import LazyStatefulAction, StatefulAction
 from seahorse.utils.custom_exceptions import NoGameStateProvidedError
 
 if TYPE_CHECKING:
@@ -18,10 +18,15 @@ class StatelessAction(Action):
     """
     A class representing an action in the game.
 
+    The hash of the action is computed once and cached, the data should therefore not be modified
+    after the action is created.
+
     Attributes:
         data (dict): The data of the stateless action.
     """
 
+    __slots__ = ("_hash", "data")
+
     def __init__(self, data: dict) -> None:
         """
         Initializes a new instance of the Action class.
@@ -30,10 +35,12 @@ class StatelessAction(Action):
 
         """
         self.data = data
+        self._hash = None
 
     def get_stateful_action(self, game_state: GameState) -> StatefulAction:
         """
         Returns the stateful action.
+        If the game state works with lazy stateful actions, the next game state is not built yet.
 
         Returns:
             StatefulAction: The stateful action.
@@ -41,10 +48,14 @@ class StatelessAction(Action):
         if game_state is None:
             raise NoGameStateProvidedError()
 
+        if game_state.lazy_stateful_actions:
+            return LazyStatefulAction(game_state, self)
         return StatefulAction(game_state, game_state.apply_action(self))
 
     def __hash__(self) -> int:
-        return hash(tuple(self.data.items()))
+        if self._hash is None:
+            self._hash = hash(tuple(self.data.items()))
+        return self._hash
 
     def __eq__(self, value: object) -> bool:
         return hash(self) == hash(value)
@@ -53,7 +64,7 @@ class StatelessAction(Action):
         return "StatelessAction: " + str(self.data)
 
     def to_json(self) -> dict:
-        return self.__dict__ | {"__action_type__": dill.dumps(type(self))}
+        return {"data": self.data, "__action_type__": dill.dumps(type(self))}
 
     @classmethod
     def from_json(cls, data: str | dict) -> StatelessAction:
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from seahorse.game.action import Action
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.player.batch_evaluator import BatchEvaluator
+from seahorse.player.player import Player
+from seahorse.player.transposition_table import EXACT, LOWER_BOUND, NO_MOVE, UPPER_BOUND, TranspositionTable
+
+if TYPE_CHECKING:
+    from seahorse.game.game_state import GameState
+
+# The clock is only read every so many nodes
+_CLOCK_PERIOD = 256
+# Depth stored for the subtrees searched down to their terminal states, valid at any depth
+_SOLVED_DEPTH = 2**15 - 1
+
+
+class _SearchTimeoutError(Exception):
+    """
+    Raised inside the search when the deadline is reached, to unwind the current iteration.
+    """
+
+
+class AlphaBetaPlayer(Player):
+    """
+    A player choosing its actions with an iterative-deepening alpha-beta search (negamax formulation).
+
+    States are evaluated by a user-supplied function returning the value of a state for a given player,
+    the score difference with the best opponent being used by default. Moves are ordered with the move stored
+    in the transposition table first, then by the history heuristic. A move by the same player is searched
+    without negating the value, so that games where a player may play twice in a row are handled.
+
+    The time spent on a move is derived from the `remaining_time` passed by the master. When the deadline is
+    reached, the current iteration is dropped and the best move of the deepest completed iteration is returned.
+    This move is also published after every iteration (see `Player.publish_action`).
+    Statistics about the last search are kept in `stats`.
+
+    With a `batch_evaluator`, the children of a node searched at depth 1 that are not final are evaluated
+    in a single batch, from the point of view of their active player, rather than one by one with `evaluate`.
+
+    Attributes:
+        evaluation (Callable[[GameState, int], float] | None): The evaluation function.
+        batch_evaluator (BatchEvaluator | None): The evaluator scoring the leaves in batches.
+        max_depth (int): The maximum depth searched.
+        time_fraction (float): The fraction of the remaining time spent on a move.
+        max_time (float | None): The maximum time spent on a move, in seconds.
+        table (TranspositionTable): The transposition table, kept from a move to another.
+        stats (dict[str, Any]): The statistics of the last search.
+    """
+
+    def __init__(self, name: str = "alpha_beta", *, evaluation: Callable[[GameState, int], float] | None = None,
+                 max_depth: int = 64, time_fraction: float = 0.05, max_time: float | None = None,
+                 tt_memory: int = 16 * 2**20, batch_evaluator: BatchEvaluator | None = None, **kwargs) -> None:
+        """
+        Initializes a new instance of the AlphaBetaPlayer class.
+
+        Args:
+            name (str, optional): The name of the player. Defaults to "alpha_beta".
+            evaluation (Callable[[GameState, int], float], optional): A function returning the value of a state
+                for the player of the given ID. Defaults to None, meaning `evaluate` is used.
+            max_depth (int, optional): The maximum depth searched. Defaults to 64.
+            time_fraction (float, optional): The fraction of the remaining time spent on a move. Defaults to 0.05.
+            max_time (float, optional): The maximum time spent on a move, in seconds. Defaults to None.
+            tt_memory (int, optional): The memory budget of the transposition table in bytes. Defaults to 16 MiB.
+            batch_evaluator (BatchEvaluator, optional): The evaluator scoring the leaves in batches.
+                Defaults to None.
+        """
+        super().__init__(name, **kwargs)
+        self.evaluation = evaluation
+        self.max_depth = max_depth
+        self.time_fraction = time_fraction
+        self.max_time = max_time
+        self.table = TranspositionTable(tt_memory)
+        self.batch_evaluator = batch_evaluator
+        self.stats: dict[str, Any] = {}
+        self._history: dict[int, int] = {}
+        self._leaf_values: dict[int, float] = {}
+
+    def compute_action(self, current_state: GameState, remaining_time: float | None = None, **_) -> Action:
+        """
+        Searches the best action from the current state with increasing depths until the time budget is spent.
+
+        Args:
+            current_state (GameState): The current game state.
+            remaining_time (float, optional): The time left to the player for the whole game, in seconds.
+
+        Returns:
+            Action: The best action of the deepest completed iteration.
+        """
+        start = time.time()
+        budget = self.get_time_budget(current_state, remaining_time)
+        self._deadline = start + budget
+        self._nodes = 0
+        self._history = {}
+        self._leaf_values = {}
+        self.table.new_search()
+        self.table.reset_stats()
+
+        best_action, best_value, depth_reached = None, None, 0
+        for depth in range(1, self.max_depth + 1):
+            self._truncated = False
+            try:
+                best_value = self._negamax(current_state, depth, -math.inf, math.inf, root=True)
+            except _SearchTimeoutError:
+                break
+            best_action, depth_reached = self._root_action, depth
+            self.publish_action(best_action)
+            # The whole game tree was searched, or the next iteration is unlikely to complete
+            if not self._truncated or time.time() - start > budget / 2:
+                break
+
+        if best_action is None:
+            best_action = self._ordered_moves(current_state, NO_MOVE)[0][0]
+        elapsed = time.time() - start
+        self.stats = {"depth": depth_reached, "value": best_value, "nodes": self._nodes, "time": elapsed,
+                      "nodes_per_second": self._nodes / elapsed if elapsed > 0 else 0.0,
+                      "tt": self.table.get_stats()}
+        logger.info(f"{self.get_name()}: depth {depth_reached}, {self._nodes} nodes in {elapsed:.3f}s "
+                    f"({self.stats['nodes_per_second']:.0f} nodes/s)")
+        return best_action
+
+    def get_time_budget(self, current_state: GameState, remaining_time: float | None) -> float:  # noqa: ARG002
+        """
+        Computes the time to spend on the current move.
+
+        Args:
+            current_state (GameState): The current game state.
+            remaining_time (float | None): The time left to the player for the whole game, in seconds.
+
+        Returns:
+            float: The time budget in seconds.
+        """
+        budgets = [budget for budget in (self.max_time,) if budget is not None]
+        if remaining_time is not None:
+            budgets.append(remaining_time * self.time_fraction)
+        return max(0.0, min(budgets)) if budgets else math.inf
+
+    def evaluate(self, state: GameState, player_id: int) -> float:
+        """
+        Evaluates a state for a player, with `evaluation` if it was given, or as the difference between
+        the score of the player and the best score of its opponents otherwise.
+
+        Args:
+            state (GameState): The state to evaluate.
+            player_id (int): The ID of the player.
+
+        Returns:
+            float: The value of the state for the player, the higher the better.
+        """
+        if self.evaluation is not None:
+            return self.evaluation(state, player_id)
+        scores = state.get_scores()
+        return scores[player_id] - max((score for pid, score in scores.items() if pid != player_id), default=0)
+
+    def get_move_id(self, state: GameState, action: StatelessAction) -> int:
+        """
+        Gets the identifier of a move stored in the transposition table and the history table.
+
+        Args:
+            state (GameState): The state the action is played on.
+            action (StatelessAction): The action.
+
+        Returns:
+            int: The code of the action if the game has a codec, a 31-bit hash of the action otherwise.
+        """
+        codec = state.get_action_codec()
+        if codec is not None:
+            return codec.encode(action)
+        return hash(action) & 0x7FFFFFFF
+
+    def _ordered_moves(self, state: GameState, tt_move: int) -> list[tuple[StatelessAction, int]]:
+        moves = [(action, self.get_move_id(state, action)) for action in state.get_possible_stateless_actions()]
+        history = self._history
+        moves.sort(key=lambda move: (move[1] == tt_move, history.get(move[1], 0)), reverse=True)
+        return moves
+
+    def _negamax(self, state: GameState, depth: int, alpha: float, beta: float, *, root: bool = False) -> float:
+        self._nodes += 1
+        if self._nodes % _CLOCK_PERIOD == 0 and (time.time() > self._deadline or self.should_stop()):
+            raise _SearchTimeoutError()
+
+        player_id = state.get_active_player().get_id()
+        if state.is_done():
+            return self.evaluate(state, player_id)
+        if depth == 0:
+            self._truncated = True
+            if self._leaf_values:
+                value = self._leaf_values.get(state.get_state_key())
+                if value is not None:
+                    return value
+            return self.evaluate(state, player_id)
+
+        key = state.get_state_key()
+        entry = self.table.probe(key)
+        tt_move = NO_MOVE
+        if entry is not None:
+            tt_move = entry.move
+            if entry.depth >= depth and not root:
+                if entry.depth != _SOLVED_DEPTH:
+                    self._truncated = True
+                if entry.flag == EXACT:
+                    return entry.value
+                if entry.flag == LOWER_BOUND:
+                    alpha = max(alpha, entry.value)
+                else:
+                    beta = min(beta, entry.value)
+                if alpha >= beta:
+                    return entry.value
+
+        original_alpha = alpha
+        best_value, best_move = -math.inf, NO_MOVE
+        truncated, self._truncated = self._truncated, False
+        moves = self._ordered_moves(state, tt_move)
+        children = (state.apply_action(action) for action, _ in moves)
+        if depth == 1 and self.batch_evaluator is not None:
+            children = list(children)
+            leaves = [child for child in children if not child.is_done()]
+            self._leaf_values = dict(zip([leaf.get_state_key() for leaf in leaves],
+                                         self.batch_evaluator.evaluate_many(leaves).tolist(), strict=True))
+        for (action, move_id), child in zip(moves, children, strict=True):
+            if child.get_active_player().get_id() == player_id:
+                value = self._negamax(child, depth - 1, alpha, beta)
+            else:
+                value = -self._negamax(child, depth - 1, -beta, -alpha)
+            if value > best_value:
+                best_value, best_move = value, move_id
+                if root:
+                    self._root_action = action
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self._history[move_id] = self._history.get(move_id, 0) + depth * depth
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(key, best_value, depth if self._truncated else _SOLVED_DEPTH, flag=flag, move=best_move)
+        self._truncated |= truncated
+        return best_value
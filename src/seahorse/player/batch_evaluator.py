@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from seahorse.game.game_layout.features import BoardFeatureExtractor
+    from seahorse.game.game_state import GameState
+
+# Sentinel closing the queue
+_CLOSE = None
+
+
+class BatchEvaluator:
+    """
+    Evaluates states in batches on a background thread.
+
+    Search threads queue the states they want evaluated with `submit`, which returns a future, or block on
+    `evaluate`/`evaluate_many`. The background thread gathers up to `batch_size` queued states, waiting at most
+    `max_wait` seconds for a batch to fill, and scores them with a single call of `evaluate_batch`, typically a
+    NumPy model applied to the features of the whole batch (see `BoardFeatureExtractor`).
+
+    Values are given from the point of view of the active player of each state.
+
+    Attributes:
+        evaluate_batch (Callable[[list[GameState]], np.ndarray]): Scores a list of states.
+        batch_size (int): The maximum number of states per batch.
+        max_wait (float): The time waited for a batch to fill, in seconds.
+        n_batches (int): The number of batches evaluated.
+        n_states (int): The number of states evaluated.
+    """
+
+    def __init__(self, evaluate_batch: Callable[[list[GameState]], np.ndarray], *, batch_size: int = 64,
+                 max_wait: float = 0.001) -> None:
+        """
+        Initializes a new instance of the BatchEvaluator class.
+
+        Args:
+            evaluate_batch (Callable[[list[GameState]], np.ndarray]): Scores a list of states.
+            batch_size (int, optional): The maximum number of states per batch. Defaults to 64.
+            max_wait (float, optional): The time waited for a batch to fill, in seconds. Defaults to 0.001.
+        """
+        self.evaluate_batch = evaluate_batch
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.n_batches = 0
+        self.n_states = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, state: GameState) -> Future:
+        """
+        Queues a state.
+
+        Args:
+            state (GameState): The state to evaluate.
+
+        Returns:
+            Future: The future value of the state.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="batch-evaluator", daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._queue.put((state, future))
+        return future
+
+    def evaluate(self, state: GameState) -> float:
+        """
+        Evaluates a state, waiting for its batch.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            float: The value of the state.
+        """
+        return self.submit(state).result()
+
+    def evaluate_many(self, states: Sequence[GameState]) -> np.ndarray:
+        """
+        Evaluates states, possibly batched with the states queued by other threads.
+
+        Args:
+            states (Sequence[GameState]): The states.
+
+        Returns:
+            np.ndarray: The values of the states.
+        """
+        futures = [self.submit(state) for state in states]
+        return np.array([future.result() for future in futures], dtype=np.float64)
+
+    def get_mean_batch_size(self) -> float:
+        """
+        Returns:
+            float: The mean number of states per batch.
+        """
+        return self.n_states / self.n_batches if self.n_batches else 0.0
+
+    def close(self) -> None:
+        """
+        Stops the background thread once the queued states are evaluated.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_CLOSE)
+            thread.join()
+
+    def __enter__(self) -> BatchEvaluator:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        closing = False
+        while not closing:
+            item = self._queue.get()
+            if item is _CLOSE:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+            self._evaluate(batch)
+
+    def _evaluate(self, batch: list[tuple[GameState, Future]]) -> None:
+        try:
+            values = np.asarray(self.evaluate_batch([state for state, _ in batch]), dtype=np.float64).reshape(-1)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.n_batches += 1
+        self.n_states += len(batch)
+        for (_, future), value in zip(batch, values, strict=True):
+            future.set_result(float(value))
+
+
+class LinearEvaluator:
+    """
+    A batch evaluation function scoring states with a linear model over board features.
+
+    Attributes:
+        extractor (BoardFeatureExtractor): The feature extractor.
+        weights (np.ndarray): The weights, shaped like the features of a single state.
+        bias (float): The bias.
+    """
+
+    def __init__(self, extractor: BoardFeatureExtractor, weights: np.ndarray, bias: float = 0.0) -> None:
+        """
+        Initializes a new instance of the LinearEvaluator class.
+
+        Args:
+            extractor (BoardFeatureExtractor): The feature extractor.
+            weights (np.ndarray): The weights, shaped like the features of a single state.
+            bias (float, optional): The bias. Defaults to 0.0.
+        """
+        self.extractor = extractor
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = bias
+
+    def __call__(self, states: list[GameState]) -> np.ndarray:
+        features = self.extractor(states)
+        return features.reshape(len(states), -1) @ self.weights.reshape(-1) + self.bias
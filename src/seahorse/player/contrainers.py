@@ -1,5 +1,8 @@
 import asyncio
+import multiprocessing
+import queue
 import time
+from multiprocessing.synchronize import Event
 
 import dill
 
@@ -14,49 +17,101 @@ from seahorse.player.player import Player
 from seahorse.utils.serializer import Serializable
 
 
+PARTIAL = "partial"
+FINAL = "final"
+
+
 def container_player_loop(player: Player, in_queue: Queue,
-                          out_queue: Queue, gs: type[GameState]):
+                          out_queue: Queue, stop_event: Event, gs: type[GameState]):
     while True:
         in_value = in_queue.get()
         if in_value is None:
             break
-        current_state_json, remaining_time, kwargs = in_value
+        turn, current_state_json, remaining_time, kwargs = in_value
         current_state = gs.from_json(current_state_json)
+        # The event may still be set by a move collected before the player returned
+        stop_event.clear()
         start = time.time()
-        action = player.compute_action(
-            current_state=current_state,
-            remaining_time=remaining_time,
-            **kwargs)
+
+        def publish(action: Action, turn=turn, current_state=current_state, start=start) -> None:
+            out_queue.put((turn, PARTIAL, current_state.compact_action(action).to_json(), time.time() - start))
+
+        player.bind_anytime(publish, stop_event.is_set)
+        try:
+            action = player.compute_action(
+                current_state=current_state,
+                remaining_time=remaining_time,
+                **kwargs)
+        finally:
+            player.bind_anytime(None, None)
         end = time.time()
 
-        out_queue.put((action.to_json(), end-start))
+        out_queue.put((turn, FINAL, current_state.compact_action(action).to_json(), end-start))
 
     # return player, action, end-start
 
 
 class PlayerContainer(Serializable):
+    """
+    Runs a player in its own process.
+
+    Messages sent back by the process are tagged with the turn they answer, and are either the actions published
+    by the player while computing (partial) or the action it returned (final). If the player published an action,
+    it is collected `soft_margin` seconds before the player runs out of time and the player is asked to stop,
+    instead of timing out. The published action is played right away, and the player is only charged the time
+    elapsed until the soft deadline. The process of the player starts a turn once it returned from the former
+    one: players publishing actions must poll `Player.should_stop` regularly, the time they keep computing after
+    the stop request being taken from their next turn. Messages of former turns are discarded.
+
+    The stop request is a `multiprocessing.Event` rather than a manager proxy, so that polling it is cheap.
+    """
+
     def __init__(self, player: Player,
-                 gs: type[GameState] = GameState) -> None:
+                 gs: type[GameState] = GameState, soft_margin: float = 0.1) -> None:
         self.contained_player = player
+        self.soft_margin = soft_margin
         self.manager: Manager = AioManager()
         self.in_queue: Queue = self.manager.AioQueue()
         self.out_queue: Queue = self.manager.AioQueue()
+        self.stop_event: Event = multiprocessing.Event()
+        self.turn = 0
         self.closed = False
 
         self.process: Process = AioProcess(target=container_player_loop,
                                            daemon=True,
                                            args=(player, self.in_queue,
-                                                 self.out_queue, gs))
+                                                 self.out_queue, self.stop_event, gs))
 
         self.process.start()
 
     async def play(self, current_state: GameState,
                    remaining_time: float, **kwargs) -> tuple[Action, float]:
+        self.turn += 1
+        start = time.time()
+        soft_deadline = start + remaining_time - self.soft_margin
+        hard_deadline = start + remaining_time
+        published = None
         try:
-            await self.in_queue.coro_put((current_state.to_json(),
+            await self.in_queue.coro_put((self.turn, current_state.to_json(),
                                           remaining_time, kwargs))
-            action_json, time_diff = await asyncio.wait_for(self.out_queue.coro_get(),
-                                                            timeout=remaining_time)
+            while True:
+                deadline = hard_deadline if published is None else soft_deadline
+                try:
+                    # Never cancelled, so that no message is consumed by a dangling reader
+                    turn, kind, action_json, time_diff = await self.out_queue.coro_get(
+                        timeout=max(0.0, deadline - time.time()))
+                except queue.Empty:
+                    if published is None:
+                        raise TimeoutError() from None
+                    self.stop_event.set()
+                    # The player's late return is taken from its next turn, not from this one
+                    action_json, time_diff = published, soft_deadline - start
+                    break
+                if turn != self.turn:
+                    continue
+                if kind == FINAL:
+                    break
+                published = action_json
         except Exception as e:
             while not self.out_queue.empty():
                 self.out_queue.get_nowait()
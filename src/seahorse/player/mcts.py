@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any
+
+import dill
+from loguru import logger
+
+from seahorse.game.action import Action
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.player.player import Player
+
+if TYPE_CHECKING:
+    from seahorse.game.game_state import GameState
+
+# The best action is published, and a stop request checked, every so many playouts
+_PUBLISH_PERIOD = 256
+
+
+class MCTSNode:
+    """
+    A node of the search tree of `MCTSPlayer`.
+
+    Attributes:
+        state (GameState): The game state of the node.
+        parent (MCTSNode | None): The parent node, None for the root.
+        action (StatelessAction | None): The action leading from the parent to this node.
+        player_id (int | None): The ID of the player who played `action`.
+        children (list[MCTSNode]): The expanded children.
+        untried (list[StatelessAction]): The actions that are not expanded yet.
+        visits (int): The number of playouts that went through the node.
+        value (float): The sum of the rewards of these playouts for `player_id`.
+    """
+
+    __slots__ = ("action", "children", "parent", "player_id", "state", "untried", "value", "visits")
+
+    def __init__(self, state: GameState, parent: MCTSNode | None = None, action: StatelessAction | None = None,
+                 rng: random.Random | None = None) -> None:
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.player_id = parent.state.get_active_player().get_id() if parent is not None else None
+        self.children: list[MCTSNode] = []
+        self.untried = [] if state.is_done() else list(state.get_possible_stateless_actions())
+        (rng or random).shuffle(self.untried)
+        self.visits = 0
+        self.value = 0.0
+
+
+class MCTSPlayer(Player):
+    """
+    A player choosing its actions with a Monte Carlo tree search (UCT), relying only on the `GameState` API.
+
+    The search stops at a deadline derived from the `remaining_time` passed by the master. With `n_workers > 1`,
+    independent trees are grown from the root in a process pool (root parallelism), the game state being shipped
+    through `to_json`/`from_json`; their statistics are merged to pick the most visited action. Each expanded leaf
+    is evaluated with `leaf_rollouts` successive playouts, averaging out the noise of single rollouts.
+    The worker pool is owned by the player and kept across moves: release it with `close()`, or use the player
+    as a context manager.
+
+    Root parallelism is only available where the player runs in a regular process, e.g. in the `Simulator` or
+    when calling `compute_action` directly. Behind a `LocalPlayerProxy`, the player runs in a daemonic
+    `PlayerContainer` process, which may not start worker processes: the search then falls back to a single
+    process whatever `n_workers`, and a warning is logged.
+
+    Rollouts, rewards and time management can be customized by overriding `rollout_policy`, `reward` and
+    `get_time_budget`. Statistics about the last search are kept in `stats`. When searching in a single process,
+    the most visited action is regularly published (see `Player.publish_action`).
+
+    Attributes:
+        exploration (float): The exploration constant of UCT.
+        n_workers (int): The number of processes growing a tree.
+        leaf_rollouts (int): The number of playouts run from each expanded leaf.
+        time_fraction (float): The fraction of the remaining time spent on a move.
+        max_time (float | None): The maximum time spent on a move, in seconds.
+        max_playouts (int | None): The maximum number of playouts per worker and per move.
+        max_rollout_depth (int | None): The number of moves after which a rollout is stopped and scored.
+        stats (dict[str, Any]): The statistics of the last search.
+    """
+
+    def __init__(self, name: str = "mcts", *, exploration: float = math.sqrt(2), n_workers: int = 1,
+                 leaf_rollouts: int = 1, time_fraction: float = 0.05, max_time: float | None = None,
+                 max_playouts: int | None = None, max_rollout_depth: int | None = None, seed: int | None = None,
+                 **kwargs) -> None:
+        """
+        Initializes a new instance of the MCTSPlayer class.
+
+        Args:
+            name (str, optional): The name of the player. Defaults to "mcts".
+            exploration (float, optional): The exploration constant of UCT. Defaults to sqrt(2).
+            n_workers (int, optional): The number of processes growing a tree, ignored in a player container.
+                Defaults to 1.
+            leaf_rollouts (int, optional): The number of playouts run from each expanded leaf. Defaults to 1.
+            time_fraction (float, optional): The fraction of the remaining time spent on a move. Defaults to 0.05.
+            max_time (float, optional): The maximum time spent on a move, in seconds. Defaults to None.
+            max_playouts (int, optional): The maximum number of playouts per worker and per move. Defaults to None.
+            max_rollout_depth (int, optional): The number of moves after which a rollout is stopped and scored.
+                Defaults to None.
+            seed (int, optional): The seed of the random generator. Defaults to None.
+        """
+        super().__init__(name, **kwargs)
+        self.exploration = exploration
+        self.n_workers = n_workers
+        self.leaf_rollouts = leaf_rollouts
+        self.time_fraction = time_fraction
+        self.max_time = max_time
+        self.max_playouts = max_playouts
+        self.max_rollout_depth = max_rollout_depth
+        self.rng = random.Random(seed)
+        self.stats: dict[str, Any] = {}
+        self._executor: ProcessPoolExecutor | None = None
+        self._pool_size = 0
+
+    def compute_action(self, current_state: GameState, remaining_time: float | None = None, **_) -> Action:
+        """
+        Searches the best action from the current state until the time budget is spent.
+
+        Args:
+            current_state (GameState): The current game state.
+            remaining_time (float, optional): The time left to the player for the whole game, in seconds.
+
+        Returns:
+            Action: The most visited action.
+        """
+        start = time.time()
+        deadline = start + self.get_time_budget(current_state, remaining_time)
+        actions = list(current_state.get_possible_stateless_actions())
+        if len(actions) == 1:
+            return actions[0]
+
+        if self.n_workers > 1 and multiprocessing.current_process().daemon:
+            # Player containers run in daemonic processes, which are not allowed to have children
+            logger.warning(f"{self.get_name()}: cannot start worker processes from a daemonic process, "
+                           "searching in a single process")
+            n_workers = 1
+        else:
+            n_workers = self.n_workers
+
+        if n_workers > 1:
+            results = self._search_in_pool(current_state, deadline, n_workers)
+        else:
+            root, playouts = self.search(current_state, deadline, self.max_playouts, self.rng)
+            results = [([(child.action.data, child.visits, child.value) for child in root.children], playouts)]
+
+        visits: dict[StatelessAction, int] = {}
+        playouts = 0
+        for children, worker_playouts in results:
+            playouts += worker_playouts
+            for data, child_visits, _ in children:
+                action = StatelessAction(data)
+                visits[action] = visits.get(action, 0) + child_visits
+
+        elapsed = time.time() - start
+        self.stats = {"playouts": playouts, "time": elapsed, "n_workers": n_workers,
+                      "playouts_per_second": playouts / elapsed if elapsed > 0 else 0.0}
+        logger.info(f"{self.get_name()}: {playouts} playouts in {elapsed:.3f}s "
+                    f"({self.stats['playouts_per_second']:.0f} playouts/s, {n_workers} worker(s))")
+        if not visits:
+            return self.rng.choice(actions)
+        return max(visits, key=visits.get)
+
+    def get_time_budget(self, current_state: GameState, remaining_time: float | None) -> float:  # noqa: ARG002
+        """
+        Computes the time to spend on the current move.
+
+        Args:
+            current_state (GameState): The current game state.
+            remaining_time (float | None): The time left to the player for the whole game, in seconds.
+
+        Returns:
+            float: The time budget in seconds.
+        """
+        budgets = [budget for budget in (self.max_time,) if budget is not None]
+        if remaining_time is not None:
+            budgets.append(remaining_time * self.time_fraction)
+        if not budgets:
+            return 1.0 if self.max_playouts is None else math.inf
+        return max(0.0, min(budgets))
+
+    def search(self, state: GameState, deadline: float, max_playouts: int | None = None,
+               rng: random.Random | None = None) -> tuple[MCTSNode, int]:
+        """
+        Grows a search tree from a state.
+
+        Args:
+            state (GameState): The root state.
+            deadline (float): The time (as given by `time.time()`) at which the search stops.
+            max_playouts (int, optional): The maximum number of playouts. Defaults to None.
+            rng (random.Random, optional): The random generator. Defaults to None.
+
+        Returns:
+            tuple[MCTSNode, int]: The root of the tree and the number of playouts.
+        """
+        rng = rng or random.Random()
+        root = MCTSNode(state, rng=rng)
+        playouts = 0
+        while time.time() < deadline and (max_playouts is None or playouts < max_playouts):
+            # Selection
+            node = root
+            while not node.untried and node.children:
+                log_visits = math.log(node.visits)
+                node = max(node.children, key=lambda child: child.value / child.visits
+                           + self.exploration * math.sqrt(log_visits / child.visits))
+            # Expansion
+            if node.untried:
+                action = node.untried.pop()
+                child = MCTSNode(node.state.apply_action(action), node, action, rng)
+                node.children.append(child)
+                node = child
+            # Simulation
+            rewards: dict[int, float] = {}
+            for _ in range(self.leaf_rollouts):
+                for player_id, reward in self.rollout(node.state, rng).items():
+                    rewards[player_id] = rewards.get(player_id, 0.0) + reward
+            # Backpropagation
+            while node is not None:
+                node.visits += self.leaf_rollouts
+                if node.player_id is not None:
+                    node.value += rewards.get(node.player_id, 0.0)
+                node = node.parent
+            playouts += self.leaf_rollouts
+            if playouts % _PUBLISH_PERIOD < self.leaf_rollouts:
+                if self.should_stop():
+                    break
+                self.publish_action(max(root.children, key=lambda child: child.visits).action)
+        return root, playouts
+
+    def rollout(self, state: GameState, rng: random.Random) -> dict[int, float]:
+        """
+        Plays a game from a state with the rollout policy.
+
+        Args:
+            state (GameState): The state to start from.
+            rng (random.Random): The random generator.
+
+        Returns:
+            dict[int, float]: The reward of each player, indexed by their ID.
+        """
+        depth = 0
+        while not state.is_done() and (self.max_rollout_depth is None or depth < self.max_rollout_depth):
+            state = state.apply_action(self.rollout_policy(state, rng))
+            depth += 1
+        return self.reward(state)
+
+    def rollout_policy(self, state: GameState, rng: random.Random) -> StatelessAction:
+        """
+        Chooses the action played in a rollout, uniformly at random by default.
+
+        Args:
+            state (GameState): The current state of the rollout.
+            rng (random.Random): The random generator.
+
+        Returns:
+            StatelessAction: The action to play.
+        """
+        return rng.choice(tuple(state.get_possible_stateless_actions()))
+
+    def reward(self, state: GameState) -> dict[int, float]:
+        """
+        Scores the state a rollout stopped on. By default, the players having the best score share a reward of 1.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            dict[int, float]: The reward of each player, indexed by their ID.
+        """
+        scores = state.get_scores()
+        best = max(scores.values())
+        winners = [player_id for player_id, score in scores.items() if score == best]
+        return {player_id: 1 / len(winners) if player_id in winners else 0.0 for player_id in scores}
+
+    def close(self) -> None:
+        """
+        Shuts the worker pool down, if any. A later search starts a new one.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> MCTSPlayer:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The pool stays in the process that started it, workers receive the player without it
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def _search_in_pool(self, state: GameState, deadline: float, n_workers: int) -> list[tuple[list, int]]:
+        if self._executor is not None and self._pool_size != n_workers:
+            self.close()
+        if self._executor is None:
+            self._executor, self._pool_size = ProcessPoolExecutor(max_workers=n_workers), n_workers
+        player_dump, state_type_dump, state_json = dill.dumps(self), dill.dumps(type(state)), state.to_json()
+        try:
+            futures = [self._executor.submit(_root_search_worker, player_dump, state_type_dump, state_json,
+                                             deadline, max_playouts=self.max_playouts,
+                                             seed=self.rng.getrandbits(64))
+                       for _ in range(n_workers)]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A broken pool cannot run anything anymore, the next search starts a new one
+            self.close()
+            raise
+
+
+def _root_search_worker(player_dump: bytes, state_type_dump: bytes, state_json: dict, deadline: float, *,
+                        max_playouts: int | None, seed: int) -> tuple[list[tuple[dict, int, float]], int]:
+    """
+    Grows a tree in a worker process and returns the statistics of the root children, actions being
+    returned as raw data to be merged in the parent process.
+    """
+    player: MCTSPlayer = dill.loads(player_dump)
+    state = dill.loads(state_type_dump).from_json(state_json)
+    root, playouts = player.search(state, deadline, max_playouts, random.Random(seed))
+    return [(child.action.data, child.visits, child.value) for child in root.children], playouts
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import builtins
 from abc import abstractmethod
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 from seahorse.game.action import Action
@@ -16,6 +17,12 @@ class Player(Serializable):
     """
     A base class representing a player in the game.
 
+    Players taking part in the anytime protocol call `publish_action` whenever they find a better action
+    while computing, and poll `should_stop` to return early. When run in a `PlayerContainer`, the last
+    published action is collected instead of a timeout if the player is about to exceed its time.
+    Players publishing actions must poll `should_stop` regularly: a player ignoring it keeps computing after
+    its move was collected, and the extra time is taken from its next turn.
+
     Attributes:
         id (int): The ID of the player.
         name (str) : the name of the player
@@ -36,6 +43,9 @@ class Player(Serializable):
         else:
             self.id = id
 
+    _publisher: Callable[[Action], None] | None = None
+    _stop_check: Callable[[], bool] | None = None
+
     @abstractmethod
     def compute_action(self, current_state: GameState, **kwargs) -> Action:
         """
@@ -52,6 +62,39 @@ class Player(Serializable):
         """
         raise MethodNotImplementedError()
 
+    def publish_action(self, action: Action) -> None:
+        """
+        Publishes the best action found so far by `compute_action`.
+        It is a no-op unless the player is run by a host collecting published actions.
+
+        Args:
+            action (Action): The best action found so far.
+        """
+        if self._publisher is not None:
+            self._publisher(action)
+
+    def should_stop(self) -> bool:
+        """
+        Indicates whether the host asked `compute_action` to return, e.g. because a published action was collected.
+
+        Returns:
+            bool: True if the computation should stop, False otherwise.
+        """
+        return self._stop_check is not None and self._stop_check()
+
+    def bind_anytime(self, publisher: Callable[[Action], None] | None,
+                     stop_check: Callable[[], bool] | None) -> None:
+        """
+        Binds the channels of the anytime protocol, used by the hosts of the player.
+        Players publishing actions must poll `should_stop`, the host stopping them by this channel only.
+
+        Args:
+            publisher (Callable[[Action], None] | None): Called with the actions published by the player.
+            stop_check (Callable[[], bool] | None): Tells whether the player should stop computing.
+        """
+        self._publisher = publisher
+        self._stop_check = stop_check
+
     def get_id(self) -> int:
         """
         Returns:
@@ -7,8 +7,9 @@ from collections.abc import Callable, Coroutine
 from loguru import logger
 
 from seahorse.game.action import Action
+from seahorse.game.action_codec import CodedAction
 from seahorse.game.game_state import GameState
-from seahorse.game.io_stream import EventMaster, EventSlave
+from seahorse.game.io_stream import DEFAULT_ROOM, EventMaster, EventSlave
 from seahorse.game.stateless_action import StatelessAction
 from seahorse.player.contrainers import PlayerContainer
 from seahorse.player.player import Player
@@ -143,8 +144,7 @@ class RemotePlayerProxy(PlayerProxy, EventSlave):
                 state_data = json.dumps({**current_state.to_json()},
                                         default=lambda x: x.to_json())
                 emit_data = (state_data, remaining_time, kwargs)
-                await EventMaster.get_instance().sio.emit(label, emit_data,
-                                                          to=self.sid)
+                await EventMaster.get_instance().sio.emit(label, emit_data, to=self.sid)
                 out = await EventMaster.get_instance()\
                     .wait_for_next_play(self.sid)
                 return out
@@ -160,14 +160,17 @@ class RemotePlayerProxy(PlayerProxy, EventSlave):
     async def close(self) -> None:
         return await self.close_connection()
 
-    async def listen(self, **_) -> None:
+    async def listen(self, *, room: str = DEFAULT_ROOM, **_) -> None:
         """
         Fires up the listening process
 
+        Args:
+            room (str, optional): the room of the game. Defaults to the default room.
+
         Returns:
             Coroutine: A coroutine object.
         """
-        idmap = await EventMaster.get_instance().wait_for_identified_client(self.name,self.instance_id)
+        idmap = await EventMaster.get_instance().wait_for_identified_client(self.name,self.instance_id,room=room)
         self.sid = idmap["sid"]
 
     def to_player(self) -> Player:
@@ -241,7 +244,9 @@ class LocalPlayerProxy(PlayerProxy, EventSlave):
             @functools.wraps(fun)
             async def wrapper(self:EventSlave,*args,**kwargs):
                 action, time_diff = await fun(self,*args, **kwargs)
-                await self.sio.emit(label,(action.to_json(), time_diff))
+                # Proxies playing in-process are not connected, nobody listens to them
+                if self.connected:
+                    await self.sio.emit(label,(action.to_json(), time_diff))
                 return (action, time_diff)
 
             return wrapper
@@ -264,7 +269,11 @@ class LocalPlayerProxy(PlayerProxy, EventSlave):
         action = self.wrapped_player.compute_action(current_state=current_state, remaining_time=remaining_time,**kwargs)
         end = time.time()
 
-        return action.get_stateful_action(game_state=current_state), end-start
+        # Actions are sent as a bare code whenever the game provides a codec
+        action = current_state.compact_action(action)
+        if not isinstance(action, CodedAction):
+            action = action.get_stateful_action(game_state=current_state)
+        return action, end-start
 
     async def close(self) -> None:
         return await self.close_connection()
@@ -327,24 +336,26 @@ class InteractivePlayerProxy(LocalPlayerProxy):
             data_gui = json.loads(response)
             try:
                 data = current_state.convert_gui_data_to_action_data(data_gui)
-                action = StatelessAction(data).get_stateful_action(current_state)
+                action = StatelessAction(data)
 
             except MethodNotImplementedError:
                 #TODO: handle this case
                 action = Action.from_json(data)
 
-            if action in current_state.get_possible_stateful_actions():
+            # Checking the move before building its successor, illegal moves may not be applicable at all
+            if current_state.is_legal(action):
+                action = action.get_stateful_action(current_state)
                 break
             else:
-                await EventMaster.get_instance().sio.emit("ActionNotPermitted",None)
+                await EventMaster.get_instance().sio.emit("ActionNotPermitted",None,to=self.sid)
 
         return action, 0.0 # No time limit for interactive
 
-    async def listen(self, master_address, *, keep_alive: bool) -> None:
+    async def listen(self, master_address, *, keep_alive: bool, room: str = DEFAULT_ROOM) -> None:
         if not self.shared_sid:
-            await super().listen(master_address, keep_alive=keep_alive)
+            await super().listen(master_address, keep_alive=keep_alive, room=room)
             embedded_client = GUIClient(path=self.path)
-            await embedded_client.listen()
+            await embedded_client.listen(room=room)
             self.sid = embedded_client.sid
 
     def share_sid(self,proxy:"InteractivePlayerProxy"):
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from array import array
+from typing import NamedTuple
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+NO_MOVE = -1
+
+# keys (Q) + values (d) + moves (i) + depths (h) + flags (b) + generations (B)
+ENTRY_SIZE = 8 + 8 + 4 + 2 + 1 + 1
+
+
+class TTEntry(NamedTuple):
+    """
+    An entry of the transposition table.
+
+    Attributes:
+        value (float): The value of the state.
+        depth (int): The depth of the search the value comes from.
+        flag (int): Whether the value is `EXACT`, a `LOWER_BOUND` or an `UPPER_BOUND`.
+        move (int): The code of the best move found, `NO_MOVE` if unknown.
+    """
+
+    value: float
+    depth: int
+    flag: int
+    move: int
+
+
+class TranspositionTable:
+    """
+    A fixed-size transposition table keyed on 64-bit state keys (see `GameState.get_state_key`).
+
+    Entries are stored in flat typed arrays allocated once, so the table never grows beyond its memory budget.
+    The table is organized in buckets of two slots: the first one keeps the deepest entry of the current
+    search (depth-preferred), the second one always receives the entries that do not fit in the first one,
+    so that it holds the most recent of them. Entries from former searches (see `new_search`) are replaced first.
+
+    Attributes:
+        n_buckets (int): The number of buckets, a power of two.
+        probes (int): The number of lookups.
+        hits (int): The number of lookups that found their key.
+        collisions (int): The number of lookups landing on a bucket filled with other keys.
+        stores (int): The number of entries written.
+        overwrites (int): The number of entries of other keys evicted by a write.
+    """
+
+    def __init__(self, max_memory: int = 16 * 2**20) -> None:
+        """
+        Initializes a new instance of the TranspositionTable class.
+
+        Args:
+            max_memory (int, optional): The memory budget of the table in bytes. Defaults to 16 MiB.
+        """
+        n_buckets = 1
+        while 4 * n_buckets * ENTRY_SIZE <= max_memory:
+            n_buckets *= 2
+        self.n_buckets = n_buckets
+        self._mask = n_buckets - 1
+        self.generation = 0
+        n_slots = 2 * n_buckets
+        self._keys = array("Q", bytes(8 * n_slots))
+        self._values = array("d", bytes(8 * n_slots))
+        self._moves = array("i", bytes(4 * n_slots))
+        self._depths = array("h", [-1]) * n_slots
+        self._flags = array("b", bytes(n_slots))
+        self._generations = array("B", bytes(n_slots))
+        self.reset_stats()
+
+    def probe(self, key: int) -> TTEntry | None:
+        """
+        Looks a state up.
+
+        Args:
+            key (int): The 64-bit key of the state.
+
+        Returns:
+            TTEntry | None: The entry of the state, None if it is not stored.
+        """
+        self.probes += 1
+        slot = 2 * (key & self._mask)
+        for i in (slot, slot + 1):
+            if self._keys[i] == key and self._depths[i] >= 0:
+                self.hits += 1
+                return TTEntry(self._values[i], self._depths[i], self._flags[i], self._moves[i])
+        if self._depths[slot] >= 0:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, value: float, depth: int, flag: int = EXACT, move: int = NO_MOVE) -> None:
+        """
+        Stores the result of a search.
+
+        Args:
+            key (int): The 64-bit key of the state.
+            value (float): The value of the state.
+            depth (int): The depth of the search the value comes from.
+            flag (int, optional): Whether the value is `EXACT`, a `LOWER_BOUND` or an `UPPER_BOUND`.
+                Defaults to `EXACT`.
+            move (int, optional): The code of the best move found. Defaults to `NO_MOVE`.
+        """
+        self.stores += 1
+        slot = 2 * (key & self._mask)
+        keys, depths = self._keys, self._depths
+        if keys[slot + 1] == key and depths[slot + 1] >= 0:
+            target = slot + 1
+        elif (keys[slot] == key or depths[slot] < 0 or self._generations[slot] != self.generation
+              or depth >= depths[slot]):
+            if keys[slot] != key and depths[slot] >= 0:
+                # The depth-preferred entry is demoted to the always-replace slot
+                self.overwrites += depths[slot + 1] >= 0
+                self._write(slot + 1, keys[slot], self._values[slot], depths[slot], self._flags[slot],
+                            self._moves[slot], self._generations[slot])
+            target = slot
+        else:
+            target = slot + 1
+            self.overwrites += depths[target] >= 0
+        self._write(target, key, value, depth, flag, move, self.generation)
+
+    def _write(self, i: int, key: int, value: float, depth: int, flag: int, move: int,  # noqa: PLR0917
+               generation: int) -> None:
+        self._keys[i] = key
+        self._values[i] = value
+        self._depths[i] = depth
+        self._flags[i] = flag
+        self._moves[i] = move
+        self._generations[i] = generation
+
+    def new_search(self) -> None:
+        """
+        Marks the beginning of a new search, entries of former searches becoming the first to be replaced.
+        """
+        self.generation = (self.generation + 1) % 256
+
+    def clear(self) -> None:
+        """
+        Empties the table.
+        """
+        self._depths = array("h", [-1]) * len(self._depths)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """
+        Resets the statistics of the table.
+        """
+        self.probes = 0
+        self.hits = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def get_stats(self) -> dict[str, float]:
+        """
+        Returns the statistics of the table.
+
+        Returns:
+            dict[str, float]: The counters along with the hit rate and the fraction of used slots.
+        """
+        return {"probes": self.probes, "hits": self.hits, "collisions": self.collisions, "stores": self.stores,
+                "overwrites": self.overwrites, "hit_rate": self.hits / self.probes if self.probes else 0.0,
+                "fill": sum(1 for depth in self._depths if depth >= 0) / len(self._depths)}
+
+    def get_memory(self) -> int:
+        """
+        Returns:
+            int: The memory used by the entries of the table in bytes.
+        """
+        return len(self._depths) * ENTRY_SIZE
+
+    def __len__(self) -> int:
+        return 2 * self.n_buckets
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+import numpy as np
+from loguru import logger
+
+from seahorse.game.action_codec import ActionCodec
+from seahorse.game.game_layout.zobrist import DEFAULT_ZOBRIST_TABLE, ZOBRIST_MASK, mix64
+from seahorse.game.game_state import GameState
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.utils.custom_exceptions import MissingActionCodecError
+from seahorse.utils.recordings import get_recorded_moves, get_recorded_winner_ids, load_recording
+
+# Packed records of a book move: 20 bytes each, sorted by key then move code
+BOOK_DTYPE = np.dtype([("key", "<u8"), ("move", "<i4"), ("games", "<u4"), ("score", "<f4")])
+
+
+def get_seat_key(state: GameState) -> int:
+    """
+    Computes a 64-bit key of a state where players are identified by their seat, i.e. their index in
+    `get_players()`, rather than by their ID: player IDs default to the ids of the player instances, so that
+    the state keys of the same position differ from one game to another.
+
+    Args:
+        state (GameState): The state, whose representation maps positions to pieces.
+
+    Returns:
+        int: The unsigned 64-bit key.
+    """
+    seats = {player.get_id(): seat for seat, player in enumerate(state.get_players())}
+    h = 0
+    for pos, piece in state.get_rep().get_env().items():
+        h ^= DEFAULT_ZOBRIST_TABLE.get_key(pos, piece.get_type(), seats.get(piece.get_owner_id(), -1))
+    scores = frozenset((seats.get(player_id, player_id), score) for player_id, score in state.get_scores().items())
+    return (h ^ mix64(hash((seats[state.get_active_player().get_id()], scores)))) & ZOBRIST_MASK
+
+
+class BookMove(NamedTuple):
+    """
+    A move of the book.
+
+    Attributes:
+        action (StatelessAction): The action.
+        games (int): The number of games in which the action was played.
+        score (float): The sum of the results of these games for the player of the action,
+            a draw between k players counting as 1/k win.
+    """
+
+    action: StatelessAction
+    games: int
+    score: float
+
+    def get_mean_score(self) -> float:
+        """
+        Returns:
+            float: The mean result of the action.
+        """
+        return self.score / self.games if self.games else 0.0
+
+
+class OpeningBook:
+    """
+    A position book: the moves played from each position, along with their results, keyed by `get_seat_key`
+    so that a book built from past games applies to games between other player instances.
+
+    The records are stored sorted by key in a `.npy` file loaded with `np.load(..., mmap_mode="r")`: opening
+    a book costs nothing and all the processes using it (e.g. every `PlayerContainer`) share the same
+    page-cache memory. Moves are stored as action codes, hence books need an `ActionCodec`.
+
+    Attributes:
+        records (np.ndarray): The records, of dtype `BOOK_DTYPE`.
+        codec (ActionCodec | None): The codec of the moves, None to use the codec of the probed states.
+    """
+
+    def __init__(self, records: np.ndarray, codec: ActionCodec | None = None) -> None:
+        """
+        Initializes a new instance of the OpeningBook class.
+
+        Args:
+            records (np.ndarray): The records, of dtype `BOOK_DTYPE`, sorted by key.
+            codec (ActionCodec, optional): The codec of the moves. Defaults to None.
+        """
+        self.records = records
+        self.codec = codec
+        self._keys = records["key"]
+
+    @classmethod
+    def load(cls, path: str, codec: ActionCodec | None = None) -> OpeningBook:
+        """
+        Memory-maps a saved book.
+
+        Args:
+            path (str): The path of the file.
+            codec (ActionCodec, optional): The codec of the moves. Defaults to None.
+
+        Returns:
+            OpeningBook: The book, backed by the file.
+        """
+        return cls(np.load(path, mmap_mode="r"), codec)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the records as a `.npy` file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        np.save(path, self.records)
+
+    def lookup(self, key: int) -> np.ndarray:
+        """
+        Looks a key up.
+
+        Args:
+            key (int): The key.
+
+        Returns:
+            np.ndarray: The records of the key, possibly empty.
+        """
+        key = np.uint64(key)
+        return self.records[np.searchsorted(self._keys, key, "left"):np.searchsorted(self._keys, key, "right")]
+
+    def get_moves(self, state: GameState) -> list[BookMove]:
+        """
+        Gets the book moves of a state.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            list[BookMove]: The moves, most played first.
+        """
+        codec = _get_codec(state, self.codec)
+        moves = [BookMove(codec.decode(int(record["move"])), int(record["games"]), float(record["score"]))
+                 for record in self.lookup(get_seat_key(state))]
+        return sorted(moves, key=lambda move: move.games, reverse=True)
+
+    def get_action(self, state: GameState, min_games: int = 1) -> StatelessAction | None:
+        """
+        Picks the book move with the best mean result among the moves played often enough.
+
+        Args:
+            state (GameState): The state.
+            min_games (int, optional): The number of games a move must have been played in. Defaults to 1.
+
+        Returns:
+            StatelessAction | None: The action, None if the state is out of book.
+        """
+        moves = [move for move in self.get_moves(state) if move.games >= min_games]
+        if not moves:
+            return None
+        return max(moves, key=lambda move: (move.get_mean_score(), move.games)).action
+
+    def __contains__(self, state: GameState) -> bool:
+        return len(self.lookup(get_seat_key(state))) > 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class BookBuilder:
+    """
+    Builds an `OpeningBook` from played games, e.g. the recordings written by `StateRecorder`.
+
+    Attributes:
+        max_plies (int | None): The number of moves of each game added to the book.
+        codec (ActionCodec | None): The codec of the moves, None to use the codec of the states.
+    """
+
+    def __init__(self, max_plies: int | None = None, codec: ActionCodec | None = None) -> None:
+        """
+        Initializes a new instance of the BookBuilder class.
+
+        Args:
+            max_plies (int, optional): The number of moves of each game added to the book. Defaults to None.
+            codec (ActionCodec, optional): The codec of the moves. Defaults to None.
+        """
+        self.max_plies = max_plies
+        self.codec = codec
+        self._stats: dict[tuple[int, int], list[float]] = {}
+        self.n_games = 0
+
+    def add_game(self, moves: Sequence[tuple[GameState, StatelessAction]], winner_ids: Iterable[int]) -> None:
+        """
+        Adds a game.
+
+        Args:
+            moves (Sequence[tuple[GameState, StatelessAction]]): Each state along with the action played from it.
+            winner_ids (Iterable[int]): The IDs of the winners.
+        """
+        winner_ids = set(winner_ids)
+        for state, action in moves[:self.max_plies]:
+            player_id = state.get_active_player().get_id()
+            stats = self._stats.setdefault((get_seat_key(state), _get_codec(state, self.codec).encode(action)),
+                                           [0, 0.0])
+            stats[0] += 1
+            stats[1] += 1 / len(winner_ids) if player_id in winner_ids else 0.0
+        self.n_games += 1
+
+    def add_recording(self, source: str | dict, state_type: type[GameState]) -> bool:
+        """
+        Adds a recorded game, the actions being inferred from the recorded states.
+        Unfinished and cancelled games are skipped.
+
+        Args:
+            source (str | dict): The path of the recording, or the recording itself.
+            state_type (type[GameState]): The class of the game states, providing `from_json`.
+
+        Raises:
+            RecordingError: If two consecutive states are not linked by a possible action.
+
+        Returns:
+            bool: Whether the game was added.
+        """
+        recording = load_recording(source)
+        moves = get_recorded_moves(recording, state_type)
+        final_state = state_type.from_json(recording["steps"][-1]) if recording["steps"] else None
+        winner_ids = get_recorded_winner_ids(recording, final_state)
+        if winner_ids is None:
+            logger.warning("Skipping an unfinished or cancelled game")
+            return False
+        self.add_game(moves, winner_ids)
+        return True
+
+    def build(self, min_games: int = 1) -> OpeningBook:
+        """
+        Builds the book.
+
+        Args:
+            min_games (int, optional): The number of games a move must have been played in to be kept. Defaults to 1.
+
+        Returns:
+            OpeningBook: The book, held in memory until saved.
+        """
+        items = [(key, move, games, score) for (key, move), (games, score) in self._stats.items() if games >= min_games]
+        records = np.array(items, dtype=BOOK_DTYPE)
+        records.sort(order=["key", "move"])
+        logger.info(f"Built a book of {len(records)} moves from {self.n_games} games")
+        return OpeningBook(records, self.codec)
+
+
+def _get_codec(state: GameState, codec: ActionCodec | None) -> ActionCodec:
+    codec = codec or state.get_action_codec()
+    if codec is None:
+        msg = f"{type(state).__name__} has no action codec, pass one to the book"
+        raise MissingActionCodecError(msg)
+    return codec
@@ -89,3 +89,48 @@ class NoTournamentFailError(Exception):
     def __init__(self,  message: str = "Tournament problem : tournament is none, please connect to an existing tournament or create a tournament"):
         self.message = message
         super().__init__(message)
+
+
+class PerftMismatchError(Exception):
+    """Thrown when a perft node count differs from its reference
+    """
+
+    def __init__(self,  message: str = "Perft node count differs from the reference"):
+        self.message = message
+        super().__init__(message)
+
+
+class SolverError(Exception):
+    """Thrown when a game cannot be solved layer by layer
+    """
+
+    def __init__(self,  message: str = "The game cannot be solved layer by layer"):
+        self.message = message
+        super().__init__(message)
+
+
+class RecordingError(Exception):
+    """Thrown when a game recording cannot be replayed
+    """
+
+    def __init__(self,  message: str = "The recording cannot be replayed"):
+        self.message = message
+        super().__init__(message)
+
+
+class MissingActionCodecError(Exception):
+    """Thrown when action codes are needed for a game without action codec
+    """
+
+    def __init__(self,  message: str = "The game has no action codec"):
+        self.message = message
+        super().__init__(message)
+
+
+class RoomInUseError(Exception):
+    """Thrown when a game is started in a room already hosting one
+    """
+
+    def __init__(self,  message: str = "The room already hosts a game"):
+        self.message = message
+        super().__init__(message)
@@ -7,7 +7,7 @@ from typing import Any, Optional
 
 from loguru import logger
 
-from seahorse.game.io_stream import EventMaster, EventSlave
+from seahorse.game.io_stream import DEFAULT_ROOM, EventMaster, EventSlave
 
 
 class GUIClient(EventSlave):
@@ -40,8 +40,8 @@ class GUIClient(EventSlave):
             except Exception as e:
                 logger.debug(f"Could not open URL: {e}")
 
-    async def listen(self,**_) -> Coroutine[Any, Any, None]:
+    async def listen(self,*,room:str=DEFAULT_ROOM,**_) -> Coroutine[Any, Any, None]:
         if self.path:
             GUIClient.open_file(self.path)
-        idmap = await EventMaster.get_instance().wait_for_identified_client("__GUI__",self.id)
+        idmap = await EventMaster.get_instance().wait_for_identified_client("__GUI__",self.id,room=room)
         self.sid = idmap["sid"]
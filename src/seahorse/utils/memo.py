@@ -0,0 +1,75 @@
+import functools
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class MemoStats:
+    """
+    Hit/miss counters of a memoized method, aggregated over all the instances.
+
+    Attributes:
+        name (str): The qualified name of the method.
+        hits (int): The number of calls answered from the memo.
+        misses (int): The number of calls that had to be computed.
+    """
+
+    name: str
+    hits: int = 0
+    misses: int = 0
+
+    def get_hit_rate(self) -> float:
+        """
+        Returns:
+            float: The fraction of calls answered from the memo.
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def reset(self) -> None:
+        """
+        Resets the counters.
+        """
+        self.hits = 0
+        self.misses = 0
+
+
+def memoized(method: Callable) -> Callable:
+    """
+    Decorator caching the results of a `GameState` method on the instance, per arguments.
+
+    It is meant for quantities derived from a state that is not modified anymore, such as `is_done`,
+    `compute_scores` or game-specific helpers. The memo lives in the `_memo` attribute of the state,
+    which is cleared by `GameState.make_action` and restored by `GameState.unmake_action`, and should
+    be excluded when serializing the state. Calls with unhashable arguments are not cached.
+
+    The hit/miss counters are available in the `memo_stats` attribute of the decorated method.
+
+    Args:
+        method (Callable): The method to memoize.
+
+    Returns:
+        Callable: The memoized method.
+    """
+    stats = MemoStats(method.__qualname__)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs) -> Any:
+        key = (method.__name__, args, tuple(kwargs.items())) if args or kwargs else method.__name__
+        try:
+            value = self._memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return method(self, *args, **kwargs)
+        else:
+            stats.hits += 1
+            return value
+        stats.misses += 1
+        value = method(self, *args, **kwargs)
+        self._memo[key] = value
+        return value
+
+    wrapper.memo_stats = stats
+    return wrapper
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from seahorse.game.game_state import GameState
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.utils.custom_exceptions import PerftMismatchError
+
+PRIMITIVES = ("generate_possible_stateless_actions", "apply_action", "is_done", "__hash__")
+
+
+@dataclass
+class PrimitiveStats:
+    """
+    The timing of a primitive over a perft run.
+
+    Attributes:
+        calls (int): The number of calls.
+        elapsed (float): The total time spent in the calls, in seconds.
+    """
+
+    calls: int = 0
+    elapsed: float = 0.0
+
+    def get_calls_per_second(self) -> float:
+        """
+        Returns:
+            float: The number of calls per second spent in the primitive.
+        """
+        return self.calls / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class PerftReport:
+    """
+    The result of a perft run.
+
+    Attributes:
+        depth (int): The depth of the enumeration.
+        nodes (int): The number of states reached at `depth`.
+        visited (int): The number of states visited at all depths.
+        elapsed (float): The duration of the run, in seconds.
+        path (str): The action path used, "stateless" or "stateful".
+        primitives (dict[str, PrimitiveStats]): The timing of the primitives, for profiled runs.
+    """
+
+    depth: int
+    nodes: int
+    visited: int
+    elapsed: float
+    path: str = "stateless"
+    primitives: dict[str, PrimitiveStats] = field(default_factory=dict)
+
+    def get_nodes_per_second(self) -> float:
+        """
+        Returns:
+            float: The number of states visited per second.
+        """
+        return self.visited / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        lines = [(f"perft({self.depth}) = {self.nodes} [{self.path}], {self.visited} states in {self.elapsed:.3f}s "
+                  f"({self.get_nodes_per_second():.0f} nodes/s)")]
+        lines += [f"  {name}: {stats.calls} calls, {stats.get_calls_per_second():.0f} calls/s"
+                  for name, stats in self.primitives.items()]
+        return "\n".join(lines)
+
+
+def perft(state: GameState, depth: int, *, stateful: bool = False) -> int:
+    """
+    Counts the states reachable from a state in exactly `depth` moves, final states having no successors.
+    As it only depends on the rules of the game, the count can be stored as a reference to catch regressions.
+
+    Args:
+        state (GameState): The root state.
+        depth (int): The depth of the enumeration.
+        stateful (bool, optional): Whether successors are enumerated through the possible stateful actions
+            rather than through the possible stateless actions. Defaults to False.
+
+    Returns:
+        int: The number of states at `depth`.
+    """
+    if depth == 0:
+        return 1
+    if stateful:
+        return sum(perft(action.get_next_game_state(), depth - 1, stateful=True)
+                   for action in state.get_possible_stateful_actions())
+    return sum(perft(state.apply_action(action), depth - 1) for action in state.get_possible_stateless_actions())
+
+
+def divide(state: GameState, depth: int) -> dict[StatelessAction, int]:
+    """
+    Splits the perft count of a state among its possible actions, to locate a mismatch.
+
+    Args:
+        state (GameState): The root state.
+        depth (int): The depth of the enumeration, at least 1.
+
+    Returns:
+        dict[StatelessAction, int]: The number of states at `depth` reached through each action.
+    """
+    return {action: perft(state.apply_action(action), depth - 1) for action in state.get_possible_stateless_actions()}
+
+
+def run_perft(state: GameState, depth: int, *, stateful: bool = False, profile: bool = False) -> PerftReport:
+    """
+    Runs a timed perft.
+
+    Args:
+        state (GameState): The root state.
+        depth (int): The depth of the enumeration.
+        stateful (bool, optional): Whether the stateful action path is used. Defaults to False.
+        profile (bool, optional): Whether each primitive is timed, on the stateless path. The generator
+            `generate_possible_stateless_actions` is then called directly, bypassing the caches, and every
+            new state is hashed. Defaults to False.
+
+    Returns:
+        PerftReport: The report of the run.
+    """
+    counter = [0]
+    start = time.perf_counter()
+    if profile:
+        primitives = {name: PrimitiveStats() for name in PRIMITIVES}
+        nodes = _profiled_perft(state, depth, primitives, counter)
+    else:
+        primitives = {}
+        nodes = _counted_perft(state, depth, counter, stateful=stateful)
+    elapsed = time.perf_counter() - start
+    return PerftReport(depth, nodes, counter[0], elapsed, "stateful" if stateful else "stateless", primitives)
+
+
+def _counted_perft(state: GameState, depth: int, counter: list[int], *, stateful: bool) -> int:
+    counter[0] += 1
+    if depth == 0:
+        return 1
+    if stateful:
+        return sum(_counted_perft(action.get_next_game_state(), depth - 1, counter, stateful=True)
+                   for action in state.get_possible_stateful_actions())
+    return sum(_counted_perft(state.apply_action(action), depth - 1, counter, stateful=False)
+               for action in state.get_possible_stateless_actions())
+
+
+def _profiled_perft(state: GameState, depth: int, primitives: dict[str, PrimitiveStats], counter: list[int]) -> int:
+    counter[0] += 1
+    clock = time.perf_counter
+
+    start = clock()
+    hash(state)
+    _record(primitives["__hash__"], clock() - start)
+    if depth == 0:
+        return 1
+
+    start = clock()
+    done = state.is_done()
+    _record(primitives["is_done"], clock() - start)
+    if done:
+        return 0
+
+    start = clock()
+    actions = list(state.generate_possible_stateless_actions())
+    _record(primitives["generate_possible_stateless_actions"], clock() - start)
+
+    nodes = 0
+    for action in actions:
+        start = clock()
+        child = state.apply_action(action)
+        _record(primitives["apply_action"], clock() - start)
+        nodes += _profiled_perft(child, depth - 1, primitives, counter)
+    return nodes
+
+
+def _record(stats: PrimitiveStats, elapsed: float) -> None:
+    stats.calls += 1
+    stats.elapsed += elapsed
+
+
+def check_references(state: GameState, references: Mapping[int, int], *, stateful: bool = False) -> None:
+    """
+    Checks perft counts against stored references.
+
+    Args:
+        state (GameState): The root state.
+        references (Mapping[int, int]): The expected node counts, indexed by depth.
+        stateful (bool, optional): Whether the stateful action path is used. Defaults to False.
+
+    Raises:
+        PerftMismatchError: If a count differs from its reference.
+    """
+    for depth, expected in sorted(references.items()):
+        nodes = perft(state, depth, stateful=stateful)
+        if nodes != expected:
+            msg = f"perft({depth}) = {nodes}, expected {expected}"
+            raise PerftMismatchError(msg)
+
+
+def compare_action_paths(state: GameState, depth: int) -> dict[str, PerftReport]:
+    """
+    Runs the same perft through the stateless and the stateful action paths.
+
+    Args:
+        state (GameState): The root state.
+        depth (int): The depth of the enumeration.
+
+    Raises:
+        PerftMismatchError: If both paths do not reach the same number of states.
+
+    Returns:
+        dict[str, PerftReport]: The reports of both paths, indexed by "stateless" and "stateful".
+    """
+    reports = {"stateless": run_perft(state, depth), "stateful": run_perft(state, depth, stateful=True)}
+    if reports["stateless"].nodes != reports["stateful"].nodes:
+        msg = (f"perft({depth}) = {reports['stateless'].nodes} with stateless actions but "
+               f"{reports['stateful'].nodes} with stateful actions")
+        raise PerftMismatchError(msg)
+    return reports
+
+
+def benchmark(state: GameState, depth: int, references: Mapping[int, int] | None = None) -> dict[str, PerftReport]:
+    """
+    Runs the standard benchmark of a game: the reference check, a profiled run and the comparison
+    of the action paths, the reports being logged.
+
+    Args:
+        state (GameState): The root state.
+        depth (int): The depth of the enumeration.
+        references (Mapping[int, int], optional): The expected node counts, indexed by depth. Defaults to None.
+
+    Raises:
+        PerftMismatchError: If a count differs from its reference, or between the action paths.
+
+    Returns:
+        dict[str, PerftReport]: The reports of the runs, indexed by "profile", "stateless" and "stateful".
+    """
+    if references:
+        check_references(state, references)
+    reports = {"profile": run_perft(state, depth, profile=True), **compare_action_paths(state, depth)}
+    for report in reports.values():
+        logger.info(f"{type(state).__name__}: {report}")
+    return reports
@@ -0,0 +1,583 @@
+from __future__ import annotations
+
+import math
+from abc import abstractmethod
+from collections.abc import Iterable, Sequence
+from itertools import combinations, islice
+from statistics import NormalDist
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from seahorse.utils.custom_exceptions import MethodNotImplementedError
+from seahorse.utils.recordings import load_recording
+from seahorse.utils.tournament import ERROR, MatchResult
+
+# Statuses of the "done" payloads rated, the others (e.g. "invalid" for dummy games) being skipped
+RATED_STATUSES = ("done", "cancelled")
+
+_GLICKO2_SCALE = 173.7178
+_ELO_Q = math.log(10) / 400
+# Chebyshev fit of erfc, with a relative error below 1.2e-7 over the whole line (Numerical Recipes, erfcc)
+_ERFC_COEFFICIENTS = (0.17087277, -0.82215223, 1.48851587, -1.13520398, 0.27886807, -0.18628806, 0.09678418,
+                      0.37409196, 1.00002368, -1.26551223)
+
+
+class RatedGame(NamedTuple):
+    """
+    A game to rate, players being designated by name.
+
+    Attributes:
+        players (tuple[str, ...]): The players.
+        winners (tuple[str, ...]): The winners, all the players drawing if they all won.
+    """
+
+    players: tuple[str, ...]
+    winners: tuple[str, ...]
+
+
+def get_rated_game(result: RatedGame | MatchResult | dict | str) -> RatedGame | None:
+    """
+    Turns a match result into a game to rate.
+
+    Args:
+        result (RatedGame | MatchResult | dict | str): A tournament result, the payload of a "done" event
+            (`GameMaster.play_game`), a recording written by `StateRecorder` or the path of one.
+
+    Returns:
+        RatedGame | None: The game, None if it was not completed (e.g. an unfinished recording or a match error).
+    """
+    if isinstance(result, RatedGame):
+        return result
+    if isinstance(result, MatchResult):
+        return RatedGame(tuple(result.players), tuple(result.winners)) if result.status != ERROR else None
+    if isinstance(result, str) or "steps" in result:
+        result = load_recording(result)["final_summary"]
+        if result is None:
+            return None
+    if result.get("status", "done") not in RATED_STATUSES:
+        return None
+    names = {player["id"]: player["name"] for player in result["players"]}
+    return RatedGame(tuple(names.values()), tuple(names[player_id] for player_id in result["winners_id"]))
+
+
+class Ratings:
+    """
+    Ratings of players, updated from a stream of match results.
+
+    Results are rated by rating periods: all the games of a period are rated against the ratings at its start,
+    with a few NumPy operations whatever the number of games. Games between more than two players are split
+    into pairwise games, the winners beating the others and drawing between them.
+
+    Attributes:
+        names (list[str]): The players, in order of appearance.
+        n_games (int): The number of games rated.
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.n_games = 0
+        self._indices: dict[str, int] = {}
+        self._games = np.zeros(0, dtype=np.int64)
+
+    def update(self, results: Iterable[RatedGame | MatchResult | dict | str]) -> int:
+        """
+        Rates the results of a rating period.
+
+        Args:
+            results (Iterable[RatedGame | MatchResult | dict | str]): The results (see `get_rated_game`).
+
+        Returns:
+            int: The number of games rated, uncompleted ones being skipped.
+        """
+        first, second, scores = [], [], []
+        n_games = 0
+        for result in results:
+            game = get_rated_game(result)
+            if game is None:
+                continue
+            n_games += 1
+            for a, b in combinations(self._get_indices(game.players), 2):
+                first.append(a)
+                second.append(b)
+                won_a, won_b = self.names[a] in game.winners, self.names[b] in game.winners
+                scores.append(0.5 if won_a == won_b else float(won_a))
+        if first:
+            i, j = np.array(first), np.array(second)
+            np.add.at(self._games, i, 1)
+            np.add.at(self._games, j, 1)
+            self._update(i, j, np.array(scores))
+        self.n_games += n_games
+        return n_games
+
+    def rate(self, results: Iterable[RatedGame | MatchResult | dict | str], *, period: int = 256) -> int:
+        """
+        Rates a stream of results, e.g. historical games, in rating periods of `period` results.
+
+        Args:
+            results (Iterable[RatedGame | MatchResult | dict | str]): The results (see `get_rated_game`).
+            period (int, optional): The number of results per rating period. Defaults to 256.
+
+        Returns:
+            int: The number of games rated.
+        """
+        results = iter(results)
+        n_games = 0
+        while chunk := list(islice(results, period)):
+            n_games += self.update(chunk)
+        return n_games
+
+    def get_rating(self, name: str) -> float:
+        """
+        Args:
+            name (str): The player.
+
+        Raises:
+            KeyError: If the player is unknown.
+
+        Returns:
+            float: The rating of the player.
+        """
+        return float(self._get_means()[self._get_index(name)])
+
+    def get_deviation(self, name: str) -> float:
+        """
+        Args:
+            name (str): The player.
+
+        Raises:
+            KeyError: If the player is unknown.
+
+        Returns:
+            float: The standard deviation of the rating of the player.
+        """
+        return float(self._get_deviations()[self._get_index(name)])
+
+    def get_interval(self, name: str, z: float = 1.96) -> tuple[float, float]:
+        """
+        Gets a confidence interval of the rating of a player.
+
+        Args:
+            name (str): The player.
+            z (float, optional): The number of standard deviations, 1.96 for a 95% interval. Defaults to 1.96.
+
+        Raises:
+            KeyError: If the player is unknown.
+
+        Returns:
+            tuple[float, float]: The bounds of the interval.
+        """
+        rating, deviation = self.get_rating(name), self.get_deviation(name)
+        return rating - z * deviation, rating + z * deviation
+
+    def get_win_probability(self, name: str, opponent: str) -> float:
+        """
+        Args:
+            name (str): The player.
+            opponent (str): The opponent.
+
+        Raises:
+            KeyError: If a player is unknown.
+
+        Returns:
+            float: The expected score of the player against the opponent.
+        """
+        i, j = self._get_index(name), self._get_index(opponent)
+        return float(self._get_expected(np.array([i]), np.array([j]))[0])
+
+    def get_leaderboard(self, z: float = 1.96) -> list[dict[str, Any]]:
+        """
+        Gets the players sorted by rating, along with confidence intervals.
+
+        Args:
+            z (float, optional): The number of standard deviations of the intervals. Defaults to 1.96.
+
+        Returns:
+            list[dict[str, Any]]: One row per player: name, rating, deviation, low, high and games.
+        """
+        means, deviations = self._get_means(), self._get_deviations()
+        return [{"name": self.names[i], "rating": float(means[i]), "deviation": float(deviations[i]),
+                 "low": float(means[i] - z * deviations[i]), "high": float(means[i] + z * deviations[i]),
+                 "games": int(self._games[i])}
+                for i in np.argsort(-means, kind="stable")]
+
+    def get_informative_pairings(self, names: Sequence[str] | None = None,
+                                 n_pairs: int | None = None) -> list[tuple[str, str]]:
+        """
+        Picks the games to play next to learn the most about the ratings: pairs whose outcome is the most
+        uncertain, p(1-p), between the players whose ratings are the least certain. Each player is paired once.
+
+        Args:
+            names (Sequence[str], optional): The players available. Defaults to None, meaning all the players.
+            n_pairs (int, optional): The number of pairs. Defaults to None, meaning as many as possible.
+
+        Raises:
+            KeyError: If a player is unknown.
+
+        Returns:
+            list[tuple[str, str]]: The pairs, most informative first.
+        """
+        indices = np.array([self._get_index(name) for name in (names if names is not None else self.names)],
+                           dtype=np.int64)
+        if len(indices) < 2:  # noqa: PLR2004
+            return []
+        i, j = np.triu_indices(len(indices), 1)
+        i, j = indices[i], indices[j]
+        expected = self._get_expected(i, j)
+        variances = self._get_deviations() ** 2
+        gains = expected * (1 - expected) * (variances[i] + variances[j])
+
+        pairs, paired = [], set()
+        for k in np.argsort(-gains, kind="stable"):
+            if i[k] in paired or j[k] in paired:
+                continue
+            paired.update((i[k], j[k]))
+            pairs.append((self.names[i[k]], self.names[j[k]]))
+            if len(pairs) == n_pairs:
+                break
+        return pairs
+
+    def add_players(self, names: Iterable[str]) -> None:
+        """
+        Registers players with the initial rating, e.g. newcomers to pair (see `get_informative_pairings`).
+
+        Args:
+            names (Iterable[str]): The players, those already known being ignored.
+        """
+        self._get_indices(names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._indices
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _get_index(self, name: str) -> int:
+        """
+        Gets the index of a known player, without registering unknown ones.
+        """
+        if name not in self._indices:
+            msg = f"Unknown player {name!r}, rate one of its games or add it first"
+            raise KeyError(msg)
+        return self._indices[name]
+
+    def _get_indices(self, names: Iterable[str]) -> list[int]:
+        """
+        Gets the indices of players, registering the new ones.
+        """
+        indices = []
+        for name in names:
+            if name not in self._indices:
+                self._indices[name] = len(self.names)
+                self.names.append(name)
+            indices.append(self._indices[name])
+        if len(self.names) > len(self._games):
+            n_new = len(self.names) - len(self._games)
+            self._games = np.concatenate([self._games, np.zeros(n_new, dtype=np.int64)])
+            self._grow(n_new)
+        return indices
+
+    @abstractmethod
+    def _grow(self, n_new: int) -> None:
+        """
+        Adds the initial ratings of new players.
+        """
+        raise MethodNotImplementedError()
+
+    @abstractmethod
+    def _update(self, i: np.ndarray, j: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Rates a period of pairwise games, `scores` being the results of the players `i` against the players `j`.
+        """
+        raise MethodNotImplementedError()
+
+    @abstractmethod
+    def _get_expected(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """
+        Gets the expected scores of the players `i` against the players `j`.
+        """
+        raise MethodNotImplementedError()
+
+    @abstractmethod
+    def _get_means(self) -> np.ndarray:
+        raise MethodNotImplementedError()
+
+    @abstractmethod
+    def _get_deviations(self) -> np.ndarray:
+        raise MethodNotImplementedError()
+
+
+class EloRatings(Ratings):
+    """
+    Elo ratings. Elo has no notion of uncertainty: deviations are derived from the Fisher information of the
+    games played, i.e. the deviation of the maximum likelihood estimate of the rating.
+
+    Attributes:
+        initial_rating (float): The rating of new players.
+        k_factor (float): The step of the updates.
+    """
+
+    def __init__(self, initial_rating: float = 1500.0, k_factor: float = 32.0) -> None:
+        """
+        Initializes a new instance of the EloRatings class.
+
+        Args:
+            initial_rating (float, optional): The rating of new players. Defaults to 1500.
+            k_factor (float, optional): The step of the updates. Defaults to 32.
+        """
+        super().__init__()
+        self.initial_rating = initial_rating
+        self.k_factor = k_factor
+        self._ratings = np.zeros(0)
+        self._information = np.zeros(0)
+
+    def _grow(self, n_new: int) -> None:
+        self._ratings = np.concatenate([self._ratings, np.full(n_new, self.initial_rating)])
+        self._information = np.concatenate([self._information, np.zeros(n_new)])
+
+    def _update(self, i: np.ndarray, j: np.ndarray, scores: np.ndarray) -> None:
+        expected = self._get_expected(i, j)
+        deltas = self.k_factor * (scores - expected)
+        information = _ELO_Q**2 * expected * (1 - expected)
+        np.add.at(self._ratings, i, deltas)
+        np.add.at(self._ratings, j, -deltas)
+        np.add.at(self._information, i, information)
+        np.add.at(self._information, j, information)
+
+    def _get_expected(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        return 1 / (1 + 10 ** ((self._ratings[j] - self._ratings[i]) / 400))
+
+    def _get_means(self) -> np.ndarray:
+        return self._ratings
+
+    def _get_deviations(self) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            return 1 / np.sqrt(self._information)
+
+
+class Glicko2Ratings(Ratings):
+    """
+    Glicko-2 ratings (Glickman, "Example of the Glicko-2 system"), on the Glicko scale: each player has a rating,
+    a rating deviation (RD) and a volatility, updated at the end of each rating period. Players inactive during a
+    period see their RD grow.
+
+    Attributes:
+        initial_rating (float): The rating of new players.
+        initial_deviation (float): The RD of new players.
+        initial_volatility (float): The volatility of new players.
+        tau (float): Constrains the changes of volatility.
+    """
+
+    def __init__(self, initial_rating: float = 1500.0, initial_deviation: float = 350.0,
+                 initial_volatility: float = 0.06, tau: float = 0.5) -> None:
+        """
+        Initializes a new instance of the Glicko2Ratings class.
+
+        Args:
+            initial_rating (float, optional): The rating of new players. Defaults to 1500.
+            initial_deviation (float, optional): The RD of new players. Defaults to 350.
+            initial_volatility (float, optional): The volatility of new players. Defaults to 0.06.
+            tau (float, optional): Constrains the changes of volatility. Defaults to 0.5.
+        """
+        super().__init__()
+        self.initial_rating = initial_rating
+        self.initial_deviation = initial_deviation
+        self.initial_volatility = initial_volatility
+        self.tau = tau
+        self._mu = np.zeros(0)
+        self._phi = np.zeros(0)
+        self._sigma = np.zeros(0)
+
+    def get_volatility(self, name: str) -> float:
+        """
+        Args:
+            name (str): The player.
+
+        Raises:
+            KeyError: If the player is unknown.
+
+        Returns:
+            float: The volatility of the player.
+        """
+        return float(self._sigma[self._get_index(name)])
+
+    def _grow(self, n_new: int) -> None:
+        self._mu = np.concatenate([self._mu, np.full(n_new, (self.initial_rating - 1500) / _GLICKO2_SCALE)])
+        self._phi = np.concatenate([self._phi, np.full(n_new, self.initial_deviation / _GLICKO2_SCALE)])
+        self._sigma = np.concatenate([self._sigma, np.full(n_new, self.initial_volatility)])
+
+    def _update(self, i: np.ndarray, j: np.ndarray, scores: np.ndarray) -> None:
+        # Both sides of each game, rated against the ratings at the start of the period
+        players, opponents = np.concatenate([i, j]), np.concatenate([j, i])
+        scores = np.concatenate([scores, 1 - scores])
+        g = 1 / np.sqrt(1 + 3 * self._phi[opponents] ** 2 / np.pi**2)
+        expected = 1 / (1 + np.exp(-g * (self._mu[players] - self._mu[opponents])))
+
+        information = np.zeros(len(self.names))
+        improvement = np.zeros(len(self.names))
+        np.add.at(information, players, g**2 * expected * (1 - expected))
+        np.add.at(improvement, players, g * (scores - expected))
+
+        active = np.flatnonzero(information > 0)
+        v = 1 / information[active]
+        delta = v * improvement[active]
+        phi, sigma = self._phi[active], self._get_new_volatilities(self._phi[active], self._sigma[active], v, delta)
+
+        # Inactive players only see their deviation grow
+        self._phi = np.sqrt(self._phi**2 + self._sigma**2)
+        phi = 1 / np.sqrt(1 / (phi**2 + sigma**2) + 1 / v)
+        self._mu[active] += phi**2 * improvement[active]
+        self._phi[active] = phi
+        self._sigma[active] = sigma
+
+    def _get_new_volatilities(self, phi: np.ndarray, sigma: np.ndarray, v: np.ndarray,
+                              delta: np.ndarray) -> np.ndarray:
+        """
+        Solves the volatility equation of all the active players at once, with the Illinois algorithm.
+        """
+        a = np.log(sigma**2)
+
+        def f(x: np.ndarray) -> np.ndarray:
+            return (np.exp(x) * (delta**2 - phi**2 - v - np.exp(x)) / (2 * (phi**2 + v + np.exp(x)) ** 2)
+                    - (x - a) / self.tau**2)
+
+        big = delta**2 > phi**2 + v
+        b = np.where(big, np.log(np.where(big, delta**2 - phi**2 - v, 1)), a - self.tau)
+        for _ in range(100):
+            lagging = ~big & (f(b) < 0)
+            if not lagging.any():
+                break
+            b[lagging] -= self.tau
+
+        lower, f_lower, f_b = a, f(a), f(b)
+        for _ in range(100):
+            pending = np.abs(b - lower) > 1e-6  # noqa: PLR2004
+            if not pending.any():
+                break
+            c = lower + (lower - b) * f_lower / (f_b - f_lower)
+            f_c = f(c)
+            crossed = f_c * f_b < 0
+            lower = np.where(pending, np.where(crossed, b, lower), lower)
+            f_lower = np.where(pending, np.where(crossed, f_b, f_lower / 2), f_lower)
+            b = np.where(pending, c, b)
+            f_b = np.where(pending, f_c, f_b)
+        return np.exp(lower / 2)
+
+    def _get_expected(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        g = 1 / np.sqrt(1 + 3 * (self._phi[i] ** 2 + self._phi[j] ** 2) / np.pi**2)
+        return 1 / (1 + np.exp(-g * (self._mu[i] - self._mu[j])))
+
+    def _get_means(self) -> np.ndarray:
+        return self._mu * _GLICKO2_SCALE + 1500
+
+    def _get_deviations(self) -> np.ndarray:
+        return self._phi * _GLICKO2_SCALE
+
+
+class TrueSkillRatings(Ratings):
+    """
+    TrueSkill-style ratings (Herbrich et al., 2006), restricted to pairwise games: each player has a Gaussian
+    skill belief of mean `mu` and deviation `sigma`, updated by moment matching. The games of a period are
+    rated against the beliefs at its start, the updates of a player being added up.
+
+    Attributes:
+        mu (float): The mean skill of new players.
+        sigma (float): The skill deviation of new players.
+        beta (float): The deviation of the performance around the skill.
+        tau (float): The skill drift added before each period.
+        draw_probability (float): The probability of a draw between equal players.
+    """
+
+    def __init__(self, mu: float = 25.0, sigma: float = 25 / 3, beta: float = 25 / 6, tau: float = 25 / 300,
+                 draw_probability: float = 0.1) -> None:
+        """
+        Initializes a new instance of the TrueSkillRatings class.
+
+        Args:
+            mu (float, optional): The mean skill of new players. Defaults to 25.
+            sigma (float, optional): The skill deviation of new players. Defaults to 25/3.
+            beta (float, optional): The deviation of the performance around the skill. Defaults to 25/6.
+            tau (float, optional): The skill drift added before each period. Defaults to 25/300.
+            draw_probability (float, optional): The probability of a draw between equal players. Defaults to 0.1.
+        """
+        super().__init__()
+        self.mu = mu
+        self.sigma = sigma
+        self.beta = beta
+        self.tau = tau
+        self.draw_probability = draw_probability
+        self._draw_margin = NormalDist().inv_cdf((draw_probability + 1) / 2) * math.sqrt(2) * beta
+        self._mu = np.zeros(0)
+        self._sigma = np.zeros(0)
+
+    def get_conservative_rating(self, name: str) -> float:
+        """
+        Args:
+            name (str): The player.
+
+        Raises:
+            KeyError: If the player is unknown.
+
+        Returns:
+            float: The skill the player exceeds with a 99.9% probability, `mu - 3 * sigma`.
+        """
+        return self.get_rating(name) - 3 * self.get_deviation(name)
+
+    def _grow(self, n_new: int) -> None:
+        self._mu = np.concatenate([self._mu, np.full(n_new, self.mu)])
+        self._sigma = np.concatenate([self._sigma, np.full(n_new, self.sigma)])
+
+    def _update(self, i: np.ndarray, j: np.ndarray, scores: np.ndarray) -> None:
+        # The winner of each game first, draws keeping their order
+        swap = scores < 0.5  # noqa: PLR2004
+        winners, losers = np.where(swap, j, i), np.where(swap, i, j)
+        draw = scores == 0.5  # noqa: PLR2004
+
+        variances = self._sigma**2 + self.tau**2
+        c = np.sqrt(2 * self.beta**2 + variances[winners] + variances[losers])
+        t, eps = (self._mu[winners] - self._mu[losers]) / c, self._draw_margin / c
+
+        # Truncated Gaussian corrections of a win (t > eps) and of a draw (|t| <= eps)
+        v, w = np.empty_like(t), np.empty_like(t)
+        x = t[~draw] - eps[~draw]
+        v[~draw] = _normal_pdf(x) / np.maximum(_normal_cdf(x), 1e-300)
+        w[~draw] = v[~draw] * (v[~draw] + x)
+        td, ed = t[draw], eps[draw]
+        draw_mass = np.maximum(_normal_cdf(ed - td) - _normal_cdf(-ed - td), 1e-300)
+        v[draw] = (_normal_pdf(-ed - td) - _normal_pdf(ed - td)) / draw_mass
+        w[draw] = v[draw] ** 2 + ((ed - td) * _normal_pdf(ed - td) + (ed + td) * _normal_pdf(ed + td)) / draw_mass
+
+        mu = self._mu.copy()
+        np.add.at(mu, winners, variances[winners] / c * v)
+        np.add.at(mu, losers, -variances[losers] / c * v)
+        shrink = np.ones(len(self.names))
+        np.multiply.at(shrink, winners, 1 - variances[winners] / c**2 * w)
+        np.multiply.at(shrink, losers, 1 - variances[losers] / c**2 * w)
+
+        self._mu = mu
+        self._sigma = np.sqrt(variances * np.maximum(shrink, 1e-6))
+
+    def _get_expected(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        c = np.sqrt(2 * self.beta**2 + self._sigma[i] ** 2 + self._sigma[j] ** 2)
+        return _normal_cdf((self._mu[i] - self._mu[j]) / c)
+
+    def _get_means(self) -> np.ndarray:
+        return self._mu
+
+    def _get_deviations(self) -> np.ndarray:
+        return self._sigma
+
+
+def _normal_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-(x**2) / 2) / math.sqrt(2 * math.pi)
+
+
+def _erfc(x: np.ndarray) -> np.ndarray:
+    z = np.abs(x)
+    t = 1 / (1 + z / 2)
+    y = t * np.exp(np.polyval(_ERFC_COEFFICIENTS, t) - z**2)
+    return np.where(x >= 0, y, 2 - y)
+
+
+def _normal_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * _erfc(-np.asarray(x, dtype=np.float64) / math.sqrt(2))
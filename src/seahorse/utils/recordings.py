@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from itertools import pairwise
+from typing import Any
+
+from seahorse.game.game_state import GameState
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.utils.custom_exceptions import RecordingError
+
+
+def load_recording(source: str | dict) -> dict[str, Any]:
+    """
+    Loads a game recording, as written by `StateRecorder`: `{"steps": [...], "final_summary": ...}`,
+    each step being the JSON of a game state and the summary the payload of the "done" event.
+
+    Args:
+        source (str | dict): The path of the recording, or the recording itself.
+
+    Returns:
+        dict[str, Any]: The recording.
+    """
+    if isinstance(source, dict):
+        return source
+    with open(source) as f:
+        return json.load(f)
+
+
+def get_recorded_states(recording: dict[str, Any], state_type: type[GameState]) -> list[GameState]:
+    """
+    Rebuilds the states of a recording.
+
+    Args:
+        recording (dict[str, Any]): The recording.
+        state_type (type[GameState]): The class of the game states, providing `from_json`.
+
+    Returns:
+        list[GameState]: The states, starting with the initial one.
+    """
+    return [state_type.from_json(step) for step in recording["steps"]]
+
+
+def infer_action(state: GameState, next_state: GameState) -> StatelessAction:
+    """
+    Finds the action leading from a state to the next one, recordings only storing states.
+
+    Args:
+        state (GameState): The state before the action.
+        next_state (GameState): The state after the action.
+
+    Raises:
+        RecordingError: If no possible action leads to the next state.
+
+    Returns:
+        StatelessAction: The action.
+    """
+    key = next_state.get_state_key()
+    for action in state.get_possible_stateless_actions():
+        if state.apply_action(action).get_state_key() == key:
+            return action
+    msg = "No possible action leads to the next recorded state"
+    raise RecordingError(msg)
+
+
+def get_recorded_moves(recording: dict[str, Any],
+                       state_type: type[GameState]) -> list[tuple[GameState, StatelessAction]]:
+    """
+    Rebuilds the moves of a recording.
+
+    Args:
+        recording (dict[str, Any]): The recording.
+        state_type (type[GameState]): The class of the game states, providing `from_json`.
+
+    Raises:
+        RecordingError: If two consecutive states are not linked by a possible action.
+
+    Returns:
+        list[tuple[GameState, StatelessAction]]: Each state along with the action played from it.
+    """
+    states = get_recorded_states(recording, state_type)
+    return [(state, infer_action(state, next_state)) for state, next_state in pairwise(states)]
+
+
+def get_recorded_winner_ids(recording: dict[str, Any], final_state: GameState | None = None) -> list[int] | None:
+    """
+    Gets the winners of a recorded game, from its final summary or else from the scores of its final state.
+
+    Args:
+        recording (dict[str, Any]): The recording.
+        final_state (GameState, optional): The last recorded state. Defaults to None.
+
+    Returns:
+        list[int] | None: The IDs of the winners, None if the game is unfinished or was cancelled.
+    """
+    summary = recording.get("final_summary")
+    if summary is not None:
+        return list(summary["winners_id"]) if summary.get("status", "done") == "done" else None
+    if final_state is None or not final_state.is_done():
+        return None
+    scores = final_state.get_scores()
+    best = max(scores.values())
+    return [player_id for player_id, score in scores.items() if score == best]
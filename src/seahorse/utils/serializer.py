@@ -6,6 +6,8 @@ from seahorse.utils.custom_exceptions import MethodNotImplementedError
 
 class Serializable:
 
+    __slots__ = ()
+
     @abstractmethod
     def to_json(self) -> dict:
         raise MethodNotImplementedError()
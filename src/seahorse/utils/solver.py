@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import dill
+import numpy as np
+from loguru import logger
+
+from seahorse.game.game_layout.symmetry import get_canonical_state_key
+from seahorse.game.game_state import GameState
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.utils.custom_exceptions import SolverError
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+# Packed records of a solved position: 11 bytes each
+SOLVED_DTYPE = np.dtype([("key", "<u8"), ("value", "i1"), ("plies", "<u2")])
+
+# Scores ranking the outcomes of the moves: faster wins first, then draws, then slower losses
+_SCALE = 2**16
+
+
+def outcome(state: GameState) -> int:
+    """
+    Gets the outcome of a final state for its active player, by comparing the scores.
+
+    In single-player games, there is no score to beat and every final state is a win: puzzles with a target score
+    should give their own `outcome` to the solver.
+
+    Args:
+        state (GameState): The final state.
+
+    Returns:
+        int: `WIN` if the active player has the best score alone, `DRAW` if it shares it, `LOSS` otherwise.
+    """
+    scores = state.get_scores()
+    player_id = state.get_active_player().get_id()
+    best_other = max((score for other_id, score in scores.items() if other_id != player_id), default=None)
+    if best_other is None:
+        return WIN
+    if scores[player_id] > best_other:
+        return WIN
+    return DRAW if scores[player_id] == best_other else LOSS
+
+
+class SolvedEntry(NamedTuple):
+    """
+    The solution of a position.
+
+    Attributes:
+        value (int): The outcome for the active player under perfect play, `WIN`, `DRAW` or `LOSS`.
+        plies (int): The number of moves until the end of the game under perfect play.
+    """
+
+    value: int
+    plies: int
+
+
+class SolvedDatabase:
+    """
+    The solutions of all the positions of a game, stored as packed records sorted by state key.
+
+    Once saved, the database is loaded with `np.load(..., mmap_mode="r")`: it is shared by all the processes
+    reading it through the page cache and costs nothing to open. Positions are looked up by binary search.
+
+    Attributes:
+        records (np.ndarray): The records, of dtype `SOLVED_DTYPE`.
+        canonical (bool): Whether the keys are canonical keys (see `symmetry.get_canonical_state_key`).
+    """
+
+    def __init__(self, records: np.ndarray, *, canonical: bool = False) -> None:
+        """
+        Initializes a new instance of the SolvedDatabase class.
+
+        Args:
+            records (np.ndarray): The records, of dtype `SOLVED_DTYPE`, sorted by key.
+            canonical (bool, optional): Whether the keys are canonical keys. Defaults to False.
+        """
+        self.records = records
+        self.canonical = canonical
+        self._keys = records["key"]
+
+    def save(self, path: str) -> None:
+        """
+        Saves the records as a `.npy` file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        np.save(path, self.records)
+
+    @classmethod
+    def load(cls, path: str, *, canonical: bool = False) -> SolvedDatabase:
+        """
+        Memory-maps a saved database.
+
+        Args:
+            path (str): The path of the file.
+            canonical (bool, optional): Whether the keys are canonical keys. Defaults to False.
+
+        Returns:
+            SolvedDatabase: The database, backed by the file.
+        """
+        return cls(np.load(path, mmap_mode="r"), canonical=canonical)
+
+    def get_key(self, state: GameState) -> int:
+        """
+        Args:
+            state (GameState): A state.
+
+        Returns:
+            int: The key the state is stored with.
+        """
+        return get_canonical_state_key(state)[0] if self.canonical else state.get_state_key()
+
+    def lookup(self, key: int) -> SolvedEntry | None:
+        """
+        Looks a key up.
+
+        Args:
+            key (int): The key.
+
+        Returns:
+            SolvedEntry | None: The solution, None if the key is absent.
+        """
+        idx = int(np.searchsorted(self._keys, np.uint64(key)))
+        if idx == len(self._keys) or int(self._keys[idx]) != key:
+            return None
+        record = self.records[idx]
+        return SolvedEntry(int(record["value"]), int(record["plies"]))
+
+    def probe(self, state: GameState) -> SolvedEntry | None:
+        """
+        Looks a state up.
+
+        Args:
+            state (GameState): The state.
+
+        Returns:
+            SolvedEntry | None: The solution, None if the state is absent.
+        """
+        return self.lookup(self.get_key(state))
+
+    def get_best_action(self, state: GameState) -> StatelessAction | None:
+        """
+        Gets an optimal action, winning as fast or losing as slowly as possible.
+
+        Args:
+            state (GameState): A state of the database.
+
+        Returns:
+            StatelessAction | None: The action, None if the state is final or unknown.
+        """
+        best, best_score = None, None
+        player_id = state.get_active_player().get_id()
+        for action in state.get_possible_stateless_actions():
+            child = state.apply_action(action)
+            entry = self.probe(child)
+            if entry is None:
+                return None
+            value = entry.value if child.get_active_player().get_id() == player_id else -entry.value
+            score = _score(np.int64(value), np.int64(entry.plies + 1))
+            if best_score is None or score > best_score:
+                best, best_score = action, score
+        return best
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class Solver:
+    """
+    Solves small games exhaustively, walking their state space with `get_possible_stateless_actions`
+    and `apply_action`.
+
+    States are enumerated layer by layer from the initial state, every move leading from a layer to the next one
+    (as in games where each move adds a piece), and deduplicated by key. The expansion of a layer can be spread over
+    a pool of processes, each one expanding the states of a range of keys. Values are then propagated backward from
+    the last layer with array operations: the outcome of a final state is given by `outcome`, and a player moving
+    again keeps the value of the next state while an opponent moving negates it.
+
+    Attributes:
+        initial_state (GameState): The state to solve from.
+        canonical (bool): Whether states equivalent by symmetry are merged (see `symmetry`).
+        n_workers (int): The number of processes expanding the layers.
+        outcome (Callable[[GameState], int]): Gives the outcome of a final state for its active player.
+    """
+
+    def __init__(self, initial_state: GameState, *, canonical: bool = False, n_workers: int = 1,
+                 outcome: Callable[[GameState], int] = outcome) -> None:
+        """
+        Initializes a new instance of the Solver class.
+
+        Args:
+            initial_state (GameState): The state to solve from.
+            canonical (bool, optional): Whether states equivalent by symmetry are merged. Defaults to False.
+            n_workers (int, optional): The number of processes expanding the layers. Defaults to 1.
+            outcome (Callable[[GameState], int], optional): Gives the outcome of a final state for its active
+                player. Defaults to the comparison of the scores.
+        """
+        self.initial_state = initial_state
+        self.canonical = canonical
+        self.n_workers = n_workers
+        self.outcome = outcome
+
+    def get_key(self, state: GameState) -> int:
+        return get_canonical_state_key(state)[0] if self.canonical else state.get_state_key()
+
+    def solve(self, path: str | None = None) -> SolvedDatabase:
+        """
+        Solves the game.
+
+        Args:
+            path (str, optional): If given, the database is saved there and memory-mapped back. Defaults to None.
+
+        Raises:
+            SolverError: If a move does not lead to the next layer.
+
+        Returns:
+            SolvedDatabase: The solutions of all the reachable states.
+        """
+        n_workers = self.n_workers
+        if n_workers > 1 and multiprocessing.current_process().daemon:
+            logger.warning("Cannot start worker processes from a daemonic process, solving in a single process")
+            n_workers = 1
+
+        start = time.time()
+        executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+        try:
+            layers = self._enumerate(executor, n_workers)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        solved = []
+        next_layer = np.zeros(0, dtype=SOLVED_DTYPE)
+        for layer in reversed(layers):
+            next_layer = _propagate(layer, next_layer)
+            solved.append(next_layer)
+        records = np.concatenate(solved)
+        records.sort(order="key")
+        database = SolvedDatabase(records, canonical=self.canonical)
+        logger.info(f"Solved {len(records)} states in {len(layers)} layers in {time.time() - start:.3f}s")
+        if path is not None:
+            database.save(path)
+            database = SolvedDatabase.load(path, canonical=self.canonical)
+        return database
+
+    def _enumerate(self, executor: ProcessPoolExecutor | None,
+                   n_workers: int) -> list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Enumerates the layers, each one being described by its sorted keys, the outcomes of its final states,
+        and its moves in CSR form (offsets, keys of the next states, whether the same player moves again).
+        """
+        # States are kept as JSON when they are expanded by the workers
+        state_type = type(self.initial_state)
+        frontier = {self.get_key(self.initial_state): self.initial_state.to_json() if executor else self.initial_state}
+        seen: set[int] = set()
+        layers = []
+        while frontier:
+            keys = np.array(sorted(frontier), dtype=np.uint64)
+            seen.update(frontier)
+            states = [frontier[key] for key in keys.tolist()]
+            if executor is None:
+                expansions = _expand(states, self.get_key, self.outcome, serialized=False)
+            else:
+                solver_dump, state_type_dump = dill.dumps(self), dill.dumps(state_type)
+                futures = [executor.submit(_expand_worker, solver_dump, state_type_dump, states[part])
+                           for part in _partition(keys, n_workers)]
+                expansions = [expansion for future in futures for expansion in future.result()]
+
+            frontier = {}
+            outcomes = np.zeros(len(keys), dtype=np.int8)
+            counts = np.zeros(len(keys), dtype=np.int64)
+            child_keys, same_player = [], []
+            for i, (value, children) in enumerate(expansions):
+                outcomes[i] = value
+                counts[i] = len(children)
+                for child_key, same, child in children:
+                    if child_key in seen:
+                        msg = "A move leads back to a former layer, the game cannot be solved layer by layer"
+                        raise SolverError(msg)
+                    child_keys.append(child_key)
+                    same_player.append(same)
+                    frontier.setdefault(child_key, child)
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            layers.append((keys, outcomes, offsets, np.array(child_keys, dtype=np.uint64),
+                           np.array(same_player, dtype=bool)))
+        return layers
+
+
+def _expand(states: list, get_key: Callable[[GameState], int], get_outcome: Callable[[GameState], int],
+            *, serialized: bool) -> list[tuple[int, list[tuple[int, bool, object]]]]:
+    """
+    Expands states, returning for each one its outcome (if final) and its children as (key, same player, state),
+    children being serialized to JSON if requested.
+    """
+    expansions = []
+    for state in states:
+        actions = () if state.is_done() else state.get_possible_stateless_actions()
+        if not actions:
+            expansions.append((get_outcome(state), []))
+            continue
+        player_id = state.get_active_player().get_id()
+        children = []
+        for action in actions:
+            child = state.apply_action(action)
+            children.append((get_key(child), child.get_active_player().get_id() == player_id,
+                             child.to_json() if serialized else child))
+        expansions.append((0, children))
+    return expansions
+
+
+def _expand_worker(solver_dump: bytes, state_type_dump: bytes,
+                   states_json: list) -> list[tuple[int, list[tuple[int, bool, object]]]]:
+    """
+    Expands a range of states in a worker process, children being sent back as JSON.
+    """
+    solver: Solver = dill.loads(solver_dump)
+    state_type = dill.loads(state_type_dump)
+    states = [state_type.from_json(data) for data in states_json]
+    return _expand(states, solver.get_key, solver.outcome, serialized=True)
+
+
+def _partition(keys: np.ndarray, n_parts: int) -> list[slice]:
+    """
+    Splits sorted keys into `n_parts` ranges of equal width over the 64-bit key space.
+    """
+    bounds = np.array([(i << 64) // n_parts for i in range(1, n_parts)], dtype=np.uint64)
+    cuts = [0, *np.searchsorted(keys, bounds).tolist(), len(keys)]
+    return [slice(cuts[i], cuts[i + 1]) for i in range(n_parts) if cuts[i] < cuts[i + 1]]
+
+
+def _score(values: np.ndarray, plies: np.ndarray) -> np.ndarray:
+    """
+    Ranks outcomes, faster wins first, then draws, then slower losses.
+    """
+    return np.where(values > 0, 4 * _SCALE - plies, np.where(values == 0, 2 * _SCALE - plies, plies))
+
+
+def _propagate(layer: tuple[np.ndarray, ...], next_layer: np.ndarray) -> np.ndarray:
+    """
+    Solves a layer, as returned by `Solver._enumerate`, from the solution of the next one.
+    """
+    keys, outcomes, offsets, child_keys, same_player = layer
+    records = np.zeros(len(keys), dtype=SOLVED_DTYPE)
+    records["key"] = keys
+    records["value"] = outcomes
+    if len(child_keys) == 0:
+        return records
+
+    next_layer = np.sort(next_layer, order="key")
+    idx = np.searchsorted(next_layer["key"], child_keys)
+    if (idx >= len(next_layer)).any() or (next_layer["key"][np.minimum(idx, len(next_layer) - 1)] != child_keys).any():
+        msg = "A move leads to a state missing from the next layer"
+        raise SolverError(msg)
+    values = next_layer["value"][idx].astype(np.int64)
+    values = np.where(same_player, values, -values)
+    scores = _score(values, next_layer["plies"][idx].astype(np.int64) + 1)
+
+    inner = np.diff(offsets) > 0
+    best = np.maximum.reduceat(scores, offsets[:-1][inner])
+    records["value"][inner] = np.where(best > 3 * _SCALE, WIN, np.where(best > _SCALE, DRAW, LOSS))
+    records["plies"][inner] = np.where(best > 3 * _SCALE, 4 * _SCALE - best,
+                                       np.where(best > _SCALE, 2 * _SCALE - best, best))
+    return records
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import multiprocessing
+import socket
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import TYPE_CHECKING, Any
+
+import dill
+from loguru import logger
+
+if TYPE_CHECKING:
+    from seahorse.game.master import GameMaster
+    from seahorse.player.player import Player
+
+ROUND_ROBIN = "round_robin"
+SWISS = "swiss"
+KNOCKOUT = "knockout"
+MODES = (ROUND_ROBIN, SWISS, KNOCKOUT)
+
+# Status of a match that raised instead of completing
+ERROR = "error"
+_SECONDS_PER_HOUR = 3600
+
+
+@dataclass
+class MatchResult:
+    """
+    The outcome of a tournament match, players being designated by name.
+
+    Attributes:
+        round (int): The round of the match.
+        players (list[str]): The players, in seat order.
+        scores (dict[str, float]): The final scores (`GameMaster.get_scores`).
+        winners (list[str]): The winners (`GameMaster.get_winner`).
+        custom_stats (list[dict]): The custom statistics (`GameMaster.get_custom_stats`), with the name of
+            their player under "agent".
+        elapsed (float): The duration of the match, in seconds.
+        status (str): "done", or "error" if the match raised.
+        error (str | None): The error raised by the match, if any.
+    """
+
+    round: int
+    players: list[str]
+    scores: dict[str, float] = field(default_factory=dict)
+    winners: list[str] = field(default_factory=list)
+    custom_stats: list[dict] = field(default_factory=list)
+    elapsed: float = 0.0
+    status: str = "done"
+    error: str | None = None
+
+    def get_points(self) -> dict[str, float]:
+        """
+        Gets the points earned by the players, the winners sharing 1 point.
+
+        Returns:
+            dict[str, float]: The points, indexed by player name.
+        """
+        return {name: 1 / len(self.winners) if name in self.winners else 0.0 for name in self.players}
+
+
+@dataclass
+class TournamentReport:
+    """
+    The results of a tournament.
+
+    Attributes:
+        results (list[MatchResult]): The results of the matches, round by round.
+        elapsed (float): The wall-clock duration of the tournament, in seconds.
+        n_workers (int): The number of processes the matches were played in.
+        byes (dict[str, int]): The number of byes (worth 1 point) given to each player.
+        champion (str | None): The last player standing, in knockout tournaments.
+    """
+
+    results: list[MatchResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    n_workers: int = 1
+    byes: dict[str, int] = field(default_factory=dict)
+    champion: str | None = None
+
+    def get_n_matches(self) -> int:
+        """
+        Returns:
+            int: The number of matches played.
+        """
+        return len(self.results)
+
+    def get_matches_per_hour(self) -> float:
+        """
+        Returns:
+            float: The number of matches played per hour.
+        """
+        return self.get_n_matches() / self.elapsed * _SECONDS_PER_HOUR if self.elapsed > 0 else 0.0
+
+    def get_standings(self) -> list[dict[str, Any]]:
+        """
+        Ranks the players by points, then by total score.
+
+        Returns:
+            list[dict[str, Any]]: One row per player, with its name, the number of matches played, won, drawn
+                (shared win), lost, its points (byes included) and its total score.
+        """
+        rows: dict[str, dict[str, Any]] = {}
+
+        def get_row(name: str) -> dict[str, Any]:
+            return rows.setdefault(name, {"name": name, "played": 0, "wins": 0, "draws": 0, "losses": 0,
+                                          "points": 0.0, "score": 0.0})
+
+        for name, n_byes in self.byes.items():
+            get_row(name)["points"] += n_byes
+        for result in self.results:
+            for name, points in result.get_points().items():
+                row = get_row(name)
+                row["played"] += 1
+                row["points"] += points
+                row["score"] += result.scores.get(name, 0.0)
+                if points == 1:
+                    row["wins"] += 1
+                elif points > 0:
+                    row["draws"] += 1
+                else:
+                    row["losses"] += 1
+        return sorted(rows.values(), key=lambda row: (row["points"], row["score"]), reverse=True)
+
+    def get_table(self) -> list[dict[str, Any]]:
+        """
+        Flattens the results into one row per match.
+
+        Returns:
+            list[dict[str, Any]]: The rows, with the round, players, scores, winners, custom statistics,
+                duration and status of each match.
+        """
+        return [{"round": result.round, "players": result.players, "scores": result.scores,
+                 "winners": result.winners, "custom_stats": result.custom_stats, "elapsed": result.elapsed,
+                 "status": result.status} for result in self.results]
+
+    def __str__(self) -> str:
+        lines = [(f"{self.get_n_matches()} matches in {self.elapsed:.1f}s ({self.get_matches_per_hour():.0f} "
+                  f"matches/hour, {self.n_workers} worker(s))")]
+        lines += [f"{rank:>3}. {row['name']:<20} {row['points']:>6.1f} pts  {row['wins']}W {row['draws']}D "
+                  f"{row['losses']}L  score {row['score']:.1f}" for rank, row in enumerate(self.get_standings(), 1)]
+        if self.champion is not None:
+            lines.append(f"Champion: {self.champion}")
+        return "\n".join(lines)
+
+
+class Tournament:
+    """
+    Runs round-robin, Swiss or knockout tournaments between players, matches being played concurrently
+    in a pool of processes.
+
+    `EventMaster` being a singleton bound to one port, every match is played in a fresh worker process
+    (`max_tasks_per_child=1`) on its own port. Matches are built by `match_factory`, which receives the players
+    in seat order and the port, and returns a master whose `record_game` plays the game, e.g. a `GameMaster`
+    with `LocalPlayerProxy` players. The factory and the players are shipped to the workers with dill.
+
+    Swiss rounds pair players with close points who have not met yet, the lowest ranked player without a bye
+    getting one (worth 1 point) when the count is odd. In knockout rounds, the best seed meets the worst one,
+    a drawn or failed match being won by the better seed.
+
+    Attributes:
+        players (list[Player]): The players, ordered by seed. Their names must be unique.
+        match_factory (Callable[[list[Player], int], GameMaster]): Builds the master of a match.
+        mode (str): "round_robin", "swiss" or "knockout".
+        n_workers (int): The number of matches played concurrently.
+        n_legs (int): The number of matches between two players in a round robin, seats being swapped.
+        n_rounds (int | None): The number of rounds of a Swiss tournament.
+        base_port (int | None): The port of the first match, following matches using the following ports.
+            A free port is picked for each match if None.
+    """
+
+    def __init__(self, players: Sequence[Player], match_factory: Callable[[list[Player], int], GameMaster], *,
+                 mode: str = ROUND_ROBIN, n_workers: int = 1, n_legs: int = 1, n_rounds: int | None = None,
+                 base_port: int | None = None) -> None:
+        """
+        Initializes a new instance of the Tournament class.
+
+        Args:
+            players (Sequence[Player]): The players, ordered by seed.
+            match_factory (Callable[[list[Player], int], GameMaster]): Builds the master of a match from the
+                players in seat order and a port.
+            mode (str, optional): "round_robin", "swiss" or "knockout". Defaults to "round_robin".
+            n_workers (int, optional): The number of matches played concurrently. Defaults to 1.
+            n_legs (int, optional): The number of matches between two players in a round robin. Defaults to 1.
+            n_rounds (int, optional): The number of rounds of a Swiss tournament. Defaults to None, meaning
+                the base-2 logarithm of the number of players, rounded up.
+            base_port (int, optional): The port of the first match. Defaults to None.
+
+        Raises:
+            ValueError: If the mode is unknown or the names of the players are not unique.
+        """
+        if mode not in MODES:
+            msg = f"Unknown tournament mode {mode!r}, expected one of {MODES}"
+            raise ValueError(msg)
+        if len({player.get_name() for player in players}) < len(players):
+            msg = "The players of a tournament must have unique names"
+            raise ValueError(msg)
+        self.players = list(players)
+        self.match_factory = match_factory
+        self.mode = mode
+        self.n_workers = n_workers
+        self.n_legs = n_legs
+        self.n_rounds = n_rounds if n_rounds is not None else max(1, (len(players) - 1).bit_length())
+        self.base_port = base_port
+        self._by_name = {player.get_name(): player for player in self.players}
+        self._n_matches = 0
+
+    def run(self) -> TournamentReport:
+        """
+        Plays the tournament.
+
+        Returns:
+            TournamentReport: The results of the matches along with the standings and the throughput.
+        """
+        start = time.time()
+        report = TournamentReport(n_workers=self.n_workers)
+        if multiprocessing.current_process().daemon:
+            logger.warning("Cannot start worker processes from a daemonic process, playing in this process")
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.n_workers, max_tasks_per_child=1)
+        try:
+            if self.mode == ROUND_ROBIN:
+                pairings = [pair if leg % 2 == 0 else pair[::-1]
+                            for leg in range(self.n_legs) for pair in combinations(self.players, 2)]
+                report.results = self._play_round(executor, 0, pairings)
+            elif self.mode == SWISS:
+                for round_ in range(self.n_rounds):
+                    pairings = self._get_swiss_pairings(report)
+                    report.results += self._play_round(executor, round_, pairings)
+            else:
+                self._play_knockout(executor, report)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        report.elapsed = time.time() - start
+        logger.info(f"Tournament: {report}")
+        return report
+
+    def _play_round(self, executor: ProcessPoolExecutor | None, round_: int,
+                    pairings: Sequence[Sequence[Player]]) -> list[MatchResult]:
+        factory_dump = dill.dumps(self.match_factory)
+        jobs = []
+        for players in pairings:
+            port = self.base_port + self._n_matches if self.base_port is not None else None
+            self._n_matches += 1
+            jobs.append((factory_dump, dill.dumps(list(players)), round_, port))
+        if executor is None:
+            results = [_match_worker(*job) for job in jobs]
+        else:
+            futures = [executor.submit(_match_worker, *job) for job in jobs]
+            results = [future.result() for future in futures]
+        for result in results:
+            if result.status == ERROR:
+                logger.error(f"Round {round_}: {' vs '.join(result.players)} failed: {result.error}")
+            else:
+                logger.info(f"Round {round_}: {' vs '.join(result.players)} won by {', '.join(result.winners)} "
+                            f"in {result.elapsed:.1f}s")
+        return results
+
+    def _get_swiss_pairings(self, report: TournamentReport) -> list[tuple[Player, Player]]:
+        points = dict.fromkeys(self._by_name, 0.0)
+        points.update({row["name"]: row["points"] for row in report.get_standings()})
+        met = {frozenset(result.players) for result in report.results}
+        first_seats = dict.fromkeys(self._by_name, 0)
+        for result in report.results:
+            first_seats[result.players[0]] += 1
+
+        # Players are ranked by points, then by seed
+        seeds = {name: i for i, name in enumerate(self._by_name)}
+        ranking = sorted(self._by_name, key=lambda name: (-points[name], seeds[name]))
+        if len(ranking) % 2:
+            bye = next((name for name in reversed(ranking) if name not in report.byes), ranking[-1])
+            report.byes[bye] = report.byes.get(bye, 0) + 1
+            ranking.remove(bye)
+
+        pairings = []
+        while ranking:
+            name = ranking.pop(0)
+            opponent = next((other for other in ranking if frozenset((name, other)) not in met), ranking[0])
+            ranking.remove(opponent)
+            # The player who played first the least often takes the first seat
+            pair = sorted((name, opponent), key=lambda n: first_seats[n])
+            pairings.append((self._by_name[pair[0]], self._by_name[pair[1]]))
+        return pairings
+
+    def _play_knockout(self, executor: ProcessPoolExecutor | None, report: TournamentReport) -> None:
+        alive = list(self.players)
+        round_ = 0
+        while len(alive) > 1:
+            advancing = set()
+            if len(alive) % 2:
+                # The best seed gets a bye
+                advancing.add(alive[0].get_name())
+                report.byes[alive[0].get_name()] = report.byes.get(alive[0].get_name(), 0) + 1
+                alive = alive[1:]
+            half = len(alive) // 2
+            pairings = [(alive[i], alive[-1 - i]) for i in range(half)]
+            results = self._play_round(executor, round_, pairings)
+            for (seed, opponent), result in zip(pairings, results, strict=True):
+                opponent_won = result.status != ERROR and result.winners == [opponent.get_name()]
+                advancing.add(opponent.get_name() if opponent_won else seed.get_name())
+            report.results += results
+            # Seeds are kept in the original order
+            alive = [player for player in self.players if player.get_name() in advancing]
+            round_ += 1
+        report.champion = alive[0].get_name() if alive else None
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("", 0))
+        return sock.getsockname()[1]
+
+
+def _match_worker(factory_dump: bytes, players_dump: bytes, round_: int, port: int | None) -> MatchResult:
+    """
+    Plays a match in a worker process, and gathers its results designating the players by name.
+    """
+    players: list[Player] = dill.loads(players_dump)
+    names = [player.get_name() for player in players]
+    start = time.time()
+    try:
+        master = dill.loads(factory_dump)(players, port if port is not None else _get_free_port())
+        master.record_game()
+        id2name = {player.get_id(): player.get_name() for player in master.get_game_state().get_players()}
+        custom_stats = [{**stat, "agent": id2name.get(stat.get("agent_id"))} for stat in master.get_custom_stats()]
+        scores = {id2name[player_id]: score for player_id, score in master.get_scores().items()}
+        winners = [player.get_name() for player in master.get_winner()]
+        return MatchResult(round_, names, scores, winners, custom_stats, time.time() - start)
+    except Exception as e:
+        return MatchResult(round_, names, elapsed=time.time() - start, status=ERROR, error=repr(e))
@@ -1,12 +1,70 @@
+import asyncio
 import copy
+import gc
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import random
+import tempfile
+import threading
+import types
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
 from typing import Any
 
+import numpy as np
+
+from seahorse.game.action_codec import CodedAction, GridActionCodec, TableActionCodec
+from seahorse.game.game_layout.array_board import ArrayBoard
 from seahorse.game.game_layout.board import Board, Piece
+from seahorse.game.game_layout.features import BoardFeatureExtractor
+from seahorse.game.game_layout.persistent_board import PersistentBoard, PersistentMap
+from seahorse.game.game_layout.symmetry import D2, D4, get_canonical_hash, get_canonical_state_key
+from seahorse.game.game_layout.zobrist import ZobristTable
 from seahorse.game.game_state import GameState
 from seahorse.game.representation import Representation
-from seahorse.game.stateful_action import StatefulAction
+from seahorse.game.stateful_action import LazyStatefulAction, StatefulAction
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.game.io_stream import DEFAULT_ROOM, EventRoom
+from seahorse.game.master import GameMaster
+from seahorse.game.replay import Replay, verify_recording
+from seahorse.game.simulator import Simulator
+from seahorse.player.batch_evaluator import BatchEvaluator, LinearEvaluator
+from seahorse.player.contrainers import PlayerContainer
 from seahorse.player.player import Player
+from seahorse.player.proxies import InteractivePlayerProxy
+from seahorse.player.transposition_table import LOWER_BOUND, TranspositionTable
+from seahorse.utils.book import BookBuilder, OpeningBook
+from seahorse.utils.custom_exceptions import (
+    ActionNotPermittedError,
+    MissingActionCodecError,
+    PerftMismatchError,
+    RecordingError,
+    RoomInUseError,
+)
+from seahorse.utils.perft import benchmark, check_references, divide
+from seahorse.utils.ratings import EloRatings, Glicko2Ratings, RatedGame, TrueSkillRatings
+from seahorse.utils.solver import DRAW, WIN, SolvedDatabase, Solver, outcome
+from seahorse.utils.tournament import ERROR, KNOCKOUT, SWISS, MatchResult, Tournament, TournamentReport, _get_free_port
+
+from tictac import (
+    AlphaBetaPlayerTictac,
+    AnytimePlayerTictac,
+    BoardTictac,
+    CodedGameStateTictac,
+    GameStateTictac,
+    InplaceGameStateTictac,
+    LazyGameStateTictac,
+    MCTSPlayerTictac,
+    MemoGameStateTictac,
+    PlayerTictac,
+    build_initial_state,
+    build_match,
+    play_matches_in_rooms,
+)
 
 
 class DummyGameState(GameState):
@@ -40,6 +98,30 @@ class DummyGameState(GameState):
         return poss_actions
 
 
+class StrictGameStateTictac(GameStateTictac):
+
+    lazy_stateful_actions = True
+    checked = 0
+
+    def is_legal(self, action):
+        StrictGameStateTictac.checked += 1
+        position = action.get_stateless_action().data["position"]
+        return position not in self.get_rep().get_env()
+
+
+class StubProxy:
+
+    def __init__(self, player, action):
+        self.player = player
+        self.action = action
+
+    def get_id(self):
+        return self.player.get_id()
+
+    async def play(self, current_state, **_):
+        return self.action.get_stateful_action(current_state), 0.0
+
+
 class TestCase(unittest.TestCase):
 
     def setUp(self):
@@ -83,3 +165,632 @@ class TestCase(unittest.TestCase):
         possible_actions = self.current_gs.generate_possible_actions()
         assert len(possible_actions) == self.current_gs.get_rep().get_dimensions()[0]*self.current_gs.get_rep()\
             .get_dimensions()[1] - 3
+
+    def test_zobrist(self):
+        zobrist = ZobristTable()
+        board = Board(env={(0, 1): self.piece1}, dim=[3, 3], zobrist=zobrist)
+        assert board.is_hash_incremental()
+        board.place_piece((2, 1), self.piece2)
+        board.place_piece((2, 2), self.piece3)
+        assert board.get_zobrist_hash() == zobrist.hash_env(board.get_env())
+        other = board.copy()
+        assert other.remove_piece((2, 2)) == self.piece3
+        assert other.get_zobrist_hash() == zobrist.hash_env(other.get_env())
+        assert hash(other) != hash(board)
+        other.place_piece((2, 2), self.piece3)
+        assert other == board
+        assert ZobristTable().get_key((0, 0), "A", 1) == zobrist.get_key((0, 0), "A", 1)
+        assert ZobristTable(3).get_key((np.int64(0), np.int64(1)), "A", 1) == ZobristTable(3).get_key((0, 1), "A", 1)
+        assert zobrist.get_key([0, 1], "A", np.int64(1)) == zobrist.get_key((0, 1), "A", 1)
+
+        loaded = Board.from_json(json.dumps(board.to_json()))
+        assert loaded.zobrist.seed == zobrist.seed
+        assert loaded == board
+
+        gs = DummyGameState(scores={}, next_player=self.player1, players=[self.player1, self.player2], rep=board)
+        assert hash(gs) == hash(gs)
+        assert gs._hash is not None
+
+    def test_array_board(self):
+        board = ArrayBoard(env={}, dim=[3, 3])
+        assert board.get_env() == {}
+        board.env[(0, 1)] = self.piece1
+        board.env[(2, 1)] = self.piece2
+        board.env[(2, 2)] = self.piece3
+        assert board.get_pieces_player(self.player1) == (1, [(2, 2)])
+        assert board.get_owner_counts() == {-1: 1, self.player1.get_id(): 1, self.player2.get_id(): 1}
+        assert board.count_pieces(region=(slice(2, 3), slice(0, 3))) == 2
+        assert board.find((2, 1)) == self.piece2
+        assert board.find((5, 5)) == -1
+
+        other = copy.deepcopy(board)
+        del other.env[(0, 1)]
+        assert len(other.get_env()) == 2
+        assert len(board.get_env()) == 3
+        assert other != board
+
+        loaded = ArrayBoard.from_json(json.dumps(board.to_json()))
+        assert loaded == board
+        assert dict(loaded.get_env()) == dict(board.get_env())
+
+        hashed = ArrayBoard(env=dict(board.get_env()), dim=[3, 3], zobrist=ZobristTable(seed=7))
+        loaded = ArrayBoard.from_json(json.dumps(hashed.to_json()))
+        assert loaded.zobrist.seed == 7
+        assert hash(loaded) == hash(hashed)
+        assert loaded.is_inside([2, 1])
+        assert [2, 1] in loaded.get_env()
+        assert loaded.place_piece([0, 0], self.piece1) is None
+        assert loaded.remove_piece([0, 0]) == self.piece1
+        assert hash(loaded) == hash(hashed)
+
+        gs = DummyGameState(scores={}, next_player=self.player1, players=[self.player1, self.player2], rep=board)
+        assert len(gs.generate_possible_actions()) == 6
+
+    def test_lazy_stateful_actions(self):
+        gs = build_initial_state(LazyGameStateTictac)
+        applied = GameStateTictac.applied
+        possible_actions = gs.get_possible_stateful_actions()
+        assert len(possible_actions) == 9
+        action = StatelessAction({"position": (1, 1)}).get_stateful_action(gs)
+        assert isinstance(action, LazyStatefulAction)
+        assert action in possible_actions
+        assert GameStateTictac.applied == applied
+        assert action.get_next_game_state().get_rep().find((1, 1)).get_type() == "X"
+        assert GameStateTictac.applied == applied + 1
+
+        eager = StatefulAction(gs, gs.apply_action(StatelessAction({"position": (0, 0)})))
+        assert gs.check_action(eager)
+        loaded = LazyStatefulAction.from_json(action.to_json())
+        assert loaded == action
+        assert loaded.get_stateful_action(gs).get_current_game_state() is gs
+        assert hash(action) == hash(action.get_stateless_action())
+        assert action != action.get_stateful_action(action.get_next_game_state())
+
+    def test_is_legal(self):
+        gs = build_initial_state(StrictGameStateTictac)
+        gs = gs.apply_action(StatelessAction({"position": (0, 0)}))
+        assert gs.check_action(StatelessAction({"position": (0, 1)}).get_stateful_action(gs))
+        assert StrictGameStateTictac.checked == 1
+
+        player1, player2 = gs.get_players()
+        master = GameMaster("tictac", gs, [StubProxy(player1, None), StubProxy(player2, None)])
+        master.id2player[player2.get_id()].action = StatelessAction({"position": (0, 0)})
+        with self.assertRaises(ActionNotPermittedError):
+            asyncio.run(master.step())
+        master.id2player[player2.get_id()].action = StatelessAction({"position": (2, 2)})
+        applied = GameStateTictac.applied
+        next_gs = asyncio.run(master.step())
+        assert next_gs.get_rep().find((2, 2)).get_type() == "O"
+        assert GameStateTictac.applied == applied + 1
+        assert gs._possible_stateless_actions is None
+
+        # A successor forged by the player is not trusted, only its move
+        gs = build_initial_state(LazyGameStateTictac)
+        forged = gs.apply_action(StatelessAction({"position": (1, 1)}))
+        forged.scores = {player1.get_id(): 0.0, player2.get_id(): 100.0}
+        master = GameMaster("tictac", gs, [StubProxy(player1, StatefulAction(gs, forged)), StubProxy(player2, None)])
+        next_gs = asyncio.run(master.step())
+        assert next_gs.get_rep().find((1, 1)).get_type() == "X"
+        assert next_gs.get_scores() == gs.get_scores()
+
+    def test_make_unmake(self):
+        for gs_type in (InplaceGameStateTictac, GameStateTictac):
+            gs = build_initial_state(gs_type, zobrist=ZobristTable())
+            initial_hash = hash(gs)
+            initial_actions = gs.get_possible_stateless_actions()
+            expected = gs.apply_action(StatelessAction({"position": (1, 1)}))
+            expected = expected.apply_action(StatelessAction({"position": (0, 2)}))
+
+            records = [gs.make_action(StatelessAction({"position": (1, 1)}))]
+            assert len(gs.get_possible_stateless_actions()) == 8
+            records.append(gs.make_action(StatelessAction({"position": (0, 2)})))
+            assert gs == expected
+            assert gs.get_active_player() == expected.get_active_player()
+            assert gs.get_possible_stateless_actions() == expected.get_possible_stateless_actions()
+
+            for record in reversed(records):
+                gs.unmake_action(record)
+            assert hash(gs) == initial_hash
+            assert gs.get_rep().get_zobrist_hash() == ZobristTable().hash_env(gs.get_rep().get_env())
+            assert gs.get_rep().get_env() == {}
+            assert gs.get_possible_stateless_actions() is initial_actions
+            assert gs.get_active_player().get_id() == 1
+
+    def test_persistent_map(self):
+        rng = random.Random(0)
+        expected = {}
+        current = PersistentMap()
+        history = []
+        for _ in range(2000):
+            key = (rng.randrange(20), rng.randrange(20))
+            history.append((current, dict(expected)))
+            if rng.random() < 0.3:
+                expected.pop(key, None)
+                current = current.delete(key)
+            else:
+                expected[key] = rng.random()
+                current = current.set(key, expected[key])
+        assert dict(current.items()) == expected
+        assert len(current) == len(expected)
+        for old, old_expected in history[::100]:
+            assert dict(old.items()) == old_expected
+
+    def test_persistent_board(self):
+        board = PersistentBoard(env={(0, 1): self.piece1}, dim=[3, 3], zobrist=ZobristTable())
+        child = board.with_changes({(2, 1): self.piece2, (0, 1): None})
+        assert dict(board.get_env().items()) == {(0, 1): self.piece1}
+        assert dict(child.get_env().items()) == {(2, 1): self.piece2}
+        assert child.get_pieces_player(self.player2) == (1, [(2, 1)])
+        assert child.get_zobrist_hash() == ZobristTable().hash_env(child.get_env())
+        assert copy.deepcopy(child) == child
+
+    def test_slots_and_interning(self):
+        piece = Piece.intern("A", self.player1)
+        assert piece is Piece.intern("A", owner_id=self.player1.get_id())
+        assert not hasattr(piece, "__dict__")
+        assert Piece.from_json(json.dumps(piece.to_json())) is piece
+        assert pickle.loads(pickle.dumps(piece)) == piece
+
+        # Unused pieces leave the pool
+        key = (Piece, "unused", 7)
+        Piece.intern("unused", owner_id=7)
+        gc.collect()
+        assert key not in Piece._pool
+
+        action = StatelessAction({"position": (0, 1)})
+        assert not hasattr(action, "__dict__")
+        assert hash(action) == hash(StatelessAction({"position": (0, 1)}))
+        assert StatelessAction.from_json(action.to_json()) == action
+
+    def test_action_codec(self):
+        gs = build_initial_state(CodedGameStateTictac, board=ArrayBoard)
+        gs = gs.apply_action(StatelessAction({"position": (1, 1)}))
+        assert gs.get_possible_action_codes().tolist() == [0, 1, 2, 3, 5, 6, 7, 8]
+        assert gs.get_legal_action_mask().sum() == 8
+        assert gs.check_action(0)
+        assert not gs.check_action(4)
+        codec = gs.get_action_codec()
+        assert codec.decode(codec.encode(StatelessAction({"position": (2, 0)}))) == StatelessAction({"position": (2, 0)})
+
+        compact = gs.compact_action(StatelessAction({"position": (2, 0)}))
+        assert compact == CodedAction(6)
+        assert gs.check_action(compact)
+        loaded = CodedAction.from_json(json.dumps(compact.to_json(), default=str))
+        next_gs = loaded.get_stateful_action(gs).get_next_game_state()
+        assert next_gs.get_rep().find((2, 0)).get_type() == "O"
+
+        table = TableActionCodec(gs.get_possible_stateless_actions())
+        assert sorted(table.encode_many(gs.get_possible_stateless_actions()).tolist()) == list(range(8))
+
+    def test_batch_legal_action_masks(self):
+        states = [build_initial_state(CodedGameStateTictac, board=ArrayBoard)]
+        for position in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            states.append(states[-1].apply_action(StatelessAction({"position": position})))
+        masks = CodedGameStateTictac.batch_legal_action_masks(states)
+        assert masks.shape == (6, 9)
+        assert (masks == super(CodedGameStateTictac, CodedGameStateTictac).batch_legal_action_masks(states)).all()
+        assert masks.sum(axis=1).tolist() == [9, 8, 7, 6, 5, 0]
+
+    def test_memoized(self):
+        stats = MemoGameStateTictac.get_memo_stats()["is_done"]
+        stats.reset()
+        gs = build_initial_state(MemoGameStateTictac)
+        for _ in range(3):
+            assert not gs.is_done()
+        assert (stats.hits, stats.misses) == (2, 1)
+
+        positions = [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]
+        records = [gs.make_action(StatelessAction({"position": position})) for position in positions]
+        assert gs.is_done()
+        assert stats.misses == 2
+        for record in reversed(records):
+            gs.unmake_action(record)
+        assert not gs.is_done()
+        assert (stats.hits, stats.misses) == (3, 2)
+
+
+    def test_transposition_table(self):
+        gs = build_initial_state(board=Board, zobrist=ZobristTable())
+        child = gs.apply_action(StatelessAction({"position": (0, 0)}))
+        assert gs.get_state_key() != child.get_state_key()
+        assert child.get_state_key() == copy.deepcopy(child).get_state_key()
+
+        table = TranspositionTable(max_memory=4096)
+        assert table.get_memory() <= 4096
+        key = child.get_state_key()
+        assert table.probe(key) is None
+        table.store(key, 1.0, depth=3, flag=LOWER_BOUND, move=4)
+        assert table.probe(key) == (1.0, 3, LOWER_BOUND, 4)
+
+        # Two more keys of the same bucket: the deepest entry stays, the newest one replaces the other
+        others = [key + n * table.n_buckets for n in (1, 2)]
+        table.store(others[0], 0.0, depth=1)
+        table.store(others[1], 0.0, depth=2)
+        assert table.probe(key).depth == 3
+        assert table.probe(others[0]) is None
+        assert table.probe(others[1]).depth == 2
+        table.new_search()
+        table.store(others[0], 0.0, depth=0)
+        assert table.probe(others[0]) is not None
+
+        stats = table.get_stats()
+        assert (stats["probes"], stats["hits"], stats["collisions"], stats["stores"]) == (6, 4, 1, 4)
+        table.clear()
+        assert table.probe(key) is None
+
+    def test_mcts_player(self):
+        gs = build_initial_state()
+        for position in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            gs = gs.apply_action(StatelessAction({"position": position}))
+        # X can win on (0, 2), and must otherwise block O on (1, 2)
+        for n_workers in (1, 2):
+            with MCTSPlayerTictac("X", n_workers=n_workers, max_playouts=300, seed=0, id=1) as player:
+                action = player.compute_action(gs, remaining_time=60)
+                assert action == StatelessAction({"position": (0, 2)})
+                assert player.stats["playouts"] == 300 * n_workers
+                assert player.stats["playouts_per_second"] > 0
+            assert player._executor is None
+
+    def test_alpha_beta_player(self):
+        player = AlphaBetaPlayerTictac("X", id=1)
+        gs = build_initial_state(board=Board, zobrist=ZobristTable())
+        player.compute_action(gs)
+        assert player.stats["value"] == 0
+        assert player.stats["depth"] == 9
+        assert player.stats["tt"]["hits"] > 0
+
+        for position in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            gs = gs.apply_action(StatelessAction({"position": position}))
+        assert player.compute_action(gs) == StatelessAction({"position": (0, 2)})
+        assert player.stats["value"] == 1
+
+        # Without time left, a legal move is still returned
+        action = player.compute_action(gs, remaining_time=0)
+        assert action in gs.get_possible_stateless_actions()
+        assert player.stats["depth"] <= 1
+
+    def test_anytime_container(self):
+        gs = build_initial_state()
+        container = PlayerContainer(AnytimePlayerTictac("X", "anytime", id=1), gs=GameStateTictac, soft_margin=0.5)
+
+        async def play_twice() -> list:
+            try:
+                results = []
+                for _ in range(2):
+                    results.append(await container.play(gs, remaining_time=1.0))
+                return results
+            finally:
+                await container.close()
+
+        for action, time_diff in asyncio.run(play_twice()):
+            # The published action is collected at the soft deadline, which is all the player is charged
+            assert action == StatelessAction({"position": (0, 0)})
+            self.assertAlmostEqual(time_diff, 0.5)
+
+    def test_simulator(self):
+        simulator = Simulator(build_initial_state(), check_actions=True)
+        for n_workers in (1, 2):
+            report = simulator.run(10, n_workers=n_workers, seed=0)
+            assert report.get_n_games() == 10
+            assert all(5 <= result.n_moves <= 9 and result.finished for result in report.results)
+            assert sum(report.get_win_counts().values()) == 10
+            assert report.get_moves_per_second() > 0
+        assert report.results[0].final_state is None
+
+        result = Simulator(build_initial_state(), max_moves=3).play_game()
+        assert (result.n_moves, result.finished) == (3, False)
+        assert len(result.final_state.get_rep().get_env()) == 3
+
+    def test_perft(self):
+        gs = build_initial_state()
+        reports = benchmark(gs, 4, references={1: 9, 2: 72, 3: 504, 4: 3024})
+        assert reports["stateless"].nodes == reports["stateful"].nodes == reports["profile"].nodes == 3024
+        assert reports["profile"].primitives["apply_action"].calls == 9 + 72 + 504 + 3024
+        assert all(stats.get_calls_per_second() > 0 for stats in reports["profile"].primitives.values())
+        assert sum(divide(gs, 3).values()) == 504
+
+        check_references(gs.apply_action(StatelessAction({"position": (1, 1)})), {4: 8 * 7 * 6 * 5})
+        with self.assertRaises(PerftMismatchError):
+            check_references(gs, {2: 73})
+
+    def test_symmetry(self):
+        class SquareBoard(Board):
+            symmetries = D4
+
+        class SquareArrayBoard(ArrayBoard):
+            symmetries = D4
+
+        env = {(0, 0): Piece("X", owner_id=1), (0, 1): Piece("O", owner_id=2), (2, 1): Piece("X", owner_id=1)}
+        board = SquareBoard(env, [3, 3], zobrist=ZobristTable())
+        array_board = SquareArrayBoard(env, [3, 3])
+        canonical, _ = get_canonical_hash(board)
+        assert get_canonical_hash(array_board)[0] == canonical
+        assert get_canonical_hash(Board(env, [3, 3]))[0] == Board(env, [3, 3]).get_zobrist_hash()
+
+        images = set()
+        for symmetry in D4:
+            image, array_image = board.transform(symmetry), array_board.transform(symmetry)
+            images.add(image.get_zobrist_hash())
+            assert image.get_zobrist_hash() == array_image.get_zobrist_hash() == array_board.get_symmetric_hashes(
+                (symmetry,))[0]
+            for pos, piece in env.items():
+                assert array_image.get_env()[symmetry.map_position(pos, [3, 3])] == piece
+            assert get_canonical_hash(image)[0] == get_canonical_hash(array_image)[0] == canonical
+            # The returned symmetry leads to the canonical form, its inverse maps canonical actions back
+            to_canonical = get_canonical_hash(image)[1]
+            assert image.transform(to_canonical).get_zobrist_hash() == canonical
+            action = StatelessAction({"position": (1, 2)})
+            assert to_canonical.get_inverse().map_action(to_canonical.map_action(action, [3, 3]), [3, 3]) == action
+            assert symmetry.map_codes([5], [3, 3]).tolist() == [3 * symmetry.map_position((1, 2), [3, 3])[0]
+                                                                 + symmetry.map_position((1, 2), [3, 3])[1]]
+        assert len(images) == 8
+
+        # Quarter turns do not apply to rectangles
+        rectangle = SquareBoard({(0, 0): Piece("X", owner_id=1)}, [2, 3])
+        assert get_canonical_hash(rectangle)[1] in D2
+
+        gs = build_initial_state(board=SquareBoard)
+        corners = [gs.apply_action(StatelessAction({"position": pos})) for pos in [(0, 0), (0, 2), (2, 0), (2, 2)]]
+        assert len({get_canonical_state_key(state)[0] for state in corners}) == 1
+        assert get_canonical_state_key(corners[0])[0] != get_canonical_state_key(gs)[0]
+
+    def test_solver(self):
+        gs = build_initial_state()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tictac.npy")
+            database = Solver(gs, n_workers=2).solve(path)
+            assert len(database) == len(SolvedDatabase.load(path)) == 5478
+            assert database.probe(gs) == (DRAW, 9)
+
+            # X to move completes the first row
+            state = gs
+            for pos in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+                state = state.apply_action(StatelessAction({"position": pos}))
+            assert database.probe(state) == (WIN, 1)
+            assert database.get_best_action(state) == StatelessAction({"position": (0, 2)})
+
+        class SquareBoard(type(gs.get_rep())):
+            symmetries = D4
+
+        gs = build_initial_state(board=SquareBoard)
+        database = Solver(gs, canonical=True).solve()
+        assert len(database) == 765
+        assert database.probe(gs).value == DRAW
+
+        alone = types.SimpleNamespace(get_scores=lambda: {1: 0}, get_active_player=lambda: Player("solo", id=1))
+        assert outcome(alone) == WIN
+
+    def test_opening_book(self):
+        def record(positions):
+            state, steps = build_initial_state(), []
+            for pos in positions:
+                steps.append(json.loads(json.dumps(state.to_json(), default=lambda x: x.to_json())))
+                state = state.apply_action(StatelessAction({"position": pos}))
+            steps.append(json.loads(json.dumps(state.to_json(), default=lambda x: x.to_json())))
+            return {"steps": steps, "final_summary": None}
+
+        codec = GridActionCodec([3, 3])
+        builder = BookBuilder(max_plies=2, codec=codec)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game.json")
+            with open(path, "w") as f:
+                json.dump(record([(1, 1), (0, 0), (0, 2), (2, 0), (1, 0), (1, 2), (2, 2), (0, 1), (2, 1)]), f)
+            assert builder.add_recording(path, GameStateTictac)
+        assert builder.add_recording(record([(0, 0), (1, 1), (0, 1), (0, 2), (2, 0), (2, 2), (1, 0)]), GameStateTictac)
+        assert builder.add_recording(record([(1, 1), (0, 0), (2, 2), (0, 2), (1, 0), (0, 1)]), GameStateTictac)
+        assert not builder.add_recording(record([(1, 1)]), GameStateTictac)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.npy")
+            builder.build().save(path)
+            book = OpeningBook.load(path, codec)
+            gs = build_initial_state()
+            assert len(book) == 4
+            assert [(move.action.data["position"], move.games) for move in book.get_moves(gs)] == [((1, 1), 2),
+                                                                                                   ((0, 0), 1)]
+            # The centre has drawn once and lost once, the corner has won
+            assert book.get_action(gs) == StatelessAction({"position": (0, 0)})
+            assert book.get_action(gs, min_games=2) == StatelessAction({"position": (1, 1)})
+            assert book.get_action(gs.apply_action(StatelessAction({"position": (2, 2)}))) is None
+            assert gs in book
+            # Books apply to other player instances
+            players = [PlayerTictac("X", "p3", id=11), PlayerTictac("O", "p4", id=12)]
+            other = GameStateTictac({11: 0.0, 12: 0.0}, players[0], players, BoardTictac(env={}, dim=[3, 3]))
+            assert book.get_moves(other) == book.get_moves(gs)
+            played = StatelessAction({"position": (1, 1)})
+            assert len(book.get_moves(other.apply_action(played))) == len(book.get_moves(gs.apply_action(played))) == 1
+        assert len(builder.build(min_games=2)) == 2
+
+        broken = record([(1, 1), (0, 0)])
+        broken["steps"].pop(1)
+        with self.assertRaises(RecordingError):
+            builder.add_recording(broken, GameStateTictac)
+
+    def test_replay(self):
+        positions = [(1, 1), (0, 0), (0, 2), (2, 0), (1, 0), (1, 2), (2, 2), (0, 1), (2, 1)]
+        actions = [StatelessAction({"position": pos}) for pos in positions]
+        states = [build_initial_state()]
+        for action in actions:
+            states.append(states[-1].apply_action(action))
+
+        replay = Replay(states[0], actions, checkpoint_every=4, validate=True)
+        assert [state.get_state_key() for state in replay] == [state.get_state_key() for state in states]
+        assert replay.get_state(6).get_state_key() == states[6].get_state_key()
+        assert replay.get_state(-1).get_state_key() == states[-1].get_state_key()
+        assert replay.get_final_state().is_done()
+        assert sorted(replay._checkpoints) == [0, 4, 8]
+        codec = GridActionCodec([3, 3])
+        codes = [codec.encode(action) for action in actions]
+        coded = Replay(build_initial_state(CodedGameStateTictac), codes, validate=True)
+        assert coded.get_final_state().get_state_key() == states[-1].get_state_key()
+        with self.assertRaises(MissingActionCodecError):
+            Replay(states[0], codes).get_state(1)
+        with self.assertRaises(RecordingError):
+            Replay(states[0], [actions[0], actions[0]], validate=True).get_state(2)
+        with self.assertRaises(IndexError):
+            replay.get_state(10)
+
+        steps = [json.loads(json.dumps(state.to_json(), default=lambda x: x.to_json())) for state in states]
+        recording = {"steps": steps, "final_summary": {"winners_id": [1, 2], "status": "done"}}
+        assert Replay.from_recording(recording, GameStateTictac).get_final_state().get_state_key() == \
+            states[-1].get_state_key()
+        check = verify_recording(recording, GameStateTictac)
+        assert check.is_consistent() and check.n_moves == 9
+        # A rule change making the last move illegal, or a different recorded outcome, are caught
+        check = verify_recording({"steps": steps[:-2] + steps[-1:], "final_summary": None}, GameStateTictac)
+        assert not check.is_consistent() and check.move == 7
+        check = verify_recording({**recording, "final_summary": {"winners_id": [1], "status": "done"}},
+                                 GameStateTictac)
+        assert check.move == 9 and "winners" in check.reason
+
+    def test_batch_evaluator(self):
+        states = []
+        for board in (Board, ArrayBoard):
+            state = build_initial_state(board=board)
+            for position in [(0, 0), (1, 1), (2, 2)]:
+                state = state.apply_action(StatelessAction({"position": position}))
+            states.append(state)
+        relative, absolute = BoardFeatureExtractor(["X", "O"]), BoardFeatureExtractor(["X", "O"], player_ids=[1, 2])
+        features = relative(states)
+        assert features.shape == (2, 4, 3, 3)
+        assert (features[0] == features[1]).all()
+        # O is to move: its piece comes first, X pieces belong to the opponent
+        assert features[0, 2].sum() == 1 and features[0, 1, 0, 0] == features[0, 1, 2, 2] == 1
+        assert (absolute(states)[:, 0] == features[:, 1]).all() and absolute(states)[:, 3].sum() == 2
+
+        # The centre is worth more than the corners, the other cells nothing
+        weights = np.zeros((4, 3, 3))
+        weights[::2], weights[1::2] = 0.1, -0.1
+        weights[:, 1, 1] *= 5
+        weights[:, 1::2, ::2] = weights[:, ::2, 1::2] = 0
+        with BatchEvaluator(LinearEvaluator(relative, weights), batch_size=16, max_wait=0.05) as evaluator:
+            values = evaluator.evaluate_many(states)
+            assert np.allclose(values, [0.3, 0.3])
+
+            threads = [threading.Thread(target=evaluator.evaluate_many, args=(states * 4,)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert evaluator.n_states == 34
+            assert evaluator.get_mean_batch_size() > 2
+
+            player = AlphaBetaPlayerTictac("X", id=1, max_depth=1, batch_evaluator=evaluator)
+            gs = build_initial_state(board=Board, zobrist=ZobristTable())
+            assert player.compute_action(gs) == StatelessAction({"position": (1, 1)})
+            assert evaluator.n_states == 43
+
+        with BatchEvaluator(lambda _: 1 / 0) as evaluator, self.assertRaises(ZeroDivisionError):
+            evaluator.evaluate(states[0])
+
+    def test_tournament(self):
+        players = [AlphaBetaPlayerTictac("X", "alpha_beta"), PlayerTictac("X", "random_1"), PlayerTictac("X", "random_2")]
+        report = Tournament(players, build_match, n_workers=3).run()
+        assert report.get_n_matches() == 3
+        assert all(result.status != ERROR for result in report.results)
+        standings = {row["name"]: row for row in report.get_standings()}
+        assert standings["alpha_beta"]["losses"] == 0 and standings["alpha_beta"]["played"] == 2
+        assert sum(row["points"] for row in standings.values()) == 3
+        assert report.get_matches_per_hour() > 0 and "matches/hour" in str(report)
+
+        report = Tournament(players, build_match, mode=KNOCKOUT, n_workers=2).run()
+        assert report.get_n_matches() == 2
+        assert report.byes == {"alpha_beta": 1} and report.champion == "alpha_beta"
+
+        # Swiss pairings avoid rematches and give the bye to a low-ranked player
+        tournament = Tournament(players + [PlayerTictac("X", "random_3")], build_match, mode=SWISS)
+        report = TournamentReport(results=[MatchResult(0, ["alpha_beta", "random_1"], winners=["alpha_beta"]),
+                                           MatchResult(0, ["random_2", "random_3"], winners=["random_2"])])
+        pairings = [[player.get_name() for player in pair] for pair in tournament._get_swiss_pairings(report)]
+        assert pairings == [["alpha_beta", "random_2"], ["random_1", "random_3"]]
+        with self.assertRaises(ValueError):
+            Tournament(players, build_match, mode="ladder")
+
+    def test_ratings(self):
+        # Example of the Glicko-2 system paper: 1500/200 beats 1400/30, loses to 1550/100 and 1700/300
+        glicko = Glicko2Ratings()
+        glicko._get_indices(["player", "a", "b", "c"])
+        glicko._mu = (np.array([1500, 1400, 1550, 1700.0]) - 1500) / 173.7178
+        glicko._phi = np.array([200, 30, 100, 300.0]) / 173.7178
+        glicko.update([RatedGame(("player", "a"), ("player",)), RatedGame(("player", "b"), ("b",)),
+                       RatedGame(("player", "c"), ("c",))])
+        assert abs(glicko.get_rating("player") - 1464.06) < 0.05
+        assert abs(glicko.get_deviation("player") - 151.52) < 0.05
+        assert abs(glicko.get_volatility("player") - 0.05999) < 1e-5
+
+        trueskill = TrueSkillRatings()
+        trueskill.update([RatedGame(("a", "b"), ("a",)), RatedGame(("c", "d"), ("c", "d"))])
+        assert abs(trueskill.get_rating("a") - 29.396) < 1e-3 and abs(trueskill.get_deviation("a") - 7.171) < 1e-3
+        assert abs(trueskill.get_rating("d") - 25) < 1e-9 and abs(trueskill.get_deviation("d") - 6.458) < 1e-3
+        spread = math.hypot(trueskill.beta, trueskill.beta, trueskill.get_deviation("a"), trueskill.get_deviation("b"))
+        expected = NormalDist().cdf((trueskill.get_rating("a") - trueskill.get_rating("b")) / spread)
+        assert abs(trueskill.get_win_probability("a", "b") - expected) < 1e-6
+
+        # Results come from tournaments, "done" payloads and recordings, uncompleted games being skipped
+        payload = {"players": [{"id": 1, "name": "alpha"}, {"id": 2, "name": "beta"}], "winners_id": [1],
+                   "status": "done"}
+        elo = EloRatings()
+        n_games = elo.rate([payload, {**payload, "status": "invalid"}, {"steps": [], "final_summary": payload},
+                            {"steps": [], "final_summary": None}, MatchResult(0, ["beta", "gamma"], winners=["beta"]),
+                            MatchResult(0, ["alpha", "gamma"], status=ERROR)], period=2)
+        assert n_games == 3 and elo.n_games == 3
+        assert [row["name"] for row in elo.get_leaderboard()] == ["alpha", "beta", "gamma"]
+        low, high = elo.get_interval("alpha")
+        assert low < elo.get_rating("alpha") < high
+        assert elo.get_win_probability("alpha", "gamma") > 0.5
+        # The newcomer is the most informative opponent
+        elo.update([RatedGame(("alpha", "delta"), ("alpha", "delta"))])
+        with self.assertRaises(KeyError):
+            elo.get_interval("epsilon")
+        assert "epsilon" not in elo and len(elo) == 4
+        elo.add_players(["epsilon"])
+        assert elo.get_informative_pairings(["alpha", "beta", "epsilon"], n_pairs=1) == [("alpha", "epsilon")]
+
+    def test_local_game(self):
+        master = build_match([AlphaBetaPlayerTictac("X", "alpha_beta"), PlayerTictac("X", "random")], 8080)
+        closed, close = [], master.close
+
+        async def record_close():
+            await close()
+            closed.append(True)
+
+        master.close = record_close
+        winners = [player.get_name() for player in master.play_local_game()]
+        assert "alpha_beta" in winners
+        assert master.get_game_state().is_done()
+        assert not any(proxy.connected for proxy in master.players_proxy)
+        assert closed
+        assert master.broadcast
+
+        master.players_proxy[1] = InteractivePlayerProxy(master.players[1])
+        with self.assertRaises(ValueError):
+            master.play_local_game()
+
+    def test_rooms(self):
+        # Games in distinct rooms share the server of a fresh process without hearing each other
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            winners = executor.submit(play_matches_in_rooms, 3, _get_free_port()).result(timeout=60)
+        # Alpha-beta never loses, each game only knowing its own players
+        assert all(f"alpha_beta_{i}" in names and set(names) <= {f"alpha_beta_{i}", f"random_{i}"}
+                   for i, names in enumerate(winners))
+
+        # A room hosts a single game at a time
+        sio = types.SimpleNamespace(start_background_task=lambda target: asyncio.ensure_future(target()))
+        master = types.SimpleNamespace(hostname="localhost", port=0, sio=sio)
+        room = EventRoom(master, DEFAULT_ROOM)
+
+        async def play_twice():
+            await asyncio.gather(room.run(lambda: asyncio.sleep(0.1), []), room.run(lambda: asyncio.sleep(0.1), []))
+
+        with self.assertRaises(RoomInUseError):
+            asyncio.run(play_twice())
+        assert not room.busy
+
+        # A game refused by a busy room leaves the registry of the running game alone
+        closed = []
+        room.busy = True
+        stub = types.SimpleNamespace(room=room, emitter=types.SimpleNamespace(close_room=closed.append),
+                                     players_proxy=[], close=None, play_game=None)
+        with self.assertRaises(RoomInUseError):
+            asyncio.run(GameMaster.run_game(stub))
+        assert not closed
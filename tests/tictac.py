@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import ast
+import copy
+import json
+import random
+import time
+from collections.abc import Generator
+from typing import Any
+
+import numpy as np
+
+from seahorse.game.action import Action
+from seahorse.game.action_codec import ActionCodec, GridActionCodec
+from seahorse.game.game_layout.array_board import ArrayBoard
+from seahorse.game.game_layout.board import Board, Piece
+from seahorse.game.game_state import GameState
+from seahorse.game.master import GameMaster
+from seahorse.game.representation import Representation
+from seahorse.game.stateful_action import StatefulAction
+from seahorse.game.stateless_action import StatelessAction
+from seahorse.player.alpha_beta import AlphaBetaPlayer
+from seahorse.player.mcts import MCTSPlayer
+from seahorse.player.player import Player
+from seahorse.player.proxies import LocalPlayerProxy
+from seahorse.utils.memo import memoized
+from seahorse.utils.serializer import Serializable
+
+
+class PlayerTictac(Player):
+
+    def __init__(self, piece_type: str, name: str = "bob", **kwargs) -> None:
+        super().__init__(name, **kwargs)
+        self.piece_type = piece_type
+
+    def get_piece_type(self) -> str:
+        return self.piece_type
+
+    def compute_action(self, current_state: GameState, **_) -> Action:
+        return random.choice(sorted(current_state.get_possible_stateless_actions(), key=str))
+
+    def to_json(self) -> dict:
+        return {"piece_type": self.piece_type, "name": self.name, "id": self.id}
+
+    @classmethod
+    def from_json(cls, data: str | dict, **_) -> Serializable:
+        if isinstance(data, str):
+            data = json.loads(data)
+        return cls(**data)
+
+
+class AnytimePlayerTictac(PlayerTictac):
+
+    def compute_action(self, current_state: GameState, **_) -> Action:
+        actions = sorted(current_state.get_possible_stateless_actions(), key=str)
+        self.publish_action(actions[0])
+        for _ in range(1000):
+            if self.should_stop():
+                break
+            time.sleep(0.01)
+        return actions[-1]
+
+
+class MCTSPlayerTictac(MCTSPlayer):
+
+    def __init__(self, piece_type: str, name: str = "mcts", **kwargs) -> None:
+        super().__init__(name, **kwargs)
+        self.piece_type = piece_type
+
+    def get_piece_type(self) -> str:
+        return self.piece_type
+
+    def to_json(self) -> dict:
+        return {"piece_type": self.piece_type, "name": self.name, "id": self.id}
+
+
+class AlphaBetaPlayerTictac(AlphaBetaPlayer):
+
+    def __init__(self, piece_type: str, name: str = "alpha_beta", **kwargs) -> None:
+        super().__init__(name, **kwargs)
+        self.piece_type = piece_type
+
+    def get_piece_type(self) -> str:
+        return self.piece_type
+
+    def to_json(self) -> dict:
+        return {"piece_type": self.piece_type, "name": self.name, "id": self.id}
+
+
+class BoardTictac(Board):
+
+    def to_json(self) -> dict:
+        return {"env": {str(x): y.to_json() for x, y in self.env.items()}, "dim": self.dimensions}
+
+    @classmethod
+    def from_json(cls, data: str | dict, **_) -> Serializable:
+        if isinstance(data, str):
+            data = json.loads(data)
+        env = {tuple(ast.literal_eval(x)): Piece.from_json(y) for x, y in data["env"].items()}
+        return cls(env=env, dim=data["dim"])
+
+
+class GameStateTictac(GameState):
+
+    applied = 0
+
+    def apply_action(self, action: StatelessAction) -> GameStateTictac:
+        GameStateTictac.applied += 1
+        rep = self.get_rep().copy()
+        player = self.get_active_player()
+        rep.place_piece(tuple(action.data["position"]), Piece(player.get_piece_type(), player))
+        return type(self)(self.compute_scores(rep), self.compute_next_player(), self.players, rep)
+
+    def generate_possible_stateless_actions(self) -> Generator[StatelessAction, None, None]:
+        env = self.get_rep().get_env()
+        for i in range(3):
+            for j in range(3):
+                if (i, j) not in env:
+                    yield StatelessAction({"position": (i, j)})
+
+    def generate_possible_stateful_actions(self) -> Generator[StatefulAction, None, None]:
+        for action in self.generate_possible_stateless_actions():
+            yield action.get_stateful_action(self)
+
+    def convert_stateful_action_to_stateless_action(self, stateful_action: StatefulAction) -> StatelessAction:
+        before = stateful_action.get_current_game_state().get_rep().get_env()
+        after = stateful_action.get_next_game_state().get_rep().get_env()
+        return StatelessAction({"position": next(pos for pos in after if pos not in before)})
+
+    def compute_scores(self, play_info: Representation) -> dict[int, Any]:
+        env = play_info.get_env()
+        lines = [[(i, j) for j in range(3)] for i in range(3)] + [[(j, i) for j in range(3)] for i in range(3)]
+        lines += [[(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)]]
+        scores = {}
+        for player in self.players:
+            scores[player.get_id()] = float(any(all(pos in env and env[pos].get_owner_id() == player.get_id()
+                                                    for pos in line) for line in lines))
+        return scores
+
+    def is_done(self) -> bool:
+        return len(self.get_rep().get_env()) == 9 or any(score > 0 for score in self.scores.values())
+
+    def to_json(self) -> dict:
+        return {"scores": self.scores, "active_player": self.active_player.to_json(),
+                "players": [player.to_json() for player in self.players], "rep": self.rep.to_json()}
+
+    @classmethod
+    def from_json(cls, data: str | dict, *, next_player: Player | None = None) -> GameStateTictac:
+        if isinstance(data, str):
+            data = json.loads(data)
+        players = [PlayerTictac.from_json(x) for x in data["players"]]
+        active = next((p for p in players if p.get_id() == data["active_player"]["id"]), next_player)
+        return cls({int(k): v for k, v in data["scores"].items()}, active, players,
+                   BoardTictac.from_json(data["rep"]))
+
+
+class CodedGameStateTictac(GameStateTictac):
+
+    codec = GridActionCodec([3, 3])
+
+    def get_action_codec(self) -> ActionCodec:
+        return self.codec
+
+    def generate_possible_action_codes(self) -> np.ndarray:
+        return np.flatnonzero(self.get_rep().types == 0)
+
+    @classmethod
+    def batch_legal_action_masks(cls, states: list[GameState]) -> np.ndarray:
+        types, _ = ArrayBoard.stack([state.get_rep() for state in states])
+        masks = (types == 0).reshape(len(states), -1)
+        masks[[state.is_done() for state in states]] = False
+        return masks
+
+
+class LazyGameStateTictac(GameStateTictac):
+
+    lazy_stateful_actions = True
+
+
+class InplaceGameStateTictac(GameStateTictac):
+
+    def apply_action_inplace(self, action: StatelessAction) -> Any:
+        player = self.get_active_player()
+        undo = self.rep.apply_changes({tuple(action.data["position"]): Piece(player.get_piece_type(), player)})
+        self.scores = self.compute_scores(self.rep)
+        self.active_player = self.compute_next_player()
+        return undo
+
+
+class MemoGameStateTictac(InplaceGameStateTictac):
+
+    @memoized
+    def is_done(self) -> bool:
+        return super().is_done()
+
+
+def build_initial_state(gs: type[GameStateTictac] = GameStateTictac, board: type[Representation] = BoardTictac,
+                        **board_kwargs) -> GameStateTictac:
+    players = [PlayerTictac("X", "p1", id=1), PlayerTictac("O", "p2", id=2)]
+    return gs({1: 0.0, 2: 0.0}, players[0], players, board(env={}, dim=[3, 3], **board_kwargs))
+
+
+class MasterTictac(GameMaster):
+
+    def compute_winner(self) -> list[Player]:
+        scores = self.get_scores()
+        best = max(scores.values())
+        return [player for player in self.players if scores[player.get_id()] == best]
+
+
+def build_match(players: list[Player], port: int, room: str | None = None) -> MasterTictac:
+    seated = []
+    for player_id, (player, piece_type) in enumerate(zip(players, "XO", strict=True), 1):
+        seated_player = copy.copy(player)
+        seated_player.id, seated_player.piece_type = player_id, piece_type
+        seated.append(seated_player)
+    gs = GameStateTictac({1: 0.0, 2: 0.0}, seated[0], seated, BoardTictac(env={}, dim=[3, 3]))
+    return MasterTictac("tictac", gs, [LocalPlayerProxy(player, gs=GameStateTictac) for player in seated], port=port,
+                        log_level="ERROR", room=room)
+
+
+def play_matches_in_rooms(n_games: int, port: int) -> list[list[str]]:
+    masters = [build_match([AlphaBetaPlayerTictac("X", f"alpha_beta_{i}"), PlayerTictac("X", f"random_{i}")], port,
+                           room=f"game_{i}") for i in range(n_games)]
+    results = masters[0].emitter.run_games([master.run_game() for master in masters])
+    return [[player.get_name() for player in winners] for winners in results]